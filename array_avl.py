@@ -0,0 +1,517 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Implementation of an array-backed AVL tree that keeps its nodes in typed columns instead of
+#              node objects, for trees too large to hold one Python object per node
+
+
+import random
+from array import array
+from queue_and_stack import Queue, Stack
+from frozen import FrozenTree
+
+
+NIL = -1    # index used for a missing child or parent
+
+
+class ArrayAVL:
+    """
+    Array-backed AVL Tree class with the same public methods as AVL
+
+    Node i is described by values[i] and by the i-th entry of the left, right, parent and height columns,
+    which are typed int32 arrays. That costs a fixed 16 bytes per node plus one list slot for the value,
+    instead of a full object with its own __dict__ per node. Slots of removed nodes are kept on a free-list
+    threaded through the left column and are reused by later adds.
+    """
+
+    def __init__(self, start_tree=None) -> None:
+        """
+        Initialize a new array-backed AVL Tree
+        """
+        self.make_empty()
+
+        # populate the tree with initial values (if provided)
+        if start_tree is not None:
+            for value in start_tree:
+                self.add(value)
+
+    def __str__(self) -> str:
+        """
+        Override string method; display in pre-order
+        """
+        values = []
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node != NIL:
+                values.append(str(self._values[node]))
+                stack.push(self._right[node])
+                stack.push(self._left[node])
+        return "ArrayAVL pre-order { " + ", ".join(values) + " }"
+
+    def is_valid_avl(self) -> bool:
+        """
+        Perform pre-order traversal of the tree. Return False if a node breaks the ordering property,
+        has the wrong height, or its parent and child indexes are out of sync.
+        This is intended to be a troubleshooting 'helper' method, like AVL.is_valid_avl().
+        """
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node != NIL:
+                left, right, parent = self._left[node], self._right[node], self._parent[node]
+                if left != NIL and not self._values[left] < self._values[node]:
+                    return False
+                if right != NIL and not self._values[node] < self._values[right]:
+                    return False
+                if self._height[node] != 1 + max(self._get_height(left), self._get_height(right)):
+                    return False
+                if parent == NIL:
+                    # NIL parent is only allowed on the root of the tree
+                    if node != self._root:
+                        return False
+                elif self._left[parent] != node and self._right[parent] != node:
+                    return False
+                stack.push(right)
+                stack.push(left)
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to the tree while maintaining its AVL property. Duplicate
+        values are not allowed. If the value is already in the tree, the method does not change
+        the tree.
+        """
+        if self._root == NIL:
+            self._root = self._min = self._max = self._new_slot(value, NIL)
+            return
+        values, left, right = self._values, self._left, self._right
+        parent = NIL
+        n = self._root
+        while n != NIL:
+            parent = n
+            if value < values[n]:
+                n = left[n]
+            # If we find the same value in the tree, return None (no duplicates)
+            elif value == values[n]:
+                return None
+            else:
+                n = right[n]
+        # Create a new node as the left or right child of the stored parent node and retrace from there
+        node = self._new_slot(value, parent)
+        if value < values[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        # A new extreme is always a child of the old one
+        if parent == self._min and left[parent] == node:
+            self._min = node
+        elif parent == self._max and right[parent] == node:
+            self._max = node
+        self._retrace(parent)
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from the tree. The method returns True if the value is
+        removed. Otherwise, it returns False.
+        """
+        n = self._find(value)
+        if n == NIL:
+            return False
+        self._remove_slot(n)
+        return True
+
+    def _remove_slot(self, n: int) -> None:
+        """
+        Removes node n from the tree and rebalances.
+        """
+        left, right = self._left, self._right
+        # The min has no left subtree, so the next smallest node is the leftmost node of its right
+        # subtree or else its parent. The max is handled the same way on the other side
+        if n == self._min:
+            self._min = self._edge(right[n], left) if right[n] != NIL else self._parent[n]
+        if n == self._max:
+            self._max = self._edge(left[n], right) if left[n] != NIL else self._parent[n]
+        # A node with two subtrees takes the value of its successor, which is then removed instead.
+        # This gives the same shape as moving the successor node into its place
+        if left[n] != NIL and right[n] != NIL:
+            s = self._edge(right[n], left)
+            self._values[n] = self._values[s]
+            if s == self._max:
+                self._max = n
+            n = s
+        # n now has at most one child, which takes its place under n's parent
+        child = left[n] if left[n] != NIL else right[n]
+        parent = self._parent[n]
+        if child != NIL:
+            self._parent[child] = parent
+        if parent == NIL:
+            self._root = child
+        elif left[parent] == n:
+            left[parent] = child
+        else:
+            right[parent] = child
+        self._free_slot(n)
+        self._retrace(parent)
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the tree. Otherwise, it returns False. If the tree is
+        empty, the method returns False.
+        """
+        return self._find(value) != NIL
+
+    def inorder_traversal(self) -> Queue:
+        """
+        This method will perform an inorder traversal of the tree and return a Queue object that
+        contains the values of the visited nodes, in the order they were visited. If the tree is empty,
+        the method returns an empty Queue.
+        """
+        result = Queue()
+        for value in self.iter_inorder():
+            result.enqueue(value)
+        return result
+
+    def iter_inorder(self):
+        """
+        This method is a generator that yields the values of the tree in ascending order.
+        """
+        values, left, right = self._values, self._left, self._right
+        stack = Stack()
+        n = self._root
+        while True:
+            # Push the current node and go left
+            if n != NIL:
+                stack.push(n)
+                n = left[n]
+            # Once we cannot go left, process the top of stack, and go right
+            elif not stack.is_empty():
+                n = stack.pop()
+                yield values[n]
+                n = right[n]
+            else:
+                return
+
+    def __iter__(self):
+        """
+        Iterates over the values of the tree in ascending order.
+        """
+        return self.iter_inorder()
+
+    def freeze(self) -> FrozenTree:
+        """
+        This method returns a read-only snapshot of the values in the tree, like BST.freeze().
+        """
+        return FrozenTree(self.iter_inorder())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree.
+        """
+        return self._size
+
+    def find_min(self) -> object:
+        """
+        This method returns the lowest value in the tree. If the tree is empty, the method should return None.
+        The lowest node is tracked as the tree changes, so this is O(1).
+        """
+        if self._min == NIL:
+            return None
+        return self._values[self._min]
+
+    def find_max(self) -> object:
+        """
+        This method returns the highest value in the tree. If the tree is empty, the method should return None.
+        The highest node is tracked as the tree changes, so this is O(1).
+        """
+        if self._max == NIL:
+            return None
+        return self._values[self._max]
+
+    def pop_min(self) -> object:
+        """
+        This method removes the lowest value from the tree and returns it. If the tree is empty, the method
+        returns None.
+        """
+        if self._min == NIL:
+            return None
+        value = self._values[self._min]
+        self._remove_slot(self._min)
+        return value
+
+    def pop_max(self) -> object:
+        """
+        This method removes the highest value from the tree and returns it. If the tree is empty, the method
+        returns None.
+        """
+        if self._max == NIL:
+            return None
+        value = self._values[self._max]
+        self._remove_slot(self._max)
+        return value
+
+    def is_empty(self) -> bool:
+        """
+        This method returns True if the tree is empty. Otherwise, it returns False.
+        """
+        return self._root == NIL
+
+    def make_empty(self) -> None:
+        """
+        This method removes all the nodes from the tree and releases the columns.
+        """
+        self._values = []
+        self._left = array('i')
+        self._right = array('i')
+        self._parent = array('i')
+        self._height = array('i')
+        self._root = NIL
+        self._min = self._max = NIL     # nodes holding the lowest and highest values
+        self._free = NIL        # first slot on the free-list, the rest are chained through _left
+        self._size = 0
+
+    def _find(self, value: object) -> int:
+        """
+        Returns the index of the node holding value, or NIL if the value is not in the tree.
+        """
+        values, left, right = self._values, self._left, self._right
+        n = self._root
+        while n != NIL:
+            if values[n] == value:
+                return n
+            elif value < values[n]:
+                n = left[n]
+            else:
+                n = right[n]
+        return NIL
+
+    def _edge(self, n: int, column: array) -> int:
+        """
+        Follows column (the left or right column) down from n and returns the last node reached.
+        """
+        while column[n] != NIL:
+            n = column[n]
+        return n
+
+    def _new_slot(self, value: object, parent: int) -> int:
+        """
+        Stores a new leaf node and returns its index, reusing a slot from the free-list if there is one.
+        """
+        self._size += 1
+        if self._free != NIL:
+            slot = self._free
+            self._free = self._left[slot]
+            self._values[slot] = value
+            self._left[slot] = NIL
+            self._right[slot] = NIL
+            self._parent[slot] = parent
+            self._height[slot] = 0
+            return slot
+        self._values.append(value)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        self._parent.append(parent)
+        self._height.append(0)
+        return len(self._values) - 1
+
+    def _free_slot(self, slot: int) -> None:
+        """
+        Puts the slot of a removed node on the free-list and drops its reference to the value.
+        """
+        self._size -= 1
+        self._values[slot] = None
+        self._left[slot] = self._free
+        self._free = slot
+
+    def _get_height(self, node: int) -> int:
+        """
+        Returns the height of a node, or -1 for NIL.
+        """
+        if node == NIL:
+            return -1
+        return self._height[node]
+
+    def _update_height(self, node: int) -> None:
+        """
+        Updates the height of a node from the heights of its children.
+        """
+        left = self._get_height(self._left[node])
+        right = self._get_height(self._right[node])
+        self._height[node] = (left if left > right else right) + 1
+
+    def _balance_factor(self, node: int) -> int:
+        """
+        Returns the balance factor of a node by examining the height of its children.
+        """
+        return self._get_height(self._right[node]) - self._get_height(self._left[node])
+
+    def _replace_child(self, parent: int, old: int, new: int) -> None:
+        """
+        Points parent (or the root, if parent is NIL) at new instead of old.
+        """
+        if parent == NIL:
+            self._root = new
+        elif self._left[parent] == old:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+
+    def _rotate_left(self, node: int) -> int:
+        """
+        Performs a leftward rotation on the root of a subtree and links the new root into the tree.
+        Returns the new root of the subtree.
+        """
+        c = self._right[node]
+        parent = self._parent[node]
+        inner = self._left[c]
+        self._right[node] = inner
+        if inner != NIL:
+            self._parent[inner] = node
+        self._left[c] = node
+        self._parent[node] = c
+        self._parent[c] = parent
+        self._replace_child(parent, node, c)
+        self._update_height(node)
+        self._update_height(c)
+        return c
+
+    def _rotate_right(self, node: int) -> int:
+        """
+        Performs a rightward rotation on the root of a subtree and links the new root into the tree.
+        Returns the new root of the subtree.
+        """
+        c = self._left[node]
+        parent = self._parent[node]
+        inner = self._right[c]
+        self._left[node] = inner
+        if inner != NIL:
+            self._parent[inner] = node
+        self._right[c] = node
+        self._parent[node] = c
+        self._parent[c] = parent
+        self._replace_child(parent, node, c)
+        self._update_height(node)
+        self._update_height(c)
+        return c
+
+    def _rebalance(self, node: int) -> int:
+        """
+        Rotates an unbalanced node (and its child, when needed) to bring its balance factor into [-1, 1],
+        or just updates its height. Returns the root of the subtree after balancing.
+        """
+        balance = self._balance_factor(node)
+        # We have a left-heavy node and need to rotate rightward
+        if balance < -1:
+            if self._balance_factor(self._left[node]) > 0:
+                self._rotate_left(self._left[node])
+            return self._rotate_right(node)
+        # We have a right-heavy node and need to rotate leftward
+        if balance > 1:
+            if self._balance_factor(self._right[node]) < 0:
+                self._rotate_right(self._right[node])
+            return self._rotate_left(node)
+        self._update_height(node)
+        return node
+
+    def _retrace(self, node: int) -> None:
+        """
+        Walks up from the lowest changed node, rebalancing until a subtree keeps the height it had
+        before the change, like AVL._retrace().
+        """
+        while node != NIL:
+            old_height = self._height[node]
+            subtree = self._rebalance(node)
+            if self._height[subtree] == old_height:
+                return
+            node = self._parent[subtree]
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() example 1")
+    print("----------------------")
+    test_cases = (
+        (1, 2, 3),  # RR
+        (3, 2, 1),  # LL
+        (1, 3, 2),  # RL
+        (3, 1, 2),  # LR
+        (10, 20, 30, 50, 40),
+        (1, 1, 1, 1),
+    )
+    for case in test_cases:
+        tree = ArrayAVL(case)
+        print(tree)
+
+    print("\nmethod remove() example 1")
+    print("-------------------------")
+    test_cases = (
+        ((50, 40, 60, 30, 70, 20, 80, 45), 20),  # RR
+        ((50, 40, 60, 30, 70, 20, 80, 15), 40),  # LL
+        ((50, 40, 60, 30, 70, 20, 80, 35), 20),  # RL
+        ((50, 40, 60, 30, 70, 20, 80, 25), 40),  # LR
+    )
+    for case, del_value in test_cases:
+        tree = ArrayAVL(case)
+        print('INPUT  :', tree, "DEL:", del_value)
+        tree.remove(del_value)
+        print('RESULT :', tree)
+
+    print("\nmethod add() / remove() example 2")
+    print("---------------------------------")
+    from avl import AVL
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree, reference = ArrayAVL(case), AVL(case)
+        for value in case[::2]:
+            tree.remove(value)
+            reference.remove(value)
+        # Slots freed above are reused here
+        for value in case[::4]:
+            tree.add(value)
+            reference.add(value)
+        if not tree.is_valid_avl() or str(tree)[5:] != str(reference) or len(tree) != len(list(reference)):
+            raise Exception("PROBLEM WITH ADD OR REMOVE OPERATION")
+    print('add() / remove() stress test finished')
+
+    print("\nmethod contains() / find_min() / find_max() example 1")
+    print("-----------------------------------------------------")
+    tree = ArrayAVL([10, 20, 5, 15, 17, 7, 12])
+    print(tree.contains(15), tree.contains(-10))
+    print("Minimum value is:", tree.find_min(), "Maximum value is:", tree.find_max())
+    print(tree.inorder_traversal())
+
+    print("\nmethod pop_min() / pop_max() example 1")
+    print("--------------------------------------")
+    for _ in range(100):
+        case = set(random.randrange(1, 2000) for _ in range(300))
+        tree = ArrayAVL(case)
+        while case:
+            choice = random.random()
+            if choice < 0.2:
+                value = random.randrange(1, 2000)
+                tree.add(value)
+                case.add(value)
+            elif choice < 0.3:
+                value = random.choice(list(case))
+                tree.remove(value)
+                case.discard(value)
+            elif choice < 0.65:
+                if tree.pop_min() != min(case):
+                    raise Exception("PROBLEM WITH POP_MIN OPERATION")
+                case.discard(min(case))
+            else:
+                if tree.pop_max() != max(case):
+                    raise Exception("PROBLEM WITH POP_MAX OPERATION")
+                case.discard(max(case))
+            if not tree.is_valid_avl() or tree.find_min() != min(case, default=None) or \
+                    tree.find_max() != max(case, default=None):
+                raise Exception("PROBLEM WITH MIN / MAX TRACKING")
+    print('pop_min() / pop_max() stress test finished')
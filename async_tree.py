@@ -0,0 +1,201 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: asyncio facade for the AVL tree. Long traversals and bulk updates run in chunks of a set
+#              size and give control back to the event loop between chunks, so other tasks keep running
+
+
+import asyncio
+import random
+from itertools import islice
+from avl import AVL
+
+
+class AsyncAVL:
+    """
+    Async AVL class, a facade over an AVL tree for code running in an asyncio event loop
+
+    async for iteration, add_many(), remove_many() and remove_range() do at most chunk_size values of
+    work at a time and then await asyncio.sleep(0), which lets the loop run other tasks. Single-value
+    methods are quick and stay synchronous.
+    Iteration resumes each chunk after the last value it yielded instead of holding a traversal open,
+    so the tree may change between chunks: values added or removed ahead of the iteration show up (or
+    not) as they would in a fresh traversal. Each chunk costs one extra O(log n) descent.
+    """
+
+    def __init__(self, tree: AVL = None, chunk_size: int = 1000) -> None:
+        """
+        Initialize a facade over tree, or over a new empty AVL if tree is not given
+        """
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        self.tree = AVL() if tree is None else tree
+        self.chunk_size = chunk_size
+
+    @classmethod
+    async def from_iterable(cls, iterable, chunk_size: int = 1000) -> 'AsyncAVL':
+        """
+        This method builds a facade over a new AVL holding the values of an iterable, adding them in chunks.
+        """
+        tree = cls(chunk_size=chunk_size)
+        await tree.add_many(iterable)
+        return tree
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return "Async " + str(self.tree)
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to the tree. Duplicate values are not allowed.
+        """
+        self.tree.add(value)
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from the tree. The method returns True if the value is removed.
+        Otherwise, it returns False.
+        """
+        return self.tree.remove(value)
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the tree. Otherwise, it returns False.
+        """
+        return self.tree.contains(value)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree.
+        """
+        return len(self.tree)
+
+    async def add_many(self, values) -> None:
+        """
+        This method adds every value in an iterable to the tree, chunk_size values at a time. Values are
+        added one by one, because AVL.add_many() may relink the whole tree, which would make one chunk O(n).
+        """
+        values = iter(values)
+        chunk = list(islice(values, self.chunk_size))
+        while chunk:
+            for value in chunk:
+                self.tree.add(value)
+            await asyncio.sleep(0)
+            chunk = list(islice(values, self.chunk_size))
+
+    async def remove_many(self, values) -> int:
+        """
+        This method removes every value in an iterable from the tree, chunk_size values at a time, and
+        returns how many values were removed.
+        """
+        removed = 0
+        values = iter(values)
+        chunk = list(islice(values, self.chunk_size))
+        while chunk:
+            removed += self._remove_chunk(chunk)
+            await asyncio.sleep(0)
+            chunk = list(islice(values, self.chunk_size))
+        return removed
+
+    async def remove_range(self, lo: object = None, hi: object = None,
+                           inclusive: (bool, bool) = (True, True)) -> int:
+        """
+        This method removes every value between lo and hi, chunk_size values at a time, and returns how
+        many values were removed. The bounds work like they do in BST.iter_range().
+        """
+        removed = 0
+        while True:
+            chunk = list(islice(self.tree.iter_range(lo, hi, inclusive), self.chunk_size))
+            if not chunk:
+                return removed
+            removed += self._remove_chunk(chunk)
+            await asyncio.sleep(0)
+
+    def _remove_chunk(self, chunk: list) -> int:
+        """
+        Removes the values of one chunk one by one, for the reason given in add_many(), and returns how
+        many were removed.
+        """
+        removed = 0
+        for value in chunk:
+            if self.tree.remove(value):
+                removed += 1
+        return removed
+
+    async def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method is an async generator over the values between lo and hi, in ascending order. The
+        bounds work like they do in BST.iter_range().
+        """
+        while True:
+            chunk = list(islice(self.tree.iter_range(lo, hi, inclusive), self.chunk_size))
+            for value in chunk:
+                yield value
+            if len(chunk) < self.chunk_size:
+                return
+            # The next chunk starts after the last value yielded
+            lo, inclusive = chunk[-1], (False, inclusive[1])
+            await asyncio.sleep(0)
+
+    def __aiter__(self):
+        """
+        Iterates over the values of the tree in ascending order with async for.
+        """
+        return self.iter_range()
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    async def example() -> None:
+        """
+        Runs the examples inside an event loop.
+        """
+        print("\nmethod add_many() / async for example 1")
+        print("---------------------------------------")
+        tree = await AsyncAVL.from_iterable([10, 20, 5, 15, 17, 7, 12], chunk_size=3)
+        print(tree, [value async for value in tree])
+        print(await tree.remove_range(7, 15, (False, True)), [value async for value in tree])
+
+        print("\nmethod add_many() / remove_range() / async for example 2")
+        print("--------------------------------------------------------")
+        for _ in range(100):
+            chunk_size = random.randrange(1, 50)
+            case = [random.randrange(1, 2000) for _ in range(random.randrange(0, 600))]
+            tree, reference = await AsyncAVL.from_iterable(case, chunk_size), set(case)
+            if [value async for value in tree] != sorted(reference) or not tree.tree.is_valid_avl():
+                raise Exception("PROBLEM WITH ASYNC ADD_MANY OR ITERATION")
+            lo, hi = sorted(random.randrange(0, 2001) for _ in range(2))
+            inclusive = (random.random() < 0.5, random.random() < 0.5)
+            expected = [value for value in sorted(reference)
+                        if (lo < value or inclusive[0] and lo == value) and (value < hi or inclusive[1] and value == hi)]
+            if [value async for value in tree.iter_range(lo, hi, inclusive)] != expected:
+                raise Exception("PROBLEM WITH ASYNC ITER_RANGE")
+            if await tree.remove_range(lo, hi, inclusive) != len(expected) or \
+                    list(tree.tree) != sorted(reference.difference(expected)):
+                raise Exception("PROBLEM WITH ASYNC REMOVE_RANGE")
+            reference.difference_update(expected)
+            if await tree.remove_many(case) != len(reference) or len(tree):
+                raise Exception("PROBLEM WITH ASYNC REMOVE_MANY")
+        print('async facade stress test finished')
+
+        print("\nasync for example 3")
+        print("-------------------")
+        # Values added behind the iteration are skipped, values added ahead of it are yielded
+        tree = AsyncAVL(AVL(range(0, 20, 2)), chunk_size=4)
+        seen = []
+        async for value in tree:
+            seen.append(value)
+            if value == 6:
+                tree.add(1)
+                tree.add(13)
+        print(seen)
+
+    asyncio.run(example())
@@ -40,6 +40,9 @@ class AVL(BST):
     """
     AVL Tree class. Inherits from BST
     """
+    # Running totals reported by retrace_stats()
+    _rotation_count = 0
+    _retrace_visits = 0
 
     def __init__(self, start_tree=None) -> None:
         """
@@ -105,64 +108,550 @@ class AVL(BST):
         values are not allowed. If the value is already in the tree, the method does not change
         the tree.
         """
+        self._add_node(value)
+
+    def _add_node(self, value: object) -> (AVLNode, bool):
+        """
+        Adds value to the tree like add() and returns the node holding it, together with True if
+        the node is new or False if the value was already in the tree.
+        """
         # Ensure that the node has a root, or make one
         if self._root is None:
-            self._root = AVLNode(value)
+            self._root = self._new_node(value)
+            self._note_added(self._root)
+            return self._root, True
         # Find the location of the node we are adding and store its parent
-        else:
-            parent = None
-            n = self._root
-            while n is not None:
-                parent = n
-                if value < n.value:
-                    n = n.left
-                # If we find the same value in the tree, return None (no duplicates)
-                elif value == n.value:
-                    return None
-                else:
-                    n = n.right
-            # Create a new node as the left or right child of the stored parent node
-            if value < parent.value:
-                parent.left = AVLNode(value)
-                parent.left.parent = parent
+        parent = None
+        n = self._root
+        while n is not None:
+            parent = n
+            if value < n.value:
+                n = n.left
+            # If we find the same value in the tree, return that node (no duplicates)
+            elif value == n.value:
+                return n, False
             else:
-                parent.right = AVLNode(value)
-                parent.right.parent = parent
-            # Travel up the tree until we reach the node, rebalance (when needed to maintain AVL property)
-            # and update height at each ancestor
-            while parent:
-                self._rebalance(parent)
-                if parent.parent:
-                    parent = parent.parent
-                else:
-                    parent = None
+                n = n.right
+        # Create a new node as the left or right child of the stored parent node
+        n = self._new_node(value)
+        n.parent = parent
+        if value < parent.value:
+            parent.left = n
+        else:
+            parent.right = n
+        self._note_added(n)
+        # Travel up the tree, rebalancing (when needed to maintain AVL property) and updating
+        # height at each ancestor until the heights stop changing
+        self._retrace(parent)
+        return n, True
 
     def remove(self, value: object) -> bool:
         """
-        TODO: Write your implementation
+        This method removes a value from the tree while maintaining its AVL property. The method
+        returns True if the value is removed. Otherwise, it returns False.
         """
         result = self.find_node_and_parent(value)
         # If there is no matching value to remove we return False
         if result:
-            n, pn = result[0], result[1]
-            children = self.count_children(n)
-            # Use appropriate method for number of children and return True
-            if children == 0:
-                self._remove_no_subtrees(pn, n)
-            elif children == 1:
-                self._remove_one_subtree(pn, n)
-            else:
-                pn = self._remove_two_subtrees(pn, n)
-            n.left = n.right = None  # free n
-            # Travel up the tree until we reach the node, rebalance (when needed to maintain AVL property)
-            # and update height at each ancestor
-            while pn:
-                self._rebalance(pn)
-                pn = pn.parent
+            self._remove_node(result[0], result[1])
             return True
         else:
             return False
 
+    def _remove_node(self, n: AVLNode, pn: AVLNode) -> None:
+        """
+        Removes node n from the tree, given its parent pn (None if n is the root), and rebalances.
+        """
+        self._note_removed(n, pn)
+        children = self.count_children(n)
+        # Use appropriate method for number of children
+        if children == 0:
+            self._remove_no_subtrees(pn, n)
+        elif children == 1:
+            self._remove_one_subtree(pn, n)
+        else:
+            pn = self._remove_two_subtrees(pn, n)
+        n.left = n.right = None  # free n
+        # Travel up the tree, rebalancing (when needed to maintain AVL property) and updating
+        # height at each ancestor until the heights stop changing
+        self._retrace(pn)
+
+    def _spine_parent(self, node: AVLNode, rightmost: bool) -> AVLNode:
+        """
+        Returns the parent of the min (or max) node straight from its parent pointer, so pop_min() and
+        pop_max() only pay for the retrace.
+        """
+        return node.parent
+
+    def _new_node(self, value: object) -> AVLNode:
+        """
+        Creates the AVL node that stores a new value.
+        """
+        return AVLNode(value)
+
+    def add_many(self, values) -> None:
+        """
+        This method adds every value in an iterable to the tree, skipping duplicates like add() does.
+        The batch is sorted first. A batch that is large compared to the tree is merged with the tree's
+        nodes and the tree is relinked in O(n + k), a small one is added one value at a time.
+        """
+        batch = sorted(values)
+        if not self._prefers_rebuild(len(batch)):
+            for value in batch:
+                self.add(value)
+            return
+        self._merge_nodes([self._new_node(value) for value in batch])
+
+    def _merge_nodes(self, batch: list) -> None:
+        """
+        Merges a list of new nodes, sorted by value, with the nodes of the tree and relinks them all
+        into a balanced tree. New nodes whose value is already in the tree (or earlier in the batch)
+        are dropped.
+        """
+        nodes = []
+        i = 0
+        for node in self._iter_nodes():
+            while i < len(batch) and batch[i].value < node.value:
+                if not nodes or nodes[-1].value != batch[i].value:
+                    nodes.append(batch[i])
+                i += 1
+            nodes.append(node)
+        while i < len(batch):
+            if not nodes or nodes[-1].value != batch[i].value:
+                nodes.append(batch[i])
+            i += 1
+        self._set_root(self._link_balanced(nodes))
+
+    def remove_many(self, values) -> int:
+        """
+        This method removes every value in an iterable from the tree and returns how many values were
+        removed. Like add_many(), large batches relink the tree from the nodes that are kept.
+        """
+        batch = sorted(values)
+        if not self._prefers_rebuild(len(batch)):
+            removed = 0
+            for value in batch:
+                if self.remove(value):
+                    removed += 1
+            return removed
+        # Walk the tree and the sorted batch side by side, keeping nodes whose value is not in the batch
+        kept = []
+        removed = 0
+        i = 0
+        for node in self._iter_nodes():
+            while i < len(batch) and batch[i] < node.value:
+                i += 1
+            if i < len(batch) and batch[i] == node.value:
+                removed += 1
+            else:
+                kept.append(node)
+        self._set_root(self._link_balanced(kept))
+        return removed
+
+    def _prefers_rebuild(self, batch_size: int) -> bool:
+        """
+        Returns True if rebuilding the tree is expected to be cheaper than batch_size single updates.
+        Each single update walks about height + 1 nodes down and back up, a rebuild visits every node once.
+        The node count is estimated from the height so the check stays O(1).
+        """
+        height = self._get_height(self._root)
+        if height < 0:
+            return batch_size > 1
+        return batch_size * (height + 1) >= 1 << height
+
+    def copy(self) -> 'AVL':
+        """
+        This method returns a new tree of the same class with the same values, built in O(n).
+        """
+        tree = type(self)()
+        tree._set_root(tree._build_balanced(list(self.iter_inorder())))
+        return tree
+
+    def dump(self, path: str, shape: bool = False) -> None:
+        """
+        This method writes the values of the tree to a file at path, like BST.dump(). If shape is True
+        the height of every node is written too (one byte each), and load() rebuilds the exact same tree
+        instead of a perfectly balanced one.
+        """
+        from tree_io import dump_values
+        dump_values(path, self._dumped_values(), self._node_heights() if shape else None)
+
+    @classmethod
+    def load(cls, path: str) -> 'AVL':
+        """
+        This method builds a tree in O(n) from a file written by dump(), with the stored shape if the
+        file has one and perfectly balanced otherwise.
+        """
+        from tree_io import load_values
+        values, heights = load_values(path)
+        if heights is None:
+            return cls.from_sorted(values)
+        tree = cls()
+        tree._set_root(tree._link_shaped(tree._loaded_nodes(values), heights))
+        return tree
+
+    def _node_heights(self) -> list:
+        """
+        Returns the height of every node in order, which dump() stores as the shape of the tree.
+        Subclasses whose nodes do not match their values one to one raise ValueError.
+        """
+        return [node.height for node in self._iter_nodes()]
+
+    def _loaded_nodes(self, values: list) -> list:
+        """
+        Creates the nodes for the values read by load() when the file has a shape.
+        """
+        return [self._new_node(value) for value in values]
+
+    def _link_shaped(self, nodes: list, heights: list) -> AVLNode:
+        """
+        Links nodes, in order, into the tree whose node heights are heights, and returns its root. A node
+        is higher than every node below it, so the tree is the Cartesian tree of the heights, built in
+        O(n) with a stack holding the right spine. Heights and parents are then set bottom-up.
+        """
+        spine = []
+        for node, height in zip(nodes, heights):
+            last = None
+            while spine and spine[-1][1] < height:
+                last = spine.pop()[0]
+            node.left = last
+            if spine:
+                spine[-1][0].right = node
+            spine.append((node, height))
+        if not spine:
+            return None
+        root = spine[0][0]
+        # Visit nodes in reverse pre-order (node, right, left), so children come before parents
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in (node.left, node.right):
+                if child is not None:
+                    child.parent = node
+                    stack.append(child)
+        for node in reversed(order):
+            self._update_height(node)
+        return root
+
+    def split(self, key: object) -> ('AVL', bool, 'AVL'):
+        """
+        This method splits the tree around key in O(log n). It returns a tree with the values smaller
+        than key, whether key was in the tree, and a tree with the values larger than key.
+        The nodes are moved into the new trees, so this tree is left empty.
+        """
+        left, found, right = self._split_node(self._root, key)
+        self._set_root(None)
+        return self._wrap(left), found is not None, self._wrap(right)
+
+    @classmethod
+    def join(cls, left: 'AVL', pivot: object, right: 'AVL') -> 'AVL':
+        """
+        This method returns a tree holding the values of left, pivot and the values of right in
+        O(|height(left) - height(right)| + 1). Every value in left must be smaller than pivot and every
+        value in right larger, otherwise a ValueError is raised. left and right are left empty.
+        """
+        if (left._root is not None and not left.find_max() < pivot) or \
+                (right._root is not None and not pivot < right.find_min()):
+            raise ValueError('join() needs max(left) < pivot < min(right)')
+        tree = cls()
+        tree._set_root(tree._join_nodes(left._root, tree._new_node(pivot), right._root))
+        left._set_root(None)
+        right._set_root(None)
+        return tree
+
+    def union(self, other: 'AVL') -> 'AVL':
+        """
+        This method returns a new tree with the values that are in either tree. Both trees are unchanged.
+        AVL nodes hold parent pointers, so the new tree cannot share subtrees with trees that stay in
+        use. It gets one new node per value instead, made in a single O(n + m) in-order merge with
+        no copy of either tree beforehand.
+        """
+        nodes = []
+        theirs = other._iter_nodes()
+        their_node = next(theirs, None)
+        for node in self._iter_nodes():
+            while their_node is not None and their_node.value < node.value:
+                nodes.append(self._copy_node(their_node))
+                their_node = next(theirs, None)
+            if their_node is not None and their_node.value == node.value:
+                their_node = next(theirs, None)
+            nodes.append(self._copy_node(node))
+        while their_node is not None:
+            nodes.append(self._copy_node(their_node))
+            their_node = next(theirs, None)
+        return self._wrap(self._link_balanced(nodes))
+
+    def intersection(self, other: 'AVL') -> 'AVL':
+        """
+        This method returns a new tree with the values that are in both trees. Both trees are unchanged.
+        The shorter tree is walked and each of its values is looked up in the taller one, so for a
+        shorter tree of m values the cost is O(m log n), and only the nodes of the result are created.
+        Heights are compared rather than len(), which counts the nodes of a plain AVL in O(n).
+        """
+        if self._get_height(self._root) <= self._get_height(other._root):
+            smaller, larger = self, other
+        else:
+            smaller, larger = other, self
+        nodes = []
+        for node in smaller._iter_nodes():
+            result = larger.find_node_and_parent(node.value)
+            if result:
+                # Keep the node of this tree, which matters for trees whose nodes carry records
+                nodes.append(self._copy_node(node if smaller is self else result[0]))
+        return self._wrap(self._link_balanced(nodes))
+
+    def difference(self, other: 'AVL') -> 'AVL':
+        """
+        This method returns a new tree with the values of this tree that are not in other. Both trees
+        are unchanged. Like union(), it is one O(n + m) in-order merge that creates only the nodes of
+        the result.
+        """
+        nodes = []
+        theirs = other._iter_nodes()
+        their_node = next(theirs, None)
+        for node in self._iter_nodes():
+            while their_node is not None and their_node.value < node.value:
+                their_node = next(theirs, None)
+            if their_node is None or their_node.value != node.value:
+                nodes.append(self._copy_node(node))
+        return self._wrap(self._link_balanced(nodes))
+
+    def update(self, other: 'AVL') -> None:
+        """
+        This method adds the values of other to this tree by splitting and joining subtrees, which costs
+        O(m log(n/m + 1)) for trees of sizes m <= n plus O(len(other)) to copy other, which is unchanged.
+        For a value in both trees the node of this tree is kept, which matters for trees whose nodes
+        carry records.
+        """
+        root = other.copy()._root
+        a, b = self._smaller_first(self._root, root)
+        self._set_root(self._union_nodes(a, b, a is root))
+
+    def intersection_update(self, other: 'AVL') -> None:
+        """
+        This method removes the values that are not in other from this tree, in the same time as update().
+        A copy of other is split apart, so other is unchanged. Like update(), it keeps the nodes of this tree.
+        """
+        root = other.copy()._root
+        a, b = self._smaller_first(self._root, root)
+        self._set_root(self._intersection_nodes(a, b, a is root))
+
+    def difference_update(self, other: 'AVL') -> None:
+        """
+        This method removes the values that are in other from this tree in O(m log(n/m + 1)).
+        Only this tree is split, so other is read in place without being copied.
+        """
+        self._set_root(self._difference_nodes(self._root, other._root))
+
+    def __or__(self, other: 'AVL') -> 'AVL':
+        if not isinstance(other, AVL):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other: 'AVL') -> 'AVL':
+        if not isinstance(other, AVL):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __sub__(self, other: 'AVL') -> 'AVL':
+        if not isinstance(other, AVL):
+            return NotImplemented
+        return self.difference(other)
+
+    def __ior__(self, other: 'AVL') -> 'AVL':
+        if not isinstance(other, AVL):
+            return NotImplemented
+        self.update(other)
+        return self
+
+    def __iand__(self, other: 'AVL') -> 'AVL':
+        if not isinstance(other, AVL):
+            return NotImplemented
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other: 'AVL') -> 'AVL':
+        if not isinstance(other, AVL):
+            return NotImplemented
+        self.difference_update(other)
+        return self
+
+    def _smaller_first(self, a: AVLNode, b: AVLNode) -> (AVLNode, AVLNode):
+        """
+        Orders two subtrees by height, shorter first. The union and intersection helpers recurse over
+        their first subtree and split the second, so recursing over the smaller one does less work.
+        """
+        if self._get_height(b) < self._get_height(a):
+            return b, a
+        return a, b
+
+    def _copy_node(self, node: AVLNode) -> AVLNode:
+        """
+        Creates a new node for this tree holding what node holds. Used by the set operations that
+        leave both trees unchanged.
+        """
+        return self._new_node(node.value)
+
+    def _wrap(self, root: AVLNode) -> 'AVL':
+        """
+        Returns a new tree of the same class that takes ownership of the subtree at root.
+        """
+        tree = type(self)()
+        tree._set_root(root)
+        return tree
+
+    def _set_root(self, root: AVLNode) -> None:
+        """
+        Makes root the root of the tree like BST._set_root(), also clearing its parent pointer, which
+        the split/join helpers leave unset on the subtree they return.
+        """
+        if root is not None:
+            root.parent = None
+        super()._set_root(root)
+
+    def _link(self, left: AVLNode, node: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Makes left and right the children of node, updates its height and returns it.
+        """
+        node.left = left
+        node.right = right
+        if left:
+            left.parent = node
+        if right:
+            right.parent = node
+        self._update_height(node)
+        return node
+
+    def _join_nodes(self, left: AVLNode, pivot: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Joins two AVL subtrees and a pivot node that sorts between them, and returns the new root.
+        The pivot is hung from the spine of the taller subtree at the height of the shorter one and the
+        spine is rebalanced on the way back up, so the cost is the difference in heights.
+        """
+        left_height = self._get_height(left)
+        right_height = self._get_height(right)
+        if left_height > right_height + 1:
+            return self._join_right(left, pivot, right)
+        if right_height > left_height + 1:
+            return self._join_left(left, pivot, right)
+        return self._link(left, pivot, right)
+
+    def _join_right(self, left: AVLNode, pivot: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Joins when left is the taller subtree, walking down its right spine.
+        """
+        spine = left.right
+        if self._get_height(spine) <= self._get_height(right) + 1:
+            joined = self._link(spine, pivot, right)
+            if self._get_height(joined) <= self._get_height(left.left) + 1:
+                return self._link(left.left, left, joined)
+            # The new subtree is two taller than its sibling, fix it with a right-left double rotation
+            return self._rotate_left(self._link(left.left, left, self._rotate_right(joined)))
+        joined = self._join_right(spine, pivot, right)
+        self._link(left.left, left, joined)
+        if self._get_height(joined) <= self._get_height(left.left) + 1:
+            return left
+        return self._rotate_left(left)
+
+    def _join_left(self, left: AVLNode, pivot: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Joins when right is the taller subtree, walking down its left spine.
+        """
+        spine = right.left
+        if self._get_height(spine) <= self._get_height(left) + 1:
+            joined = self._link(left, pivot, spine)
+            if self._get_height(joined) <= self._get_height(right.right) + 1:
+                return self._link(joined, right, right.right)
+            # The new subtree is two taller than its sibling, fix it with a left-right double rotation
+            return self._rotate_right(self._link(self._rotate_left(joined), right, right.right))
+        joined = self._join_left(left, pivot, spine)
+        self._link(joined, right, right.right)
+        if self._get_height(joined) <= self._get_height(right.right) + 1:
+            return right
+        return self._rotate_right(right)
+
+    def _join_two(self, left: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Joins two AVL subtrees without a pivot by taking the largest node of left as the pivot.
+        """
+        if left is None:
+            return right
+        rest, last = self._split_last(left)
+        return self._join_nodes(rest, last, right)
+
+    def _split_last(self, node: AVLNode) -> (AVLNode, AVLNode):
+        """
+        Detaches the largest node of a subtree and returns the remaining subtree and that node.
+        """
+        if node.right is None:
+            rest = node.left
+            node.left = None
+            return rest, node
+        rest, last = self._split_last(node.right)
+        return self._join_nodes(node.left, node, rest), last
+
+    def _split_node(self, node: AVLNode, key: object) -> (AVLNode, AVLNode, AVLNode):
+        """
+        Splits a subtree around key. Returns the subtree of smaller values, the detached node holding
+        key (or None if key is not in the subtree) and the subtree of larger values.
+        Each level rejoins the part of the split that does not contain key, which telescopes to O(log n).
+        """
+        if node is None:
+            return None, None, None
+        left, right = node.left, node.right
+        if key == node.value:
+            node.left = node.right = None
+            return left, node, right
+        if key < node.value:
+            smaller, found, larger = self._split_node(left, key)
+            return smaller, found, self._join_nodes(larger, node, right)
+        smaller, found, larger = self._split_node(right, key)
+        return self._join_nodes(left, node, smaller), found, larger
+
+    def _union_nodes(self, a: AVLNode, b: AVLNode, keep_b: bool = False) -> AVLNode:
+        """
+        Returns the union of two subtrees. b is split around the root of a and the halves are merged
+        with the children of a recursively. For a value in both subtrees the node of a is kept, or the
+        node of b if keep_b is True.
+        """
+        if a is None:
+            return b
+        if b is None:
+            return a
+        smaller, found, larger = self._split_node(b, a.value)
+        left = self._union_nodes(a.left, smaller, keep_b)
+        right = self._union_nodes(a.right, larger, keep_b)
+        return self._join_nodes(left, found if keep_b and found is not None else a, right)
+
+    def _intersection_nodes(self, a: AVLNode, b: AVLNode, keep_b: bool = False) -> AVLNode:
+        """
+        Returns the intersection of two subtrees, keeping the nodes of a (or of b if keep_b is True).
+        b is taken apart.
+        """
+        if a is None or b is None:
+            return None
+        smaller, found, larger = self._split_node(b, a.value)
+        left = self._intersection_nodes(a.left, smaller, keep_b)
+        right = self._intersection_nodes(a.right, larger, keep_b)
+        if found is not None:
+            return self._join_nodes(left, found if keep_b else a, right)
+        return self._join_two(left, right)
+
+    def _difference_nodes(self, a: AVLNode, b: AVLNode) -> AVLNode:
+        """
+        Returns the nodes of a whose value is not in b. a is split around the root of b, b is only read.
+        """
+        if a is None:
+            return None
+        if b is None:
+            return a
+        smaller, _, larger = self._split_node(a, b.value)
+        left = self._difference_nodes(smaller, b.left)
+        right = self._difference_nodes(larger, b.right)
+        return self._join_two(left, right)
+
     def _remove_no_subtrees(self, remove_parent: AVLNode, remove_node: AVLNode) -> None:
         """
         Remove node that has no subtrees (no left or right nodes).
@@ -217,9 +706,11 @@ class AVL(BST):
         s, ps = result[0], result[1]
         # store the successor as the lowest modified node
         low_mod = s
-        # Update pointers to give the removal node's children to its successor
+        # Update pointers to give the removal node's children to its successor. s also takes the height of
+        # the removal node, so the retrace compares against the height this position had before removal
         s.left = remove_node.left
         remove_node.left.parent = s
+        s.height = remove_node.height
         if s is not remove_node.right:
             # If the parent of s is not being removed, then that is the lowest modified node (losing children)
             low_mod = ps
@@ -242,6 +733,37 @@ class AVL(BST):
         # Return the lowest modified node as we will begin rebalancing here
         return low_mod
 
+    def retrace_stats(self) -> dict:
+        """
+        This method returns the number of rotations and the number of nodes visited while retracing
+        since the tree was created or the counts were last reset.
+        """
+        return {'rotations': self._rotation_count, 'nodes_visited': self._retrace_visits}
+
+    def reset_retrace_stats(self) -> None:
+        """
+        This method sets the rotation and retrace counts back to 0.
+        """
+        self._rotation_count = 0
+        self._retrace_visits = 0
+
+    def _retrace(self, node: AVLNode) -> AVLNode:
+        """
+        Walks up from the lowest node changed by an add or remove, rebalancing and updating heights.
+        Once a subtree comes out of _rebalance() with the height it had before the change, nothing above
+        it can change either, so the walk stops there. After an insert that is at the latest right after
+        the first rotation. Returns the root of the subtree the walk stopped at, or None if it reached
+        the root of the tree.
+        """
+        while node:
+            self._retrace_visits += 1
+            old_height = node.height
+            subtree = self._rebalance(node)
+            if subtree.height == old_height:
+                return subtree
+            node = subtree.parent
+        return None
+
     def _balance_factor(self, node: AVLNode) -> int:
         """
         Returns the balance factor of a node by examining the height of its children.
@@ -261,6 +783,7 @@ class AVL(BST):
         """
         Performs a leftward rotation on the root of a subtree. Returns the new root of the subtree.
         """
+        self._rotation_count += 1
         c = node.right
         node.right = c.left
         if node.right:
@@ -275,6 +798,7 @@ class AVL(BST):
         """
         Performs a rightward rotation on the root of a subtree. Returns the new root of the subtree.
         """
+        self._rotation_count += 1
         c = node.left
         node.left = c.right
         if node.left:
@@ -297,10 +821,11 @@ class AVL(BST):
         else:
             node.height = right + 1
 
-    def _rebalance(self, node: AVLNode) -> None:
+    def _rebalance(self, node: AVLNode) -> AVLNode:
         """
         Performs balancing on a node to ensure it meets the AVL property. Unbalanced nodes and their children are
-        rotated as needed to bring the node's balance factor in the range [-1, 1].
+        rotated as needed to bring the node's balance factor in the range [-1, 1]. Returns the root of the
+        subtree after balancing, which is node itself unless it was rotated down.
         """
         # We have a left-heavy node and need to rotate rightward
         if self._balance_factor(node) < -1:
@@ -319,6 +844,7 @@ class AVL(BST):
                 original_parent.left = newRoot
             else:
                 original_parent.right = newRoot
+            return newRoot
         # We have a right-heavy node and need to rotate leftward
         elif self._balance_factor(node) > 1:
             # If it has a left-heavy right child then we must first rotate the right child rightward
@@ -336,9 +862,31 @@ class AVL(BST):
                 original_parent.left = newRoot
             else:
                 original_parent.right = newRoot
+            return newRoot
         # If there is no imbalance then we just update height
         else:
             self._update_height(node)
+            return node
+
+    def _build_balanced(self, values: list) -> AVLNode:
+        """
+        Builds a balanced AVL subtree from a sorted list and returns its root. Duplicates are dropped
+        because the AVL tree does not store them.
+        """
+        nodes = []
+        for value in values:
+            if not nodes or nodes[-1].value != value:
+                nodes.append(self._new_node(value))
+        return self._link_balanced(nodes)
+
+    def _link_built_node(self, node: AVLNode, parent: AVLNode, size: int) -> None:
+        """
+        Sets the parent and height of a node placed by _link_balanced(). Splitting a range of distinct
+        values at its middle gives a subtree whose height depends only on its size, so the height is
+        set directly.
+        """
+        node.parent = parent
+        node.height = size.bit_length() - 1
 
 # ------------------- BASIC TESTING -----------------------------------------
 
@@ -518,3 +1066,164 @@ if __name__ == '__main__':
     print("Tree before make_empty():", tree)
     tree.make_empty()
     print("Tree after make_empty(): ", tree)
+
+    print("\nmethod from_sorted() / from_iterable() example 1")
+    print("-------------------------------------------------")
+    test_cases = (
+        (1, 2, 3, 4, 5, 6, 7),
+        (1, 1, 1, 1),
+        (range(0, 34, 3)),
+    )
+    for case in test_cases:
+        tree = AVL.from_sorted(case)
+        print('INPUT  :', case)
+        print('RESULT :', tree)
+
+    print("\nmethod from_sorted() / from_iterable() example 2")
+    print("-------------------------------------------------")
+    for _ in range(100):
+        case = [random.randrange(1, 20000) for _ in range(900)]
+        tree = AVL.from_iterable(case)
+        if not tree.is_valid_avl() or tree.inorder_traversal().size() != len(set(case)):
+            raise Exception("PROBLEM WITH FROM_ITERABLE OPERATION")
+    print('from_iterable() stress test finished')
+
+    print("\nmethod iter_inorder() example 1")
+    print("-------------------------------")
+    tree = AVL([10, 20, 5, 15, 17, 7, 12])
+    print(list(tree))
+    print(list(reversed(tree)))
+
+    print("\nmethod add_many() / remove_many() example 1")
+    print("-------------------------------------------")
+    tree = AVL([10, 20, 5])
+    tree.add_many([15, 17, 7, 12, 5])
+    print(tree)
+    print("Removed:", tree.remove_many([5, 6, 7, 20]))
+    print(tree)
+
+    print("\nmethod add_many() / remove_many() example 2")
+    print("-------------------------------------------")
+    for _ in range(100):
+        case = set(random.randrange(1, 20000) for _ in range(900))
+        start = random.sample(sorted(case), 300)
+        tree = AVL(start)
+        batch = [random.randrange(1, 20000) for _ in range(random.choice((5, 50, 900)))]
+        tree.add_many(batch)
+        case = set(start) | set(batch)
+        removed = set(random.sample(sorted(case), random.choice((3, 30, 300))))
+        if tree.remove_many(removed) != len(removed):
+            raise Exception("PROBLEM WITH REMOVE_MANY OPERATION")
+        if not tree.is_valid_avl() or list(tree) != sorted(case - removed):
+            raise Exception("PROBLEM WITH ADD_MANY / REMOVE_MANY OPERATION")
+    print('add_many() / remove_many() stress test finished')
+
+    print("\nmethod split() / join() example 1")
+    print("---------------------------------")
+    tree = AVL(range(0, 34, 3))
+    left, found, right = tree.split(15)
+    print('SPLIT 15 :', left, found, right)
+    print('JOIN 15  :', AVL.join(left, 15, right))
+
+    print("\nmethod union() / intersection() / difference() example 1")
+    print("---------------------------------------------------------")
+    a = AVL([10, 20, 5, 15, 17, 7, 12])
+    b = AVL([5, 6, 7, 8, 20, 25])
+    print('UNION        :', list(a | b))
+    print('INTERSECTION :', list(a & b))
+    print('DIFFERENCE   :', list(a - b))
+
+    print("\nmethod union() / intersection() / difference() example 2")
+    print("---------------------------------------------------------")
+    for _ in range(100):
+        case_a = set(random.randrange(1, 2000) for _ in range(random.choice((5, 90, 900))))
+        case_b = set(random.randrange(1, 2000) for _ in range(random.choice((5, 90, 900))))
+        for operator, expected in ((AVL.__ior__, case_a | case_b), (AVL.__iand__, case_a & case_b),
+                                   (AVL.__isub__, case_a - case_b)):
+            a, b = AVL(case_a), AVL(case_b)
+            operator(a, b)
+            if not a.is_valid_avl() or list(a) != sorted(expected) or list(b) != sorted(case_b):
+                raise Exception("PROBLEM WITH SET OPERATION")
+        for operator, expected in ((AVL.__or__, case_a | case_b), (AVL.__and__, case_a & case_b),
+                                   (AVL.__sub__, case_a - case_b)):
+            a, b = AVL(case_a), AVL(case_b)
+            result = operator(a, b)
+            if not result.is_valid_avl() or list(result) != sorted(expected) or \
+                    list(a) != sorted(case_a) or list(b) != sorted(case_b) or not a.is_valid_avl():
+                raise Exception("PROBLEM WITH SET OPERATION")
+        key = random.randrange(1, 2000)
+        left, found, right = AVL(case_a).split(key)
+        if not left.is_valid_avl() or not right.is_valid_avl() or found != (key in case_a) or \
+                list(left) != sorted(v for v in case_a if v < key) or \
+                list(right) != sorted(v for v in case_a if v > key):
+            raise Exception("PROBLEM WITH SPLIT OPERATION")
+    print('set operation stress test finished')
+
+    print("\nmethod pop_min() / pop_max() example 1")
+    print("--------------------------------------")
+    tree = AVL([10, 20, 5, 15, 17, 7, 12])
+    print(tree.pop_min(), tree.pop_max(), tree)
+    print("Minimum value is:", tree.find_min(), "Maximum value is:", tree.find_max())
+
+    print("\nmethod pop_min() / pop_max() example 2")
+    print("--------------------------------------")
+    # Used as a double-ended priority queue, mixed with the other ways of changing the tree
+    for _ in range(100):
+        case = set(random.randrange(1, 2000) for _ in range(300))
+        tree = AVL(case)
+        while case:
+            choice = random.random()
+            if choice < 0.05:
+                values = set(random.randrange(1, 2000) for _ in range(random.choice((2, 20))))
+                tree.add_many(values)
+                case |= values
+            elif choice < 0.15:
+                value = random.choice(list(case))
+                tree.remove(value)
+                case.discard(value)
+            elif choice < 0.6:
+                value = tree.pop_min()
+                if value != min(case):
+                    raise Exception("PROBLEM WITH POP_MIN OPERATION")
+                case.discard(value)
+            else:
+                value = tree.pop_max()
+                if value != max(case):
+                    raise Exception("PROBLEM WITH POP_MAX OPERATION")
+                case.discard(value)
+            if not tree.is_valid_avl() or tree.find_min() != min(case, default=None) or \
+                    tree.find_max() != max(case, default=None):
+                raise Exception("PROBLEM WITH MIN / MAX TRACKING")
+        left, _, right = AVL(range(50)).split(20)
+        if (left.find_min(), left.find_max(), right.find_min(), right.find_max()) != (0, 19, 21, 49):
+            raise Exception("PROBLEM WITH MIN / MAX AFTER SPLIT")
+    print('pop_min() / pop_max() stress test finished')
+
+    print("\nmethod contains_many() / rank_many() example 1")
+    print("----------------------------------------------")
+    tree = AVL([10, 20, 5, 15, 17, 7, 12])
+    print(tree.contains_many([5, 6, 20, 21]), tree.rank_many([5, 6, 20, 21]))
+    tree.add(6)
+    print(tree.contains_many([5, 6, 20, 21]), tree.rank_many([5, 6, 20, 21]))
+    print(AVL(['b', 'd']).contains_many(['a', 'b', 'c', 'd']), tree.contains_many([5.0, 6.5]))
+
+    print("\nmethod contains_many() / rank_many() example 2")
+    print("----------------------------------------------")
+    for _ in range(100):
+        case = set(random.randrange(1, 2000) for _ in range(300))
+        tree = AVL(case)
+        for change in range(4):
+            # Each kind of change has to make the cached copy stale
+            if change == 1:
+                tree.add(random.randrange(1, 2000))
+            elif change == 2:
+                tree.remove(random.choice(list(tree)))
+            elif change == 3:
+                tree.add_many(random.randrange(1, 2000) for _ in range(300))
+            keys = [random.randrange(0, 2001) for _ in range(200)]
+            values = list(tree)
+            if list(tree.contains_many(keys)) != [tree.contains(key) for key in keys] or \
+                    list(tree.rank_many(keys)) != [len([v for v in values if v < key]) for key in keys] or \
+                    tree.contains_many([key + 0.5 for key in keys]) != [False] * len(keys):
+                raise Exception("PROBLEM WITH CONTAINS_MANY OR RANK_MANY OPERATION")
+    print('contains_many() / rank_many() stress test finished')
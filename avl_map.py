@@ -0,0 +1,349 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Implementation of a sorted map on top of the AVL tree. Keys are stored as the node values
+#              so the tree only ever compares keys, and each node carries the mapped value alongside
+
+
+import random
+from operator import itemgetter
+from queue_and_stack import Stack
+from avl import AVLNode, AVL
+
+
+class AVLMapNode(AVLNode):
+    """
+    AVL Map Node class. Inherits from AVLNode
+    """
+    def __init__(self, key: object) -> None:
+        """
+        Initialize a new map node. The key is stored as the node's value
+        """
+        super().__init__(key)
+        self.payload = None     # value mapped to the key
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'AVL Map Node: {}: {}'.format(self.value, self.payload)
+
+
+class AVLMap(AVL):
+    """
+    AVL Map class (a sorted map, like a TreeMap). Inherits from AVL
+
+    Iterating over the map gives its keys in ascending order, and items() gives (key, value) pairs.
+    Setting a key that is already in the map replaces its value in place.
+    Methods inherited from AVL that take values take (key, value) pairs here: add(), add_many(),
+    from_sorted() and from_iterable() raise TypeError for anything else, and like KeyedAVL they keep
+    the value already stored for a key. remove(), contains() and the other lookups take keys. The set
+    operations (update(), union() and so on) combine two maps by key and keep this map's value for a
+    key in both. set_many() sets many keys at once, replacing their values like map[key] = value.
+    """
+
+    def __init__(self, items=None) -> None:
+        """
+        Initialize a new AVL Map from a mapping or an iterable of (key, value) pairs (if provided)
+        """
+        super().__init__()
+        if items is not None:
+            self.set_many(items)
+
+    def __str__(self) -> str:
+        """
+        Override string method; display in pre-order
+        """
+        pairs = []
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node:
+                pairs.append('{}: {}'.format(node.value, node.payload))
+                stack.push(node.right)
+                stack.push(node.left)
+        return "AVLMap pre-order { " + ", ".join(pairs) + " }"
+
+    # ------------------------------------------------------------------ #
+
+    def __getitem__(self, key: object) -> object:
+        """
+        Returns the value mapped to key. Raises KeyError if the key is not in the map.
+        """
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        return node.payload
+
+    def __setitem__(self, key: object, value: object) -> None:
+        """
+        Maps key to value, replacing the old value in place if the key is already in the map.
+        """
+        node, _ = self._add_node(key)
+        node.payload = value
+
+    def __delitem__(self, key: object) -> None:
+        """
+        Removes key and its value. Raises KeyError if the key is not in the map.
+        """
+        if not self.remove(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Returns True if the key is in the map.
+        """
+        return self.contains(key)
+
+    def get(self, key: object, default: object = None) -> object:
+        """
+        Returns the value mapped to key, or default if the key is not in the map.
+        """
+        node = self._find_node(key)
+        if node is None:
+            return default
+        return node.payload
+
+    def setdefault(self, key: object, default: object = None) -> object:
+        """
+        Returns the value mapped to key. If the key is not in the map it is added with default
+        as its value first, in the same descent.
+        """
+        node, added = self._add_node(key)
+        if added:
+            node.payload = default
+        return node.payload
+
+    def pop(self, key: object, *default) -> object:
+        """
+        Removes key and returns its value. If the key is not in the map, returns default if one is
+        given and raises KeyError otherwise.
+        """
+        node = self._find_node(key)
+        if node is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        payload = node.payload
+        self.remove(key)
+        return payload
+
+    def set_many(self, items) -> None:
+        """
+        Sets every key of a mapping, or every (key, value) pair of an iterable, in the map.
+        """
+        if hasattr(items, 'keys'):
+            mapping = items
+            items = ((key, mapping[key]) for key in mapping.keys())
+        for key, value in map(self._pair, items):
+            self[key] = value
+
+    def add(self, item: (object, object)) -> None:
+        """
+        This method adds a (key, value) pair to the map. If the key is already in the map, the method
+        does not change the map.
+        """
+        key, value = self._pair(item)
+        node, added = self._add_node(key)
+        if added:
+            node.payload = value
+
+    def add_many(self, items) -> None:
+        """
+        This method adds every (key, value) pair in an iterable, like AVL.add_many(). Keys that are
+        already in the map, or earlier in the batch, keep their value.
+        """
+        # The sort is stable, so the first pair with a given key is the one that is kept
+        batch = sorted(map(self._pair, items), key=itemgetter(0))
+        if not self._prefers_rebuild(len(batch)):
+            for item in batch:
+                self.add(item)
+            return
+        self._merge_nodes(self._item_nodes(batch))
+
+    @classmethod
+    def from_sorted(cls, items) -> 'AVLMap':
+        """
+        This method builds a perfectly balanced map in O(n) from (key, value) pairs in ascending key
+        order. Only the first pair of a repeated key is kept.
+        """
+        nodes = []
+        tree = cls()
+        for node in tree._item_nodes(list(map(cls._pair, items))):
+            if not nodes or nodes[-1].value != node.value:
+                nodes.append(node)
+        tree._set_root(tree._link_balanced(nodes))
+        return tree
+
+    @classmethod
+    def from_iterable(cls, items) -> 'AVLMap':
+        """
+        This method builds a perfectly balanced map from (key, value) pairs in any order in O(n log n).
+        """
+        return cls.from_sorted(sorted(map(cls._pair, items), key=itemgetter(0)))
+
+    def keys(self):
+        """
+        Returns an iterator over the keys in ascending order.
+        """
+        return self.iter_inorder()
+
+    def values(self):
+        """
+        Returns an iterator over the values, ordered by their keys.
+        """
+        for node in self._iter_nodes():
+            yield node.payload
+
+    def items(self):
+        """
+        Returns an iterator over the (key, value) pairs in ascending key order.
+        """
+        for node in self._iter_nodes():
+            yield node.value, node.payload
+
+    def copy(self) -> 'AVLMap':
+        """
+        Returns a new map with the same keys and values, built in O(n).
+        """
+        result = type(self)()
+        result._set_root(result._link_balanced([result._copy_node(node) for node in self._iter_nodes()]))
+        return result
+
+    @classmethod
+    def load(cls, path: str) -> 'AVLMap':
+        """
+        This method builds a map in O(n) from a file written by dump(), with the stored shape if the
+        file has one and perfectly balanced otherwise.
+        """
+        from tree_io import load_values
+        items, heights = load_values(path)
+        tree = cls()
+        nodes = tree._loaded_nodes(items)
+        tree._set_root(tree._link_shaped(nodes, heights) if heights is not None else tree._link_balanced(nodes))
+        return tree
+
+    def _dumped_values(self) -> list:
+        """
+        Returns the (key, value) pairs, so dump() keeps the mapped values.
+        """
+        return list(self.items())
+
+    def _loaded_nodes(self, items: list) -> list:
+        """
+        Creates the nodes for the (key, value) pairs read by load().
+        """
+        return self._item_nodes(items)
+
+    @staticmethod
+    def _pair(item: object) -> (object, object):
+        """
+        Returns item if it is a (key, value) pair and raises TypeError otherwise.
+        """
+        if not isinstance(item, tuple) or len(item) != 2:
+            raise TypeError('AVLMap takes (key, value) pairs, not {!r}'.format(item))
+        return item
+
+    def _item_nodes(self, items: list) -> list:
+        """
+        Creates the nodes for a list of (key, value) pairs.
+        """
+        nodes = []
+        for key, value in items:
+            node = self._new_node(key)
+            node.payload = value
+            nodes.append(node)
+        return nodes
+
+    def _copy_node(self, node: AVLMapNode) -> AVLMapNode:
+        """
+        Creates a new node holding the key and value of node.
+        """
+        copied = self._new_node(node.value)
+        copied.payload = node.payload
+        return copied
+
+    def _find_node(self, key: object) -> AVLMapNode:
+        """
+        Returns the node holding key, or None if the key is not in the map.
+        """
+        n = self._root
+        while n is not None:
+            if n.value == key:
+                return n
+            elif key < n.value:
+                n = n.left
+            else:
+                n = n.right
+        return None
+
+    def _new_node(self, key: object) -> AVLMapNode:
+        """
+        Creates the node that stores a new key.
+        """
+        return AVLMapNode(key)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod __setitem__() / __getitem__() example 1")
+    print("----------------------------------------------")
+    tree = AVLMap([(10, 'ten'), (20, 'twenty'), (5, 'five')])
+    tree[15] = 'fifteen'
+    tree[10] = 'TEN'
+    print(tree)
+    print(tree[10], tree.get(11), tree.get(11, 'missing'), 15 in tree)
+    print(tree.setdefault(7, 'seven'), tree.setdefault(7, 'SEVEN'))
+    del tree[20]
+    print(list(tree.items()))
+
+    print("\nmethod __setitem__() / __delitem__() example 2")
+    print("----------------------------------------------")
+    for _ in range(100):
+        tree, reference = AVLMap(), {}
+        for _ in range(900):
+            key = random.randrange(1, 500)
+            if random.random() < 0.3 and key in reference:
+                del tree[key]
+                del reference[key]
+            else:
+                tree[key] = reference[key] = random.random()
+        if not tree.is_valid_avl() or list(tree.items()) != sorted(reference.items()):
+            raise Exception("PROBLEM WITH MAP OPERATION")
+        if list(tree.copy().items()) != list(tree.items()):
+            raise Exception("PROBLEM WITH COPY OPERATION")
+    print('map stress test finished')
+
+    print("\nmethod add_many() / from_iterable() / update() example 3")
+    print("--------------------------------------------------------")
+    for _ in range(100):
+        pairs = [(random.randrange(1, 300), random.random()) for _ in range(random.randrange(0, 400))]
+        first = {}
+        for key, value in pairs:
+            first.setdefault(key, value)
+        other = {key: random.random() for key in random.sample(range(1, 300), random.randrange(0, 100))}
+        tree, built = AVLMap(other), AVLMap.from_iterable(pairs)
+        tree.add_many(pairs)
+        if list(built.items()) != sorted(first.items()) or not built.is_valid_avl() or \
+                list(tree.items()) != sorted({**first, **other}.items()) or not tree.is_valid_avl():
+            raise Exception("PROBLEM WITH ADD_MANY OR FROM_ITERABLE OPERATION")
+        union, joined = built | AVLMap(other), AVLMap(other)
+        joined.update(built)
+        # union() keeps the values of built, update() keeps those of joined, and neither changes built
+        if list(union.items()) != sorted({**other, **first}.items()) or list(built.items()) != sorted(first.items()):
+            raise Exception("PROBLEM WITH UNION OPERATION")
+        if list(joined.items()) != sorted({**first, **other}.items()) or not joined.is_valid_avl():
+            raise Exception("PROBLEM WITH UPDATE OPERATION")
+    for bad in (lambda: AVLMap().add(5), lambda: AVLMap().add_many([1, 2]), lambda: AVLMap.from_sorted([(1, 2, 3)]),
+                lambda: AVLMap.from_iterable(['ab'])):
+        try:
+            bad()
+        except TypeError:
+            continue
+        raise Exception("PROBLEM WITH PAIR CHECK")
+    print('map bulk stress test finished')
@@ -0,0 +1,662 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Benchmarks for the tree implementations. Run "python benchmark.py [name ...]" to run
+#              some of the benchmarks, or no names to run all of them.
+
+
+import asyncio
+import gc
+import multiprocessing
+import os
+import pickle
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from bst import BST
+from avl import AVL
+from array_avl import ArrayAVL
+from stack_avl import StackAVL
+from keyed import KeyedAVL
+from multiset import MultisetBST, MultisetAVL
+from red_black import RedBlackTree
+from splay import SplayTree
+from btree import BTree
+from persistent_avl import PersistentAVL
+from sharded_avl import ShardedAVL
+from async_tree import AsyncAVL
+from tree_io import load_values
+from durable_avl import DurableAVL
+
+
+def _timed(function, *args) -> float:
+    """
+    Calls function with args and returns the elapsed wall-clock time in seconds. Garbage left by
+    earlier runs is collected first so a collection of it does not land inside the timed call.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _print_header(title: str) -> None:
+    """
+    Prints a section header in the same format as the testing output of the tree modules.
+    """
+    print("\n" + title)
+    print("-" * len(title))
+
+
+def bench_batch(n: int = 200000) -> None:
+    """
+    Compares add_many() / remove_many() with the same values added or removed one at a time.
+    """
+    _print_header("add_many() / remove_many() vs single add() / remove()")
+    values = random.sample(range(n * 10), n)
+    for batch_size in (n // 100, n // 10, n):
+        start, batch = values[:n // 2], random.sample(range(n * 10), batch_size)
+
+        single = AVL.from_iterable(start)
+        single_time = _timed(lambda: [single.add(value) for value in batch])
+        batched = AVL.from_iterable(start)
+        batched_time = _timed(batched.add_many, batch)
+        print("add    batch {:>7} into {:>7}: single {:8.3f}s  add_many    {:8.3f}s  ({:.1f}x)".format(
+            batch_size, n // 2, single_time, batched_time, single_time / batched_time))
+
+        removals = random.sample(start, min(batch_size, len(start)))
+        single_time = _timed(lambda: [single.remove(value) for value in removals])
+        batched_time = _timed(batched.remove_many, removals)
+        print("remove batch {:>7} from {:>7}: single {:8.3f}s  remove_many {:8.3f}s  ({:.1f}x)".format(
+            len(removals), len(list(single)) + len(removals), single_time, batched_time,
+            single_time / batched_time))
+        if list(single) != list(batched) or not batched.is_valid_avl():
+            raise Exception("PROBLEM WITH BATCH OPERATIONS")
+
+
+def bench_set_ops(n: int = 200000) -> None:
+    """
+    Compares the split/join set operations with re-inserting one tree into the other.
+    """
+    _print_header("update() / difference_update() vs add() / remove() loops")
+    big = random.sample(range(n * 10), n)
+    for m in (n // 1000, n // 100, n // 10, n):
+        small = random.sample(range(n * 10), m)
+        loop, joined = AVL.from_iterable(big), AVL.from_iterable(big)
+        other = AVL.from_iterable(small)
+        loop_time = _timed(lambda: [loop.add(value) for value in other])
+        joined_time = _timed(joined.update, other)
+        print("union      m = {:>7} into n = {:>7}: add loop {:8.3f}s  update()            {:8.3f}s  ({:.1f}x)"
+              .format(m, n, loop_time, joined_time, loop_time / joined_time))
+        loop_time = _timed(lambda: [loop.remove(value) for value in other])
+        joined_time = _timed(joined.difference_update, other)
+        print("difference m = {:>7} from n = {:>7}: remove loop {:5.3f}s  difference_update() {:8.3f}s  ({:.1f}x)"
+              .format(m, n, loop_time, joined_time, loop_time / joined_time))
+        if list(loop) != list(joined) or not joined.is_valid_avl():
+            raise Exception("PROBLEM WITH SET OPERATIONS")
+
+
+class _CountingAVL(AVL):
+    """
+    AVL tree that counts its _update_height() calls.
+    """
+    _update_count = 0
+
+    def _update_height(self, node) -> None:
+        self._update_count += 1
+        super()._update_height(node)
+
+
+class _FullRetraceAVL(_CountingAVL):
+    """
+    AVL tree that retraces all the way to the root after every change, like add() and remove() used to.
+    """
+    def _retrace(self, node) -> None:
+        while node:
+            self._retrace_visits += 1
+            self._rebalance(node)
+            node = node.parent
+        return None
+
+
+def bench_retrace(n: int = 100000) -> None:
+    """
+    Compares the early-terminating retrace with a full retrace to the root.
+    """
+    _print_header("early-terminating retrace vs full retrace")
+    workloads = (
+        ('random', random.sample(range(n * 10), n)),
+        ('sequential', list(range(n))),
+    )
+    for name, values in workloads:
+        removals = random.sample(values, n // 2)
+        for cls in (_FullRetraceAVL, _CountingAVL):
+            tree = cls()
+            add_time = _timed(lambda: [tree.add(value) for value in values])
+            add_updates, add_stats = tree._update_count, tree.retrace_stats()
+            tree._update_count = 0
+            tree.reset_retrace_stats()
+            remove_time = _timed(lambda: [tree.remove(value) for value in removals])
+            if not tree.is_valid_avl():
+                raise Exception("PROBLEM WITH RETRACE")
+            print("{:<10} {:<6} add: {:6.2f} _update_height / {:6.2f} visits / {:5.3f} rotations per op {:6.3f}s"
+                  "  remove: {:6.2f} / {:6.2f} / {:5.3f} {:6.3f}s".format(
+                      name, 'full' if cls is _FullRetraceAVL else 'early',
+                      add_updates / n, add_stats['nodes_visited'] / n, add_stats['rotations'] / n, add_time,
+                      tree._update_count / len(removals), tree.retrace_stats()['nodes_visited'] / len(removals),
+                      tree.retrace_stats()['rotations'] / len(removals), remove_time))
+
+
+def _traced_memory(function, *args) -> (int, object):
+    """
+    Calls function with args and returns the bytes it allocated that are still alive, and its result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = function(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def bench_memory(n: int = 200000) -> None:
+    """
+    Compares the memory used per key by the object-based AVL and the array-backed ArrayAVL.
+    """
+    _print_header("memory per key: AVL vs ArrayAVL")
+    values = random.sample(range(n * 10), n)
+    for cls in (AVL, ArrayAVL):
+        start = time.perf_counter()
+        used, tree = _traced_memory(lambda: cls(values))
+        elapsed = time.perf_counter() - start
+        print("{:<8} {:>9} keys: {:8.1f} MB  {:6.1f} bytes/key  (built in {:.2f}s, traced)".format(
+            cls.__name__, n, used / 2 ** 20, used / n, elapsed))
+        del tree
+
+
+def _churn_trees(cls, n: int, rounds: int, results) -> None:
+    """
+    Builds, trims and drops a tree of n keys rounds times in a fresh process, then reports the run
+    time, the garbage collector's pause times and the process's peak RSS through results.
+    """
+    pauses = []
+    started = []
+
+    def on_gc(phase: str, info: dict) -> None:
+        if phase == 'start':
+            started.append(time.perf_counter())
+        else:
+            pauses.append((info['generation'], time.perf_counter() - started.pop()))
+
+    gc.callbacks.append(on_gc)
+    values = random.sample(range(n * 10), n)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        tree = cls(values)
+        for value in values[::2]:
+            tree.remove(value)
+        tree = None
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(on_gc)
+    oldest = [pause for generation, pause in pauses if generation == 2] or [0.0]
+    results.put((elapsed, len(oldest), max(oldest), sum(pause for _, pause in pauses),
+                 resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def bench_gc(n: int = 200000, rounds: int = 4) -> None:
+    """
+    Compares garbage collector pauses and peak RSS of AVL, whose parent pointers make reference cycles,
+    with the parent-pointer-free StackAVL. Each tree class runs in its own process so the peak RSS
+    readings do not mix.
+    """
+    _print_header("GC pauses and peak RSS: AVL vs StackAVL")
+    for cls in (AVL, StackAVL):
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_churn_trees, args=(cls, n, rounds, results))
+        process.start()
+        elapsed, full_count, full_max, total, peak = results.get()
+        process.join()
+        print("{:<8} {} x {} keys: {:6.2f}s  {:2} full collections, longest {:7.1f} ms, all GC {:7.1f} ms"
+              "  peak RSS {:6.1f} MB".format(cls.__name__, rounds, n, elapsed, full_count, full_max * 1000,
+                                            total * 1000, peak / 1024))
+
+
+class _Record:
+    """
+    Record whose rich comparisons are as expensive as a typical multi-field ordering: each one builds
+    a normalized tuple of its fields.
+    """
+    def __init__(self, record_id: int, name: str) -> None:
+        self.record_id = record_id
+        self.name = name
+
+    def _order(self) -> tuple:
+        return self.record_id, self.name.lower()
+
+    def __lt__(self, other: '_Record') -> bool:
+        return self._order() < other._order()
+
+    def __eq__(self, other: '_Record') -> bool:
+        return self._order() == other._order()
+
+
+def bench_keyed(n: int = 100000) -> None:
+    """
+    Compares an AVL tree of records that compare themselves with a KeyedAVL that caches an int key.
+    """
+    _print_header("AVL of records vs KeyedAVL(key=record_id)")
+    records = [_Record(record_id, 'Name{}'.format(record_id)) for record_id in random.sample(range(n * 10), n)]
+    probes = random.sample(records, n // 2)
+    for name, make in (('AVL', lambda: AVL()), ('KeyedAVL', lambda: KeyedAVL(key=lambda r: r.record_id))):
+        tree = make()
+        add_time = _timed(lambda: [tree.add(record) for record in records])
+        contains_time = _timed(lambda: [tree.contains(record) for record in probes])
+        remove_time = _timed(lambda: [tree.remove(record) for record in probes])
+        print("{:<9} add {:6.3f}s  contains {:6.3f}s  remove {:6.3f}s".format(
+            name, add_time, contains_time, remove_time))
+
+
+def _tree_height(root) -> int:
+    """
+    Returns the height of the subtree at root, walking it with an explicit stack so that long chains
+    of duplicates do not exceed the recursion limit.
+    """
+    height = -1
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if node is not None:
+            height = max(height, depth)
+            stack.append((node.left, depth + 1))
+            stack.append((node.right, depth + 1))
+    return height
+
+
+def bench_multiset(n: int = 20000, distinct: int = 100) -> None:
+    """
+    Compares a BST that chains duplicates with the counted MultisetBST and MultisetAVL on a workload
+    of n values drawn from only a few distinct ones.
+    """
+    _print_header("heavy duplicates: BST vs MultisetBST vs MultisetAVL")
+    values = [random.randrange(distinct) for _ in range(n)]
+    probes = random.sample(values, n // 10)
+    for cls in (BST, MultisetBST, MultisetAVL):
+        add_time = _timed(lambda: cls(values))
+        used, tree = _traced_memory(lambda: cls(values))
+        contains_time = _timed(lambda: [tree.contains(value) for value in probes])
+        print("{:<12} {} values, {} distinct: add {:7.3f}s  contains {:6.3f}s  height {:5}  {:7.1f} KB".format(
+            cls.__name__, n, distinct, add_time, contains_time, _tree_height(tree.get_root()), used / 1024))
+
+
+def bench_red_black(n: int = 100000) -> None:
+    """
+    Compares rotations, retrace or fix-up steps and time per update of AVL and RedBlackTree.
+    """
+    _print_header("AVL vs RedBlackTree: rotations per update")
+    workloads = (
+        ('random', random.sample(range(n * 10), n)),
+        ('sequential', list(range(n))),
+    )
+    for name, values in workloads:
+        removals = random.sample(values, n // 2)
+        probes = random.sample(values, n // 2)
+        for cls in (AVL, RedBlackTree):
+            tree = cls()
+            add_time = _timed(lambda: [tree.add(value) for value in values])
+            add_stats = tree.retrace_stats()
+            height = _tree_height(tree.get_root())
+            contains_time = _timed(lambda: [tree.contains(value) for value in probes])
+            tree.reset_retrace_stats()
+            remove_time = _timed(lambda: [tree.remove(value) for value in removals])
+            remove_stats = tree.retrace_stats()
+            print("{:<10} {:<12} add: {:5.3f} rotations {:5.2f} steps per op {:6.3f}s  remove: {:5.3f} / {:5.2f}"
+                  " {:6.3f}s  height {:3}  contains {:6.3f}s".format(
+                      name, cls.__name__, add_stats['rotations'] / n, add_stats['nodes_visited'] / n, add_time,
+                      remove_stats['rotations'] / len(removals), remove_stats['nodes_visited'] / len(removals),
+                      remove_time, height, contains_time))
+
+
+def _zipf_sample(keys: list, count: int, s: float) -> list:
+    """
+    Draws count keys where the k-th key of the list is picked with probability proportional to 1 / k ** s.
+    """
+    weights = [1 / rank ** s for rank in range(1, len(keys) + 1)]
+    return random.choices(keys, weights=weights, k=count)
+
+
+def bench_splay(n: int = 100000, lookups: int = 500000) -> None:
+    """
+    Compares AVL.contains() with SplayTree.contains() on uniform and Zipf-distributed lookups.
+    """
+    _print_header("AVL vs SplayTree: contains() under skewed lookups")
+    keys = random.sample(range(n * 10), n)
+    workloads = (
+        ('uniform', random.choices(keys, k=lookups)),
+        ('zipf 0.8', _zipf_sample(keys, lookups, 0.8)),
+        ('zipf 1.1', _zipf_sample(keys, lookups, 1.1)),
+        ('zipf 1.5', _zipf_sample(keys, lookups, 1.5)),
+    )
+    for name, probes in workloads:
+        times = []
+        for cls in (AVL, SplayTree):
+            tree = cls.from_iterable(keys)
+            times.append(_timed(lambda: [tree.contains(value) for value in probes]))
+        print("{:<9} {} lookups in {} keys: AVL {:6.3f}s  SplayTree {:6.3f}s  ({:.2f}x)".format(
+            name, lookups, n, times[0], times[1], times[0] / times[1]))
+
+
+def bench_btree(sizes: tuple = (10 ** 5, 10 ** 6), capacities: tuple = (16, 64, 256)) -> None:
+    """
+    Compares AVL with BTree at several node capacities: adding random values one at a time, looking up
+    half of them, removing half of them and the memory of a tree built by from_iterable(). 10 ** 7 keys
+    can be passed in sizes, but the AVL tree needs several GB of memory at that size.
+    """
+    _print_header("AVL vs BTree: add / contains / remove / memory")
+    for n in sizes:
+        values = random.sample(range(n * 10), n)
+        probes = random.sample(values, n // 2)
+        engines = [('AVL', AVL, {})] + [('BTree({})'.format(c), BTree, {'capacity': c}) for c in capacities]
+        for name, cls, options in engines:
+            tree = cls(**options)
+            add_time = _timed(lambda: [tree.add(value) for value in values])
+            contains_time = _timed(lambda: [tree.contains(value) for value in probes])
+            remove_time = _timed(lambda: [tree.remove(value) for value in probes])
+            tree = None
+            used, tree = _traced_memory(lambda: cls.from_iterable(values, **options))
+            tree = None
+            print("{:<11} {:>8} keys: add {:7.3f}s  contains {:7.3f}s  remove {:7.3f}s  {:7.1f} bytes/key".format(
+                name, n, add_time, contains_time, remove_time, used / n))
+
+
+def bench_freeze(n: int = 200000) -> None:
+    """
+    Compares lookups on a live AVL tree with lookups on its frozen snapshot, and times freeze() itself.
+    """
+    _print_header("AVL vs AVL.freeze(): read-only lookups")
+    values = random.sample(range(n * 10), n)
+    probes = random.sample(range(n * 10), n)
+    tree = AVL.from_iterable(values)
+    freeze_time = _timed(tree.freeze)
+    frozen = tree.freeze()
+    for name, queries in (('contains', lambda t: [t.contains(value) for value in probes]),
+                          ('floor', lambda t: [t.floor(value) for value in probes]),
+                          ('count_range', lambda t: [t.count_range(value, value + 50) for value in probes])):
+        live_time = _timed(queries, tree)
+        frozen_time = _timed(queries, frozen)
+        print("{:<12} {} queries on {} keys: AVL {:6.3f}s  frozen {:6.3f}s  ({:.1f}x)".format(
+            name, n, n, live_time, frozen_time, live_time / frozen_time))
+    print("freeze() of {} keys: {:.3f}s".format(n, freeze_time))
+
+
+def bench_contains_many(n: int = 200000, batch: int = 200000) -> None:
+    """
+    Compares a batch of single contains() calls with contains_many(), both with a fresh cache (the
+    tree changed just before the batch) and with the cached copy reused.
+    """
+    _print_header("contains() loop vs contains_many()")
+    tree = AVL.from_iterable(random.sample(range(n * 10), n))
+    keys = [random.randrange(n * 10) for _ in range(batch)]
+    loop_time = _timed(lambda: [tree.contains(key) for key in keys])
+    tree.add(-1)
+    cold_time = _timed(tree.contains_many, keys)
+    warm_time = _timed(tree.contains_many, keys)
+    print("{} keys against {}: loop {:6.3f}s  contains_many cold {:6.3f}s ({:.1f}x)  warm {:6.3f}s ({:.1f}x)".format(
+        batch, n, loop_time, cold_time, loop_time / cold_time, warm_time, loop_time / warm_time))
+
+
+def _keep_versions(tree, updates: list) -> list:
+    """
+    Adds or removes each value in updates and keeps a snapshot of every version of the tree.
+    """
+    versions = []
+    for add, value in updates:
+        if add:
+            tree.add(value)
+        else:
+            tree.remove(value)
+        versions.append(tree.snapshot())
+    return versions
+
+
+def bench_persistent(n: int = 100000, updates: int = 20000, copies: int = 5) -> None:
+    """
+    Measures the memory kept alive by each version of a PersistentAVL, and compares it with snapshots
+    made by copying a whole AVL tree. Also compares the time of an update with AVL.
+    """
+    _print_header("PersistentAVL: memory per kept version")
+    values = random.sample(range(n * 10), n)
+    changes = [(random.random() < 0.5, random.randrange(n * 10)) for _ in range(updates)]
+    tree = PersistentAVL.from_iterable(values)
+    used, versions = _traced_memory(_keep_versions, tree, changes)
+    print("PersistentAVL {} keys, {} versions kept: {:6.1f} MB  {:6.1f} bytes/update  (height {})".format(
+        n, updates, used / 2 ** 20, used / updates, _tree_height(tree.get_root())))
+    versions = None
+    avl = AVL.from_iterable(values)
+    used, kept = _traced_memory(lambda: [avl.copy() for _ in range(copies)])
+    kept = None
+    print("AVL.copy()    {} keys, {} copies kept:   {:6.1f} MB  {:6.0f} bytes/copy".format(
+        n, copies, used / 2 ** 20, used / copies))
+    for cls in (AVL, PersistentAVL):
+        tree = cls.from_iterable(values)
+        elapsed = _timed(lambda: [tree.add(value) if add else tree.remove(value) for add, value in changes])
+        print("{:<13} {} updates: {:6.3f}s".format(cls.__name__, updates, elapsed))
+
+
+def bench_sharded(n: int = 400000, shards: int = None) -> None:
+    """
+    Compares the batch methods of one AVL with the same batches split across ShardedAVL worker
+    processes. Both sides batch, so the difference is the parallel work less the cost of pickling
+    values to the workers, and it depends on the number of cores.
+    """
+    shards = shards or os.cpu_count() or 1
+    _print_header("AVL vs ShardedAVL ({} shards, {} CPUs)".format(shards, os.cpu_count()))
+    values = random.sample(range(n * 10), n)
+    probes = [random.randrange(n * 10) for _ in range(n)]
+    ranges = [sorted(random.randrange(n * 10) for _ in range(2)) for _ in range(20)]
+    tree = AVL()
+    add_time = _timed(tree.add_many, values)
+    contains_time = _timed(tree.contains_many, probes)
+    range_time = _timed(lambda: [tree.count_range(lo, hi) for lo, hi in ranges])
+    tree = None
+    splits = sorted(random.sample(values, shards - 1))
+    with ShardedAVL(splits) as sharded:
+        sharded_add = _timed(sharded.add_many, values)
+        sharded_contains = _timed(sharded.contains_many, probes)
+        sharded_range = _timed(lambda: [sharded.count_range(lo, hi) for lo, hi in ranges])
+    for name, single, split in (('add', add_time, sharded_add), ('contains', contains_time, sharded_contains),
+                                ('count_range', range_time, sharded_range)):
+        print("{:<12} {} keys: AVL {:6.3f}s  ShardedAVL {:6.3f}s  ({:.1f}x)".format(
+            name, n, single, split, single / split))
+
+
+async def _loop_lag(work, interval: float = 0.001) -> (float, float, float):
+    """
+    Runs the coroutine work while a ticker task sleeps for interval over and over, and returns the run
+    time of work and the longest and 99th percentile delay of the ticker's wake-ups past their due time.
+    """
+    lags = []
+    done = False
+
+    async def ticker() -> None:
+        while not done:
+            due = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - due)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    lags.sort()
+    return elapsed, lags[-1], lags[len(lags) * 99 // 100]
+
+
+def bench_async(n: int = 200000, chunk_sizes: tuple = (100, 1000, 10000)) -> None:
+    """
+    Measures the event-loop latency of building a tree, traversing it and clearing half of it, done
+    synchronously inside a coroutine and through AsyncAVL with several chunk sizes. The worst lag of
+    the chunked runs is set by full garbage collections of the AVL's parent-pointer cycles (see the
+    gc benchmark), the 99th percentile by the chunk size.
+    """
+    _print_header("event-loop latency: blocking AVL vs AsyncAVL")
+    values = random.sample(range(n * 10), n)
+
+    async def blocking() -> None:
+        tree = AVL(values)
+        tree.inorder_traversal()
+        tree.remove_many(list(tree.iter_range(0, n * 5, (True, False))))
+
+    def chunked(chunk_size: int):
+        async def work() -> None:
+            tree = await AsyncAVL.from_iterable(values, chunk_size)
+            async for _ in tree:
+                pass
+            await tree.remove_range(0, n * 5, (True, False))
+        return work
+
+    gc.collect()
+    for name, work in [('blocking', blocking)] + [('chunk ' + str(size), chunked(size)) for size in chunk_sizes]:
+        elapsed, worst, p99 = asyncio.run(_loop_lag(work))
+        print("{:<12} {} keys: {:6.3f}s  worst loop lag {:8.1f} ms  p99 lag {:8.2f} ms".format(
+            name, n, elapsed, worst * 1000, p99 * 1000))
+
+
+def _pickle_to(path: str, value: object) -> None:
+    """
+    Pickles value to a file at path.
+    """
+    with open(path, 'wb') as file:
+        pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+
+
+def _unpickle_from(path: str) -> object:
+    """
+    Unpickles the value in a file at path.
+    """
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+def bench_dump(n: int = 200000) -> None:
+    """
+    Compares saving and loading an AVL tree with pickle (the node objects, and a sorted list rebuilt
+    with from_sorted()) against dump() and load(), with and without the stored shape.
+    """
+    _print_header("AVL persistence: pickle vs dump()/load()")
+    tree = AVL.from_iterable(random.sample(range(n * 10), n))
+    tree.remove(tree.find_min())
+    path = os.path.join(tempfile.mkdtemp(), 'tree')
+    limit = sys.getrecursionlimit()
+    # Pickling the nodes follows left, right and parent references recursively
+    sys.setrecursionlimit(max(limit, 100000))
+    cases = (('pickle nodes', lambda: _pickle_to(path, tree), lambda: _unpickle_from(path)),
+             ('pickle list', lambda: _pickle_to(path, list(tree)), lambda: AVL.from_sorted(_unpickle_from(path))),
+             ('dump', lambda: tree.dump(path), lambda: AVL.load(path)),
+             ('dump shape', lambda: tree.dump(path, shape=True), lambda: AVL.load(path)))
+    try:
+        for name, save, load in cases:
+            save_time = _timed(save)
+            size = os.path.getsize(path)
+            load_time = _timed(load)
+            loaded = load()
+            same = 'same shape' if str(loaded) == str(tree) else 'rebalanced'
+            print("{:<13} {} keys: save {:6.3f}s  load {:6.3f}s  {:7.2f} MB  ({})".format(
+                name, n, save_time, load_time, size / 2 ** 20, same))
+            loaded = None
+        # Reading alone, without building the tree
+        _pickle_to(path, list(tree))
+        unpickle_time = _timed(_unpickle_from, path)
+        tree.dump(path)
+        read_time = _timed(load_values, path)
+        print("reading the values only: unpickle list {:6.3f}s  load_values {:6.3f}s  ({:.1f}x)".format(
+            unpickle_time, read_time, unpickle_time / read_time))
+    finally:
+        sys.setrecursionlimit(limit)
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+
+def _mixed_changes(tree, values: list) -> None:
+    """
+    Adds values to tree, and after about one add in five removes a value added earlier.
+    """
+    for i, value in enumerate(values):
+        tree.add(value)
+        if random.random() < 0.2:
+            tree.remove(values[random.randrange(i + 1)])
+
+
+def bench_durable(n: int = 200000, tails: tuple = (0, 1000, 10000, 100000)) -> None:
+    """
+    Measures the time to reopen a DurableAVL from a checkpoint of about n values plus a log tail of
+    several lengths, against replaying a log of every change with no checkpoint. The logs mix adds
+    and removes. Also compares the write rate for several batch sizes of fsync.
+    """
+    _print_header("DurableAVL: recovery time and logged write rate")
+    values = random.sample(range(n * 10), n)
+    directory = tempfile.mkdtemp()
+    try:
+        for tail in tails:
+            shutil.rmtree(directory)
+            with DurableAVL(directory, sync_every=4096) as tree:
+                tree.add_many(values)
+                tree.checkpoint()
+                _mixed_changes(tree, random.sample(range(n * 10, n * 20), tail))
+            reopened = []
+            elapsed = _timed(lambda: reopened.append(DurableAVL(directory)))
+            stats = reopened[0].recovery_stats()
+            reopened[0].close()
+            print("checkpoint {} + tail {:>6}: reopen {:6.3f}s  (load {:6.3f}s, replay {:6.3f}s)".format(
+                stats['checkpoint_values'], stats['replayed_records'], elapsed, stats['load_seconds'],
+                stats['replay_seconds']))
+        shutil.rmtree(directory)
+        with DurableAVL(directory, sync_every=4096) as tree:
+            _mixed_changes(tree, values)
+        reopened = []
+        elapsed = _timed(lambda: reopened.append(DurableAVL(directory)))
+        stats = reopened[0].recovery_stats()
+        reopened[0].close()
+        print("no checkpoint, log of {} records: reopen {:6.3f}s".format(stats['replayed_records'], elapsed))
+        for sync_every in (1, 64, 4096):
+            shutil.rmtree(directory)
+            with DurableAVL(directory, sync_every=sync_every) as tree:
+                count = 2000 if sync_every == 1 else 50000
+                elapsed = _timed(tree.add_many, values[:count])
+            print("sync_every {:>4}: {:8.0f} logged adds/s".format(sync_every, count / elapsed))
+    finally:
+        shutil.rmtree(directory)
+
+
+BENCHMARKS = {
+    'batch': bench_batch,
+    'set_ops': bench_set_ops,
+    'retrace': bench_retrace,
+    'memory': bench_memory,
+    'gc': bench_gc,
+    'keyed': bench_keyed,
+    'multiset': bench_multiset,
+    'red_black': bench_red_black,
+    'splay': bench_splay,
+    'btree': bench_btree,
+    'freeze': bench_freeze,
+    'contains_many': bench_contains_many,
+    'persistent': bench_persistent,
+    'sharded': bench_sharded,
+    'async': bench_async,
+    'dump': bench_dump,
+    'durable': bench_durable,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -7,8 +7,14 @@
 
 
 import random
+from bisect import bisect_left
 from queue_and_stack import *
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class BSTNode:
     """
@@ -37,6 +43,12 @@ class BST:
     """
     Binary Search Tree class
     """
+    # Nodes holding the lowest and highest values, kept up to date so find_min() and find_max() are O(1)
+    _min_node = None
+    _max_node = None
+    # Bumped on every change to the values in the tree, so cached copies of them can tell they are stale
+    _version = 0
+    _sorted_cache = None
 
     def __init__(self, start_tree=None) -> None:
         """
@@ -110,9 +122,10 @@ class BST:
         This method adds a new value to the tree. Duplicate values are allowed. If a node with
         that value is already in the tree, the new value should be added to the right subtree of that node.
         """
+        node = BSTNode(value)
         # Ensure that the node has a root, or make one
         if self._root is None:
-            self._root = BSTNode(value)
+            self._root = node
         # Find the location of the node we are adding and store its parent
         else:
             parent = None
@@ -125,9 +138,10 @@ class BST:
                     n = n.right
             # Create a new node as the left or right child of the stored parent node
             if value < parent.value:
-                parent.left = BSTNode(value)
+                parent.left = node
             else:
-                parent.right = BSTNode(value)
+                parent.right = node
+        self._note_added(node)
 
     def remove(self, value: object) -> bool:
         """
@@ -137,20 +151,49 @@ class BST:
         result = self.find_node_and_parent(value)
         # If there is no matching value to remove we return False
         if result:
-            n, pn = result[0], result[1]
-            children = self.count_children(n)
-            # Use appropriate method for number of children and return True
-            if children == 0:
-                self._remove_no_subtrees(pn, n)
-            elif children == 1:
-                self._remove_one_subtree(pn, n)
-            else:
-                self._remove_two_subtrees(pn, n)
-            n.left = n.right = None      # free n
+            self._remove_node(result[0], result[1])
             return True
         else:
             return False
 
+    def _remove_node(self, n: BSTNode, pn: BSTNode) -> None:
+        """
+        Removes node n from the tree, given its parent pn (None if n is the root).
+        """
+        self._note_removed(n, pn)
+        children = self.count_children(n)
+        # Use appropriate method for number of children
+        if children == 0:
+            self._remove_no_subtrees(pn, n)
+        elif children == 1:
+            self._remove_one_subtree(pn, n)
+        else:
+            self._remove_two_subtrees(pn, n)
+        n.left = n.right = None      # free n
+
+    def _note_added(self, node: BSTNode) -> None:
+        """
+        Updates the min and max nodes after node has been linked into the tree. A copy of the current
+        max goes to its right, so it becomes the new max, while a copy of the min does not replace it.
+        """
+        self._version += 1
+        if self._min_node is None or node.value < self._min_node.value:
+            self._min_node = node
+        if self._max_node is None or not node.value < self._max_node.value:
+            self._max_node = node
+
+    def _note_removed(self, node: BSTNode, parent: BSTNode) -> None:
+        """
+        Updates the min and max nodes before node is unlinked from parent. The min has no left subtree,
+        so the next smallest node is the leftmost node of its right subtree or else its parent, and the
+        max is handled the same way on the other side.
+        """
+        self._version += 1
+        if node is self._min_node:
+            self._min_node = self._leftmost(node.right) or parent
+        if node is self._max_node:
+            self._max_node = self._rightmost(node.left) or parent
+
     def find_node_and_parent(self, value: object) -> [BSTNode]:
         """
         Returns the first node with the same value as the value parameter, and its parent.
@@ -288,46 +331,387 @@ class BST:
         contains the values of the visited nodes, in the order they were visited. If the tree is empty,
         the method returns an empty Queue.
 
+        Kept for compatibility, iter_inorder() streams the same values without building the Queue.
+        """
+        result = Queue()
+        for value in self.iter_inorder():
+            result.enqueue(value)
+        return result
+
+    def iter_inorder(self, reverse: bool = False):
+        """
+        This method is a generator that yields the values of the tree in ascending order, or descending
+        order if reverse is True. Only the current root-to-node path is held on the stack, so it uses
+        O(h) memory and stops walking as soon as the caller stops asking for values.
+        The tree must not be changed while a traversal is in progress.
+        """
+        for n in self._iter_nodes(reverse):
+            yield n.value
+
+    def _iter_nodes(self, reverse: bool = False):
+        """
+        Generator that yields the nodes of the tree in order (or reverse order) using an explicit stack.
+
         Note: I wanted to try an iterative method to have some fun with the stack class. A recursive versio would be
         logically equivalent as you would simply replace the stack below with a stack of function calls.
         """
-        result = Queue()
         stack = Stack()
         n = self._root
         while True:
-            # Push the current node and go left
+            # Push the current node and go left (right when reversed)
             if n is not None:
                 stack.push(n)
-                n = n.left
-            # Once we cannot go left or right, process the top of stack, and go right
+                n = n.right if reverse else n.left
+            # Once we cannot go any further, process the top of stack, and go the other way
             elif not stack.is_empty():
                 n = stack.pop()
-                result.enqueue(n.value)
+                yield n
+                n = n.left if reverse else n.right
+            else:
+                return
+
+    def __iter__(self):
+        """
+        Iterates over the values of the tree in ascending order.
+        """
+        return self.iter_inorder()
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Returns True if the value is in the tree. Without it, the in operator would fall back to
+        __iter__() and scan every value.
+        """
+        return self.contains(value)
+
+    def contains_many(self, keys):
+        """
+        This method checks a batch of keys at once and returns, for each key, whether it is in the tree.
+        The keys are searched in a sorted copy of the tree's values, which is cached until the tree
+        changes. If NumPy is installed and the values and keys are all integers (or all floats), the
+        search is one np.searchsorted() call and the result is a NumPy bool array. Otherwise each key
+        is a bisect of the cached copy and the result is a list.
+        """
+        values, array = self._sorted_values()
+        probe = self._numeric_probe(keys, array)
+        if probe is not None:
+            i = np.searchsorted(array, probe)
+            found = np.zeros(len(probe), dtype=bool)
+            inside = i < len(array)
+            found[inside] = array[i[inside]] == probe[inside]
+            return found
+        result = []
+        for key in keys:
+            i = bisect_left(values, key)
+            result.append(i < len(values) and values[i] == key)
+        return result
+
+    def rank_many(self, keys):
+        """
+        This method returns, for each key in a batch, the number of values in the tree smaller than it.
+        It uses the same cached copy and fast path as contains_many(), returning a NumPy int array when
+        the fast path applies and a list otherwise.
+        """
+        values, array = self._sorted_values()
+        probe = self._numeric_probe(keys, array)
+        if probe is not None:
+            return np.searchsorted(array, probe)
+        return [bisect_left(values, key) for key in keys]
+
+    def _sorted_values(self) -> (tuple, object):
+        """
+        Returns the values of the tree as a sorted tuple, and as a NumPy array if they are all numbers
+        and NumPy is installed (None otherwise). Both are rebuilt in O(n) only when _version shows the
+        tree has changed since they were made.
+        """
+        if self._sorted_cache is None or self._sorted_cache[0] != self._version:
+            values = tuple(self._cached_values())
+            array = None
+            if np is not None and all(isinstance(value, (int, float)) for value in values):
+                array = np.array(values)
+                # Integers too large for int64 come out as an object array, which is no faster
+                if array.dtype.kind not in 'iuf':
+                    array = None
+            self._sorted_cache = (self._version, values, array)
+        return self._sorted_cache[1], self._sorted_cache[2]
+
+    def _cached_values(self):
+        """
+        Yields the values that contains_many() and rank_many() search, in order. Subclasses whose
+        traversals do not yield the compared values override this.
+        """
+        return self.iter_inorder()
+
+    def _numeric_probe(self, keys, array):
+        """
+        Returns keys as a NumPy array if they can be searched in array with np.searchsorted(), or None.
+        Integers are only compared with integers and floats with floats, so large integers are never
+        rounded to floats.
+        """
+        if array is None:
+            return None
+        probe = np.asarray(keys)
+        if probe.ndim != 1 or probe.dtype.kind not in 'iuf' or \
+                (probe.dtype.kind == 'f') != (array.dtype.kind == 'f'):
+            return None
+        return probe
+
+    def freeze(self) -> 'FrozenTree':
+        """
+        This method returns a read-only snapshot of the values in the tree, built in O(n). Lookups on
+        the snapshot are binary searches over one sorted tuple. Later changes to the tree do not show
+        in the snapshot, so call freeze() again after a batch of changes.
+        """
+        from frozen import FrozenTree
+        return FrozenTree(self.iter_inorder())
+
+    def dump(self, path: str) -> None:
+        """
+        This method writes the values of the tree, in ascending order, to a file at path in the compact
+        binary format of tree_io. load() reads the file back.
+        """
+        from tree_io import dump_values
+        dump_values(path, self._dumped_values())
+
+    @classmethod
+    def load(cls, path: str) -> 'BST':
+        """
+        This method builds a balanced tree in O(n) from a file written by dump(). The file is
+        memory-mapped, and numeric values are read as one array rather than unpickled node by node.
+        """
+        from tree_io import load_values
+        values, _ = load_values(path)
+        return cls.from_sorted(values)
+
+    def _dumped_values(self) -> list:
+        """
+        Returns the values that dump() writes, in the form from_sorted() takes them back.
+        """
+        return list(self)
+
+    def __reversed__(self):
+        """
+        Iterates over the values of the tree in descending order.
+        """
+        return self.iter_inorder(reverse=True)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree. The plain tree does not track its size, so this
+        counts the nodes in O(n).
+        """
+        count = 0
+        for _ in self._iter_nodes():
+            count += 1
+        return count
+
+    def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method is a generator that yields, in ascending order, every value between lo and hi.
+        A bound of None leaves that side open and inclusive says whether each bound is included.
+        Subtrees that fall outside the range are never entered, so a scan costs O(h + k) for k results.
+        """
+        for n in self._iter_range_nodes(lo, hi, inclusive):
+            yield n.value
+
+    def _iter_range_nodes(self, lo: object, hi: object, inclusive: (bool, bool)):
+        """
+        Generator that yields, in order, the nodes whose value is in the range described in iter_range().
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        stack = Stack()
+        n = self._root
+        while True:
+            if n is not None:
+                # n and its whole left subtree are below the range, so only its right subtree can match
+                if lo is not None and (n.value < lo or (n.value == lo and not lo_inclusive)):
+                    n = n.right
+                else:
+                    stack.push(n)
+                    # The left subtree only holds values smaller than n, skip it if they are all below lo
+                    if lo is None or lo < n.value:
+                        n = n.left
+                    else:
+                        n = None
+            elif not stack.is_empty():
+                n = stack.pop()
+                # Values come out in order, so the first one above the range ends the scan
+                if hi is not None and (hi < n.value or (n.value == hi and not hi_inclusive)):
+                    return
+                yield n
                 n = n.right
             else:
-                return result
+                return
+
+    def count_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)) -> int:
+        """
+        This method returns the number of values between lo and hi, using the same bounds as iter_range().
+        """
+        count = 0
+        for _ in self._iter_range_nodes(lo, hi, inclusive):
+            count += 1
+        return count
+
+    def floor(self, x: object) -> object:
+        """
+        This method returns the largest value that is less than or equal to x, or None if there is none.
+        """
+        n = self._floor_node(x, True)
+        return n.value if n else None
+
+    def ceiling(self, x: object) -> object:
+        """
+        This method returns the smallest value that is greater than or equal to x, or None if there is none.
+        """
+        n = self._ceiling_node(x, True)
+        return n.value if n else None
+
+    def lower(self, x: object) -> object:
+        """
+        This method returns the largest value that is strictly less than x, or None if there is none.
+        """
+        n = self._floor_node(x, False)
+        return n.value if n else None
+
+    def higher(self, x: object) -> object:
+        """
+        This method returns the smallest value that is strictly greater than x, or None if there is none.
+        """
+        n = self._ceiling_node(x, False)
+        return n.value if n else None
+
+    def nearest(self, x: object) -> object:
+        """
+        This method returns the value closest to x, or None if the tree is empty. Values must support
+        subtraction. When two values are equally close, the lower one is returned.
+        """
+        n = self._nearest_node(x)
+        return n.value if n else None
+
+    def _floor_node(self, x: object, inclusive: bool) -> BSTNode:
+        """
+        Returns the node with the largest value below x (or equal to it, if inclusive) in one descent,
+        or None if there is no such node.
+        """
+        best = None
+        n = self._root
+        while n is not None:
+            if n.value < x:
+                # n is a candidate, anything larger that still fits is in its right subtree
+                best = n
+                n = n.right
+            elif inclusive and n.value == x:
+                return n
+            else:
+                n = n.left
+        return best
+
+    def _ceiling_node(self, x: object, inclusive: bool) -> BSTNode:
+        """
+        Returns the node with the smallest value above x (or equal to it, if inclusive) in one descent,
+        or None if there is no such node.
+        """
+        best = None
+        n = self._root
+        while n is not None:
+            if x < n.value:
+                # n is a candidate, anything smaller that still fits is in its left subtree
+                best = n
+                n = n.left
+            elif inclusive and n.value == x:
+                return n
+            else:
+                # Copies of x are in the right subtree, like everything greater than x
+                n = n.right
+        return best
+
+    def _nearest_node(self, x: object) -> BSTNode:
+        """
+        Returns the node closest to x, tracking the floor and the ceiling of x in the same descent.
+        """
+        below = above = None
+        n = self._root
+        while n is not None:
+            if n.value == x:
+                return n
+            if n.value < x:
+                below = n
+                n = n.right
+            else:
+                above = n
+                n = n.left
+        if below is None or above is None:
+            return below or above
+        if x - below.value <= above.value - x:
+            return below
+        return above
 
     def find_min(self) -> object:
         """
         This method returns the lowest value in the tree. If the tree is empty, the method should return None.
+        The lowest node is tracked as the tree changes, so this is O(1).
         """
-        min = self._root
-        while min and min.left:
-            min = min.left
-        if min is None:
+        if self._min_node is None:
             return None
-        return min.value
+        return self._min_node.value
 
     def find_max(self) -> object:
         """
         This method returns the highest value in the tree. If the tree is empty, the method should return None.
+        The highest node is tracked as the tree changes, so this is O(1).
+        """
+        if self._max_node is None:
+            return None
+        return self._max_node.value
+
+    def pop_min(self) -> object:
+        """
+        This method removes the lowest value from the tree and returns it. If the tree is empty, the method
+        returns None.
         """
-        max = self._root
-        while max and max.right:
-            max = max.right
-        if max is None:
+        node = self._min_node
+        if node is None:
             return None
-        return max.value
+        self._remove_node(node, self._spine_parent(node, False))
+        return node.value
+
+    def pop_max(self) -> object:
+        """
+        This method removes the highest value from the tree and returns it. If the tree is empty, the method
+        returns None.
+        """
+        node = self._max_node
+        if node is None:
+            return None
+        self._remove_node(node, self._spine_parent(node, True))
+        return node.value
+
+    def _spine_parent(self, node: BSTNode, rightmost: bool) -> BSTNode:
+        """
+        Returns the parent of the min (or max, if rightmost) node by walking down the left (or right)
+        spine, or None if the node is the root.
+        """
+        parent = None
+        n = self._root
+        while n is not node:
+            parent = n
+            n = n.right if rightmost else n.left
+        return parent
+
+    def _leftmost(self, node: BSTNode) -> BSTNode:
+        """
+        Returns the leftmost node of the subtree rooted at node, or None for an empty subtree.
+        """
+        while node and node.left:
+            node = node.left
+        return node
+
+    def _rightmost(self, node: BSTNode) -> BSTNode:
+        """
+        Returns the rightmost node of the subtree rooted at node, or None for an empty subtree.
+        """
+        while node and node.right:
+            node = node.right
+        return node
 
     def is_empty(self) -> bool:
         """
@@ -339,7 +723,101 @@ class BST:
         """
         This method removes all the nodes from the tree.
         """
-        self._root = None
+        self._set_root(None)
+
+    def _set_root(self, root: BSTNode) -> None:
+        """
+        Makes root the root of the tree and finds its min and max nodes. Used when a whole tree is
+        replaced at once rather than changed by add() or remove().
+        """
+        self._version += 1
+        self._root = root
+        self._min_node = self._leftmost(root)
+        self._max_node = self._rightmost(root)
+
+    @classmethod
+    def from_sorted(cls, iterable) -> 'BST':
+        """
+        This method builds a perfectly balanced tree from values that are already in ascending order
+        in O(n) time. The order is not checked, use from_iterable() if the values may be unsorted.
+        """
+        tree = cls()
+        tree._set_root(tree._build_balanced(list(iterable)))
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable) -> 'BST':
+        """
+        This method builds a perfectly balanced tree from values in any order in O(n log n) time.
+        Input that is already sorted only costs O(n) because the sort detects the existing run.
+        """
+        return cls.from_sorted(sorted(iterable))
+
+    def _build_balanced(self, values: list) -> BSTNode:
+        """
+        Builds a balanced subtree from a sorted list and returns its root, or None if the list is empty.
+        Each subtree is rooted at the first copy of its middle value so duplicates always land in the
+        right subtree, like they do in add().
+        """
+        return self._link_balanced([self._new_node(value) for value in values], self._first_copies(values))
+
+    def _first_copies(self, values: list) -> list:
+        """
+        Returns a list whose i-th entry is the index of the first copy of values[i] in a sorted list,
+        found in one pass, or None if all the values are distinct.
+        """
+        first = None
+        for i in range(1, len(values)):
+            if values[i] == values[i - 1]:
+                if first is None:
+                    first = list(range(len(values)))
+                first[i] = first[i - 1]
+        return first
+
+    def _link_balanced(self, nodes: list, first: list = None) -> BSTNode:
+        """
+        Links a list of nodes, sorted by value, into a balanced subtree and returns its root. first[i]
+        is the index of the first node with the same value as nodes[i] and can be left out when all
+        the values are distinct.
+        """
+        if not nodes:
+            return None
+        # Link top-down with a stack of index ranges instead of recursion, a run of duplicates
+        # can make a long chain that would exceed the recursion limit
+        root = None
+        stack = [(0, len(nodes) - 1, None, False)]
+        while stack:
+            lo, hi, parent, is_left = stack.pop()
+            mid = (lo + hi) // 2
+            if first is not None:
+                mid = max(first[mid], lo)
+            node = nodes[mid]
+            node.left = node.right = None
+            self._link_built_node(node, parent, hi - lo + 1)
+            if parent is None:
+                root = node
+            elif is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            if mid < hi:
+                stack.append((mid + 1, hi, node, False))
+            if lo < mid:
+                stack.append((lo, mid - 1, node, True))
+        return root
+
+    def _new_node(self, value: object) -> BSTNode:
+        """
+        Creates the node that stores a new value. Subclasses override this to use their own node class.
+        """
+        return BSTNode(value)
+
+    def _link_built_node(self, node: BSTNode, parent: BSTNode, size: int) -> None:
+        """
+        Called by _link_balanced() for each node it places. The parent and the size of the range the
+        node is built from are passed in so subclasses can fill in extra node attributes directly.
+        """
+        pass
 
 
 # ------------------- BASIC TESTING -----------------------------------------
@@ -510,3 +988,104 @@ if __name__ == '__main__':
     print("Tree before make_empty():", tree)
     tree.make_empty()
     print("Tree after make_empty(): ", tree)
+
+    print("\nmethod from_sorted() / from_iterable() example 1")
+    print("-------------------------------------------------")
+    test_cases = (
+        (1, 2, 3, 4, 5, 6, 7),
+        (1, 1, 1, 1),
+        (1, 2, 2, 2, 3, 3),
+        (),
+    )
+    for case in test_cases:
+        tree = BST.from_sorted(case)
+        print('INPUT  :', case)
+        print('RESULT :', tree)
+        if not tree.is_valid_bst():
+            raise Exception("PROBLEM WITH FROM_SORTED OPERATION")
+
+    print("\nmethod from_sorted() / from_iterable() example 2")
+    print("-------------------------------------------------")
+    for _ in range(100):
+        case = [random.randrange(1, 200) for _ in range(900)]
+        tree = BST.from_iterable(case)
+        if not tree.is_valid_bst() or tree.inorder_traversal().size() != len(case):
+            raise Exception("PROBLEM WITH FROM_ITERABLE OPERATION")
+    print('from_iterable() stress test finished')
+
+    print("\nmethod iter_inorder() example 1")
+    print("-------------------------------")
+    tree = BST([10, 20, 5, 15, 17, 7, 12])
+    print(list(tree))
+    print(list(reversed(tree)))
+    print([value for value in tree.iter_inorder() if value < 12])
+
+    print("\nmethod iter_range() example 1")
+    print("-----------------------------")
+    tree = BST([10, 20, 5, 15, 17, 7, 12, 15])
+    print(list(tree.iter_range(7, 15)))
+    print(list(tree.iter_range(7, 15, inclusive=(False, False))))
+    print(list(tree.iter_range(hi=12)))
+    print(tree.count_range(15, None))
+
+    print("\nmethod iter_range() example 2")
+    print("-----------------------------")
+    for _ in range(100):
+        case = [random.randrange(1, 200) for _ in range(300)]
+        tree = BST(case)
+        lo, hi = sorted(random.randrange(0, 201) for _ in range(2))
+        for inclusive in ((True, True), (True, False), (False, True), (False, False)):
+            expected = [value for value in sorted(case)
+                        if (lo < value or (inclusive[0] and lo == value))
+                        and (value < hi or (inclusive[1] and value == hi))]
+            if list(tree.iter_range(lo, hi, inclusive)) != expected:
+                raise Exception("PROBLEM WITH ITER_RANGE OPERATION")
+    print('iter_range() stress test finished')
+
+    print("\nmethod floor() / ceiling() / lower() / higher() / nearest() example 1")
+    print("----------------------------------------------------------------------")
+    tree = BST([10, 20, 5, 15, 17, 7, 12, 15])
+    for x in (4, 5, 13, 15, 16, 21):
+        print(x, ':', tree.floor(x), tree.ceiling(x), tree.lower(x), tree.higher(x), tree.nearest(x))
+
+    print("\nmethod floor() / ceiling() / lower() / higher() / nearest() example 2")
+    print("----------------------------------------------------------------------")
+    for _ in range(100):
+        case = [random.randrange(1, 200) for _ in range(100)]
+        tree = BST(case)
+        for x in range(0, 202):
+            below = [value for value in case if value <= x]
+            above = [value for value in case if value >= x]
+            if tree.floor(x) != (max(below) if below else None) or \
+                    tree.ceiling(x) != (min(above) if above else None) or \
+                    tree.lower(x) != max([value for value in below if value < x], default=None) or \
+                    tree.higher(x) != min([value for value in above if value > x], default=None) or \
+                    tree.nearest(x) != min(case, key=lambda value: (abs(value - x), value)):
+                raise Exception("PROBLEM WITH NEAREST-VALUE QUERY")
+    print('nearest-value query stress test finished')
+
+    print("\nmethod pop_min() / pop_max() example 1")
+    print("--------------------------------------")
+    tree = BST([10, 20, 5, 15, 17, 7, 12, 20])
+    print(tree.pop_min(), tree.pop_max(), tree.pop_max(), tree)
+    print("Minimum value is:", tree.find_min(), "Maximum value is:", tree.find_max())
+
+    print("\nmethod pop_min() / pop_max() example 2")
+    print("--------------------------------------")
+    for _ in range(100):
+        case = [random.randrange(1, 200) for _ in range(100)]
+        tree, reference = BST(case), sorted(case)
+        while reference:
+            if random.random() < 0.2:
+                value = random.randrange(1, 200)
+                tree.add(value)
+                reference = sorted(reference + [value])
+            elif random.random() < 0.5:
+                if tree.pop_min() != reference.pop(0):
+                    raise Exception("PROBLEM WITH POP_MIN OPERATION")
+            elif tree.pop_max() != reference.pop():
+                raise Exception("PROBLEM WITH POP_MAX OPERATION")
+            if not tree.is_valid_bst() or tree.find_min() != (reference[0] if reference else None) or \
+                    tree.find_max() != (reference[-1] if reference else None):
+                raise Exception("PROBLEM WITH MIN / MAX TRACKING")
+    print('pop_min() / pop_max() stress test finished')
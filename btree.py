@@ -0,0 +1,440 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Implementation of a B-tree with the same methods as BST. Each node holds a sorted list of up
+#              to capacity values that is searched with bisect, so a lookup visits log_capacity(n) nodes
+#              instead of the 1.44 log2(n) nodes of an AVL tree
+
+
+import random
+from bisect import bisect_left
+from queue_and_stack import Queue, Stack
+from frozen import FrozenTree
+
+
+class BTreeNode:
+    """
+    B-Tree Node class
+    """
+    def __init__(self, keys: list, children: list) -> None:
+        """
+        Initialize a new B-tree node from its sorted values and its children (an empty list for a leaf)
+        """
+        self.keys = keys            # sorted values stored in the node
+        self.children = children    # len(keys) + 1 subtrees, or [] for a leaf
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'BTree Node: {}'.format(self.keys)
+
+
+class BTree:
+    """
+    B-Tree class with the same public methods as BST
+
+    Every node but the root holds between capacity // 2 and capacity values and all leaves are at the same
+    depth. A node with k values has k + 1 children, and the i-th child holds the values between the
+    (i - 1)-th and i-th values of the node. Like AVL, duplicate values are not stored.
+    """
+
+    def __init__(self, start_tree=None, capacity: int = 64) -> None:
+        """
+        Initialize a new B-tree whose nodes hold at most capacity values
+        """
+        if capacity < 3:
+            raise ValueError('capacity must be at least 3')
+        self._capacity = capacity
+        self.make_empty()
+
+        # populate the tree with initial values (if provided)
+        if start_tree is not None:
+            for value in start_tree:
+                self.add(value)
+
+    def __str__(self) -> str:
+        """
+        Override string method; display the nodes in pre-order
+        """
+        nodes = []
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node:
+                nodes.append(str(node.keys))
+                for child in reversed(node.children):
+                    stack.push(child)
+        return "BTree pre-order { " + ", ".join(nodes) + " }"
+
+    def get_root(self) -> BTreeNode:
+        """
+        Return root of tree, or None if empty
+        """
+        return self._root
+
+    def is_valid_btree(self) -> bool:
+        """
+        Perform pre-order traversal of the tree. Return False if a node is out of order, holds too few or
+        too many values, has the wrong number of children, or if the leaves are not all at the same depth.
+        This is intended to be a troubleshooting 'helper' method, like AVL.is_valid_avl().
+        """
+        if self._root is None:
+            return self._size == 0
+        leaf_depth = None
+        count = 0
+        stack = Stack()
+        stack.push((self._root, 0, None, None))
+        while not stack.is_empty():
+            node, depth, lo, hi = stack.pop()
+            keys = node.keys
+            count += len(keys)
+            if not keys or len(keys) > self._capacity:
+                return False
+            if node is not self._root and len(keys) < self._capacity // 2:
+                return False
+            for i in range(len(keys)):
+                # Values increase within the node and stay between the parent's values around it
+                if (i > 0 and not keys[i - 1] < keys[i]) or (lo is not None and not lo < keys[i]) or \
+                        (hi is not None and not keys[i] < hi):
+                    return False
+            if not node.children:
+                if leaf_depth is None:
+                    leaf_depth = depth
+                elif depth != leaf_depth:
+                    return False
+            elif len(node.children) != len(keys) + 1:
+                return False
+            else:
+                bounds = [lo] + keys + [hi]
+                for i, child in enumerate(node.children):
+                    stack.push((child, depth + 1, bounds[i], bounds[i + 1]))
+        return count == self._size
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to the tree. Duplicate values are not allowed. If the value is
+        already in the tree, the method does not change the tree. A leaf that overflows is split in
+        two and its middle value moves up into the parent, which may split in turn.
+        """
+        if self._root is None:
+            self._root = BTreeNode([value], [])
+            self._size = 1
+            return
+        # Record the path down to the leaf, with the child index taken at each node
+        path = []
+        node = self._root
+        while True:
+            i = bisect_left(node.keys, value)
+            # If we find the same value in the tree, return None (no duplicates)
+            if i < len(node.keys) and node.keys[i] == value:
+                return None
+            if not node.children:
+                break
+            path.append((node, i))
+            node = node.children[i]
+        node.keys.insert(i, value)
+        self._size += 1
+        while len(node.keys) > self._capacity:
+            mid = len(node.keys) // 2
+            right = BTreeNode(node.keys[mid + 1:], node.children[mid + 1:])
+            middle = node.keys[mid]
+            del node.keys[mid:]
+            del node.children[mid + 1:]
+            if not path:
+                # Splitting the root adds a level at the top
+                self._root = BTreeNode([middle], [node, right])
+                return
+            node, i = path.pop()
+            node.keys.insert(i, middle)
+            node.children.insert(i + 1, right)
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from the tree. The method returns True if the value is removed.
+        Otherwise, it returns False. A value in an inner node is replaced by its predecessor from a leaf.
+        A node left with too few values borrows one through the parent from a sibling that can spare it,
+        or else is merged with a sibling, which takes a value from the parent and may repeat one level up.
+        """
+        path = []
+        node = self._root
+        while node is not None:
+            i = bisect_left(node.keys, value)
+            if i < len(node.keys) and node.keys[i] == value:
+                break
+            if not node.children:
+                return False
+            path.append((node, i))
+            node = node.children[i]
+        if node is None:
+            return False
+        if node.children:
+            # Swap in the largest value of the left subtree, which is always in a leaf
+            path.append((node, i))
+            leaf = node.children[i]
+            while leaf.children:
+                path.append((leaf, len(leaf.children) - 1))
+                leaf = leaf.children[-1]
+            node.keys[i] = leaf.keys.pop()
+            node = leaf
+        else:
+            node.keys.pop(i)
+        self._size -= 1
+        min_keys = self._capacity // 2
+        while len(node.keys) < min_keys and path:
+            parent, i = path.pop()
+            left = parent.children[i - 1] if i > 0 else None
+            right = parent.children[i + 1] if i + 1 < len(parent.children) else None
+            if left is not None and len(left.keys) > min_keys:
+                # Rotate a value from the left sibling through the parent
+                node.keys.insert(0, parent.keys[i - 1])
+                parent.keys[i - 1] = left.keys.pop()
+                if left.children:
+                    node.children.insert(0, left.children.pop())
+                break
+            if right is not None and len(right.keys) > min_keys:
+                node.keys.append(parent.keys[i])
+                parent.keys[i] = right.keys.pop(0)
+                if right.children:
+                    node.children.append(right.children.pop(0))
+                break
+            # Neither sibling can spare a value, so merge with one of them around the parent's value
+            if left is not None:
+                self._merge_children(parent, i - 1)
+            else:
+                self._merge_children(parent, i)
+            node = parent
+        if not self._root.keys:
+            # A root emptied by a merge hands over to its only child, which removes a level
+            self._root = self._root.children[0] if self._root.children else None
+        return True
+
+    def _merge_children(self, parent: BTreeNode, i: int) -> None:
+        """
+        Merges child i + 1 of parent into child i, together with the parent's value between them.
+        """
+        left, right = parent.children[i], parent.children.pop(i + 1)
+        left.keys.append(parent.keys.pop(i))
+        left.keys.extend(right.keys)
+        left.children.extend(right.children)
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the tree. Otherwise, it returns False. If the tree is
+        empty, the method returns False.
+        """
+        node = self._root
+        while node is not None:
+            keys = node.keys
+            i = bisect_left(keys, value)
+            if i < len(keys) and keys[i] == value:
+                return True
+            if not node.children:
+                return False
+            node = node.children[i]
+        return False
+
+    def inorder_traversal(self) -> Queue:
+        """
+        This method will perform an inorder traversal of the tree and return a Queue object that
+        contains the values of the tree in ascending order. If the tree is empty, the method returns an
+        empty Queue.
+        """
+        result = Queue()
+        for value in self.iter_inorder():
+            result.enqueue(value)
+        return result
+
+    def iter_inorder(self, reverse: bool = False):
+        """
+        This method is a generator that yields the values of the tree in ascending order, or descending
+        order if reverse is True. The tree must not be changed while a traversal is in progress.
+        """
+        if self._root is None:
+            return
+        # Each stack entry is a node and its next step. An inner node with k values takes 2k + 1 steps,
+        # even steps descend into a child and odd steps yield a value
+        stack = Stack()
+        stack.push((self._root, 0))
+        while not stack.is_empty():
+            node, step = stack.pop()
+            keys = node.keys
+            if not node.children:
+                yield from (reversed(keys) if reverse else keys)
+                continue
+            if step < 2 * len(keys):
+                stack.push((node, step + 1))
+            i = step // 2
+            if step % 2 == 0:
+                stack.push((node.children[-1 - i] if reverse else node.children[i], 0))
+            else:
+                yield keys[-1 - i] if reverse else keys[i]
+
+    def __iter__(self):
+        """
+        Iterates over the values of the tree in ascending order.
+        """
+        return self.iter_inorder()
+
+    def freeze(self) -> FrozenTree:
+        """
+        This method returns a read-only snapshot of the values in the tree, like BST.freeze().
+        """
+        return FrozenTree(self.iter_inorder())
+
+    def __reversed__(self):
+        """
+        Iterates over the values of the tree in descending order.
+        """
+        return self.iter_inorder(reverse=True)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree.
+        """
+        return self._size
+
+    def find_min(self) -> object:
+        """
+        This method returns the lowest value in the tree. If the tree is empty, the method should return None.
+        """
+        node = self._root
+        if node is None:
+            return None
+        while node.children:
+            node = node.children[0]
+        return node.keys[0]
+
+    def find_max(self) -> object:
+        """
+        This method returns the highest value in the tree. If the tree is empty, the method should return None.
+        """
+        node = self._root
+        if node is None:
+            return None
+        while node.children:
+            node = node.children[-1]
+        return node.keys[-1]
+
+    def is_empty(self) -> bool:
+        """
+        This method returns True if the tree is empty. Otherwise, it returns False.
+        """
+        return self._root is None
+
+    def make_empty(self) -> None:
+        """
+        This method removes all the nodes from the tree.
+        """
+        self._root = None
+        self._size = 0
+
+    @classmethod
+    def from_sorted(cls, iterable, capacity: int = 64) -> 'BTree':
+        """
+        This method builds a tree with full nodes from values that are already in ascending order in
+        O(n) time. Duplicates are dropped. The order is not checked, use from_iterable() if the values
+        may be unsorted.
+        """
+        tree = cls(capacity=capacity)
+        keys = []
+        for value in iterable:
+            if not keys or keys[-1] != value:
+                keys.append(value)
+        tree._size = len(keys)
+        children = []
+        # Build one level at a time from the leaves up. The values between the nodes of a level are
+        # the values of the level above
+        while keys:
+            nodes, keys = tree._build_level(keys, children)
+            if len(nodes) == 1 and not keys:
+                tree._root = nodes[0]
+                break
+            children = nodes
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable, capacity: int = 64) -> 'BTree':
+        """
+        This method builds a tree with full nodes from values in any order in O(n log n) time.
+        """
+        return cls.from_sorted(sorted(iterable), capacity)
+
+    def _build_level(self, keys: list, children: list) -> (list, list):
+        """
+        Packs the sorted values of one level into as few nodes as possible, with one value left between
+        each pair of nodes, and gives each node its share of children (none on the leaf level).
+        Returns the nodes and the values left between them. Using the fewest nodes that fit spreads the
+        values evenly enough that every node gets at least capacity // 2 of them.
+        """
+        count = -(-(len(keys) + 1) // (self._capacity + 1))
+        share, extra = divmod(len(keys) - (count - 1), count)
+        nodes, between = [], []
+        start = 0
+        for j in range(count):
+            size = share + 1 if j < extra else share
+            nodes.append(BTreeNode(keys[start:start + size], children[start:start + size + 1]))
+            start += size
+            if j < count - 1:
+                between.append(keys[start])
+                start += 1
+        return nodes, between
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() example 1")
+    print("----------------------")
+    tree = BTree(capacity=3)
+    for value in (10, 20, 5, 15, 17, 7, 12, 1, 30, 25):
+        tree.add(value)
+    print(tree)
+    print(tree.inorder_traversal(), len(tree), tree.is_valid_btree())
+
+    print("\nmethod remove() example 1")
+    print("-------------------------")
+    for value in (15, 10, 99, 1, 5):
+        print('DEL:', value, tree.remove(value), tree, tree.is_valid_btree())
+
+    print("\nmethod add() / remove() example 2")
+    print("---------------------------------")
+    for capacity in (3, 4, 5, 16, 64):
+        for _ in range(30):
+            case = [random.randrange(1, 5000) for _ in range(900)]
+            tree, reference = BTree(case, capacity), set(case)
+            for value in case[::2]:
+                if tree.remove(value) != (value in reference):
+                    raise Exception("PROBLEM WITH REMOVE OPERATION")
+                reference.discard(value)
+            for value in random.sample(range(1, 5000), 300):
+                if tree.contains(value) != (value in reference):
+                    raise Exception("PROBLEM WITH CONTAINS OPERATION")
+            if not tree.is_valid_btree() or list(tree) != sorted(reference) or \
+                    list(reversed(tree)) != sorted(reference, reverse=True) or \
+                    (tree.find_min(), tree.find_max()) != (min(reference), max(reference)):
+                raise Exception("PROBLEM WITH ADD OR REMOVE OPERATION")
+            for value in list(reference):
+                tree.remove(value)
+            if not tree.is_empty() or len(tree) != 0:
+                raise Exception("PROBLEM WITH REMOVE OPERATION")
+    print('add() / remove() stress test finished')
+
+    print("\nmethod from_sorted() example 1")
+    print("------------------------------")
+    for capacity in (3, 4, 7, 8):
+        for size in range(0, 300):
+            tree = BTree.from_sorted(range(size), capacity)
+            if not tree.is_valid_btree() or list(tree) != list(range(size)):
+                raise Exception("PROBLEM WITH FROM_SORTED OPERATION")
+            tree.add(size)
+            tree.remove(0)
+            if not tree.is_valid_btree():
+                raise Exception("PROBLEM WITH FROM_SORTED OPERATION")
+    print(BTree.from_sorted(range(20), capacity=4))
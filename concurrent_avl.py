@@ -0,0 +1,461 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Thread-safe wrapper around the AVL tree. Reads share a readers-writer lock, and writes from
+#              many threads are queued and applied in batches so the write lock is taken once per batch
+
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from avl import AVL
+
+
+class ReadWriteLock:
+    """
+    Readers-writer lock. Any number of readers can hold it at once, or one writer alone.
+
+    A waiting writer blocks new readers, so a steady stream of reads cannot starve writes. The lock
+    also records how many times each side was acquired and how long callers waited for it.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an unlocked readers-writer lock
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0               # readers holding the lock
+        self._writer = False            # True while a writer holds the lock
+        self._writers_waiting = 0
+        self.reset_stats()
+
+    def acquire_read(self) -> None:
+        """
+        This method blocks until no writer holds or is waiting for the lock, then takes a read share.
+        """
+        start = time.perf_counter()
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+            self._count_wait('read', time.perf_counter() - start)
+
+    def release_read(self) -> None:
+        """
+        This method gives back a read share and wakes a waiting writer if it was the last one.
+        """
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        This method blocks until no reader or writer holds the lock, then takes it alone.
+        """
+        start = time.perf_counter()
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+            self._count_wait('write', time.perf_counter() - start)
+
+    def release_write(self) -> None:
+        """
+        This method releases the lock held by a writer and wakes every waiting thread.
+        """
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """
+        Holds a read share for the body of a with statement.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """
+        Holds the lock alone for the body of a with statement.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def stats(self) -> dict:
+        """
+        This method returns the number of read and write acquisitions, and the total and longest time
+        in seconds that callers waited for each.
+        """
+        with self._condition:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        """
+        This method sets the acquisition counts and wait times back to zero.
+        """
+        self._stats = {'read_acquires': 0, 'read_wait': 0.0, 'read_max_wait': 0.0,
+                       'write_acquires': 0, 'write_wait': 0.0, 'write_max_wait': 0.0}
+
+    def _count_wait(self, side: str, waited: float) -> None:
+        """
+        Adds one acquisition and its wait to the stats of side, called with the condition held.
+        """
+        self._stats[side + '_acquires'] += 1
+        self._stats[side + '_wait'] += waited
+        self._stats[side + '_max_wait'] = max(self._stats[side + '_max_wait'], waited)
+
+
+class _Write:
+    """
+    One queued write, its result or the exception it raised, and whether a batch has applied it yet
+    """
+    __slots__ = ('adds', 'values', 'result', 'error', 'done')
+
+    def __init__(self, adds: bool, values: list) -> None:
+        """
+        Initialize a write that adds (or removes) the given values
+        """
+        self.adds = adds
+        self.values = values
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class ConcurrentAVL:
+    """
+    Concurrent AVL class, an AVL tree that can be shared by many threads
+
+    Reads (contains(), range queries, min and max) hold a read share of a ReadWriteLock and run in
+    parallel. Writes join a queue, and whichever writer gets to the queue first applies every write
+    waiting in it under one write lock (a group commit), while the others wait for it to finish. Runs
+    of adds in a batch go through AVL.add_many(). Every write still returns only after it is applied,
+    so a thread always reads its own writes. If a write raises (for example, a value that cannot be
+    compared with the others), the other writes in its batch are still applied and the exception is
+    raised only in the thread that made the failing write.
+    The tree is wrapped rather than subclassed so no AVL method can be called without the lock.
+    Iteration and iter_range() copy the values under the read lock and return an iterator over the
+    copy, because a generator could not hold the lock between steps.
+    """
+
+    def __init__(self, start_tree=None) -> None:
+        """
+        Initialize a new Concurrent AVL Tree with the values of start_tree (if provided)
+        """
+        self._tree = AVL(start_tree)
+        self._lock = ReadWriteLock()
+        self._queue = []                        # writes waiting for the next batch
+        self._queue_lock = threading.Lock()
+        self._commit_lock = threading.Lock()    # held by the writer applying a batch
+        self._batches = 0
+        self._batched_writes = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        with self._lock.read_locked():
+            return "Concurrent " + str(self._tree)
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to the tree. Duplicate values are not allowed. It returns once the
+        value is in the tree.
+        """
+        self._write(True, [value])
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from the tree. The method returns True if the value is removed.
+        Otherwise, it returns False.
+        """
+        return self._write(False, [value]) == 1
+
+    def add_many(self, values) -> None:
+        """
+        This method adds every value in an iterable to the tree as a single write.
+        """
+        self._write(True, list(values))
+
+    def remove_many(self, values) -> int:
+        """
+        This method removes every value in an iterable from the tree as a single write and returns how
+        many values were removed.
+        """
+        return self._write(False, list(values))
+
+    def _write(self, adds: bool, values: list) -> int:
+        """
+        Queues a write and waits until a batch has applied it. Returns the number of values removed,
+        or None for adds, and raises the exception the write raised if it failed.
+        """
+        write = _Write(adds, values)
+        with self._queue_lock:
+            self._queue.append(write)
+        # The writer that gets the commit lock applies the whole queue, which may include this write
+        with self._commit_lock:
+            if not write.done:
+                with self._queue_lock:
+                    batch, self._queue = self._queue, []
+                try:
+                    with self._lock.write_locked():
+                        self._apply(batch)
+                finally:
+                    # The batch has left the queue, so no other writer would ever apply these writes
+                    for queued in batch:
+                        queued.done = True
+        if write.error is not None:
+            raise write.error
+        return write.result
+
+    def _apply(self, batch: list) -> None:
+        """
+        Applies a batch of writes in the order they were queued, called with the write lock held.
+        Consecutive adds are merged into one add_many() call. If the merged call raises, the adds are
+        applied again write by write, so only the writes that fail themselves get the exception.
+        """
+        self._batches += 1
+        self._batched_writes += len(batch)
+        i = 0
+        while i < len(batch):
+            j = i + 1
+            if batch[i].adds:
+                while j < len(batch) and batch[j].adds:
+                    j += 1
+                try:
+                    self._tree.add_many([value for write in batch[i:j] for value in write.values])
+                except Exception:
+                    # Adds already made by the failed call are skipped as duplicates
+                    for write in batch[i:j]:
+                        self._apply_write(write)
+            else:
+                self._apply_write(batch[i])
+            i = j
+
+    def _apply_write(self, write: _Write) -> None:
+        """
+        Applies a single write, storing its result or the exception it raised on it.
+        """
+        try:
+            if write.adds:
+                self._tree.add_many(write.values)
+            else:
+                write.result = sum(self._tree.remove(value) for value in write.values)
+        except Exception as error:
+            write.error = error
+
+    # ------------------------------------------------------------------ #
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the tree. Otherwise, it returns False.
+        """
+        with self._lock.read_locked():
+            return self._tree.contains(value)
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Returns True if the value is in the tree.
+        """
+        return self.contains(value)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree.
+        """
+        with self._lock.read_locked():
+            return len(self._tree)
+
+    def __iter__(self):
+        """
+        Iterates over a copy of the values of the tree in ascending order.
+        """
+        with self._lock.read_locked():
+            return iter(list(self._tree))
+
+    def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method returns an iterator over a copy of the values between lo and hi, in ascending order.
+        The bounds work like they do in BST.iter_range().
+        """
+        with self._lock.read_locked():
+            return iter(list(self._tree.iter_range(lo, hi, inclusive)))
+
+    def count_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)) -> int:
+        """
+        This method returns the number of values between lo and hi.
+        """
+        with self._lock.read_locked():
+            return self._tree.count_range(lo, hi, inclusive)
+
+    def find_min(self) -> object:
+        """
+        This method returns the lowest value in the tree. If the tree is empty, the method should return None.
+        """
+        with self._lock.read_locked():
+            return self._tree.find_min()
+
+    def find_max(self) -> object:
+        """
+        This method returns the highest value in the tree. If the tree is empty, the method should return None.
+        """
+        with self._lock.read_locked():
+            return self._tree.find_max()
+
+    def floor(self, x: object) -> object:
+        """
+        This method returns the largest value less than or equal to x, or None if there is none.
+        """
+        with self._lock.read_locked():
+            return self._tree.floor(x)
+
+    def ceiling(self, x: object) -> object:
+        """
+        This method returns the smallest value greater than or equal to x, or None if there is none.
+        """
+        with self._lock.read_locked():
+            return self._tree.ceiling(x)
+
+    def is_empty(self) -> bool:
+        """
+        This method returns True if the tree is empty. Otherwise, it returns False.
+        """
+        with self._lock.read_locked():
+            return self._tree.is_empty()
+
+    def is_valid_avl(self) -> bool:
+        """
+        This method returns True if the wrapped tree is a valid AVL tree, checked under the read lock.
+        """
+        with self._lock.read_locked():
+            return self._tree.is_valid_avl()
+
+    def lock_stats(self) -> dict:
+        """
+        This method returns the lock stats of ReadWriteLock.stats(), plus the number of write batches
+        applied and the number of writes they held.
+        """
+        stats = self._lock.stats()
+        with self._commit_lock:
+            stats['batches'] = self._batches
+            stats['batched_writes'] = self._batched_writes
+        return stats
+
+    def reset_lock_stats(self) -> None:
+        """
+        This method sets the lock stats and batch counts back to zero.
+        """
+        with self._commit_lock:
+            self._lock.reset_stats()
+            self._batches = 0
+            self._batched_writes = 0
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() / remove() / contains() example 1")
+    print("----------------------------------------------")
+    tree = ConcurrentAVL([10, 20, 5, 15, 17, 7, 12])
+    tree.add(16)
+    print(tree.remove(10), tree.remove(99), tree.contains(16), list(tree))
+    print(tree, tree.lock_stats()['batches'])
+
+    print("\nmethod add() example 2")
+    print("----------------------")
+    # A failing write queued ahead of a valid one must not take the valid one down with it
+    tree = ConcurrentAVL([1, 2, 3])
+    bad = _Write(True, ['x'])
+    tree._queue.append(bad)
+    tree.add(5)
+    print(tree.contains(5), type(bad.error).__name__, bad.done)
+    try:
+        tree.add_many([4, 'y'])
+    except TypeError as error:
+        print('TypeError:', error)
+    if not tree.contains(5) or not tree.is_valid_avl() or not isinstance(bad.error, TypeError):
+        raise Exception("PROBLEM WITH FAILED WRITE IN A BATCH")
+
+    def worker(tree: ConcurrentAVL, index: int, threads: int, reference: set, errors: list) -> None:
+        """
+        Adds and removes values congruent to index modulo threads, so no other thread changes them,
+        and checks every result against a private reference set.
+        """
+        rng = random.Random(index)
+        for _ in range(1000):
+            value = rng.randrange(0, 300) * threads + index
+            choice = rng.random()
+            if choice < 0.4:
+                tree.add(value)
+                reference.add(value)
+            elif choice < 0.7:
+                if tree.remove(value) != (value in reference):
+                    errors.append('remove')
+                reference.discard(value)
+            elif choice < 0.95:
+                if tree.contains(value) != (value in reference):
+                    errors.append('contains')
+            else:
+                values = [rng.randrange(0, 300) * threads + index for _ in range(rng.randrange(1, 30))]
+                if rng.random() < 0.5:
+                    tree.add_many(values)
+                    reference.update(values)
+                else:
+                    if tree.remove_many(values) != len(reference.intersection(values)):
+                        errors.append('remove_many')
+                    reference.difference_update(values)
+
+    def reader(tree: ConcurrentAVL, stop: threading.Event, errors: list) -> None:
+        """
+        Runs range queries until stop is set, checking that every copy it gets is sorted.
+        """
+        while not stop.is_set():
+            lo = random.randrange(0, 4000)
+            values = list(tree.iter_range(lo, lo + 500))
+            if values != sorted(values) or len(values) != len(set(values)):
+                errors.append('iter_range')
+            tree.count_range(lo, lo + 500)
+
+    print("\nmethod add() / remove() / contains() example 3")
+    print("----------------------------------------------")
+    for run in range(3):
+        threads = 8
+        tree = ConcurrentAVL()
+        references = [set() for _ in range(threads)]
+        errors = []
+        stop = threading.Event()
+        writers = [threading.Thread(target=worker, args=(tree, i, threads, references[i], errors))
+                   for i in range(threads)]
+        readers = [threading.Thread(target=reader, args=(tree, stop, errors)) for _ in range(2)]
+        for thread in writers + readers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+        expected = sorted(set().union(*references))
+        if errors or not tree.is_valid_avl() or list(tree) != expected:
+            raise Exception("PROBLEM WITH CONCURRENT OPERATIONS", errors[:5])
+        stats = tree.lock_stats()
+        print('run {}: {} keys, {} writes in {} batches, read wait {:.3f}s, write wait {:.3f}s'.format(
+            run, len(expected), stats['batched_writes'], stats['batches'], stats['read_wait'],
+            stats['write_wait']))
+    print('concurrent AVL stress test finished')
@@ -0,0 +1,389 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Durable AVL tree. Every change is appended to a write-ahead log, the whole tree is saved to a
+#              checkpoint from time to time, and reopening the tree loads the checkpoint and replays the log
+
+
+import os
+import pickle
+import struct
+import time
+import zlib
+from avl import AVL
+
+
+# Each log record is its payload length and CRC-32, then the payload: an operation byte and the pickled value
+_RECORD = struct.Struct('<II')
+_ADD, _REMOVE = b'a', b'r'
+
+
+class DurableAVL:
+    """
+    Durable AVL class, an AVL tree kept in a directory so it survives a crash
+
+    add() and remove() apply the change in memory and append a record to the log file 'wal'. Records
+    are written and fsynced sync_every at a time (a batch), or when sync() is called, so a crash loses
+    at most the changes since the last batch. With sync_every=1 nothing acknowledged is lost.
+    checkpoint() saves the tree to the file 'checkpoint' with dump(), replacing the old one atomically,
+    and then empties the log. With checkpoint_every set it runs after that many logged changes.
+    Opening a directory loads the checkpoint with AVL.load() in O(n) and replays only the log written
+    after it. The last record of a torn write fails its CRC check and is dropped.
+    Only changes that alter the tree are logged, and replaying an add or remove leaves the same result
+    however many times it is applied, so a crash in the middle of checkpoint() is also recovered.
+    """
+
+    def __init__(self, directory: str, sync_every: int = 64, checkpoint_every: int = None) -> None:
+        """
+        Initialize a durable tree stored in directory, recovering what is already there
+        """
+        if sync_every < 1:
+            raise ValueError('sync_every must be at least 1')
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._checkpoint_path = os.path.join(directory, 'checkpoint')
+        self._log_path = os.path.join(directory, 'wal')
+        self.sync_every = sync_every
+        self.checkpoint_every = checkpoint_every
+        self._pending = bytearray()     # records not yet written to the log
+        self._pending_count = 0
+        self._logged = 0                # records logged since the last checkpoint
+        self._tree = self._recover()
+        self._log = os.open(self._log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def __enter__(self) -> 'DurableAVL':
+        """
+        Returns the tree for a with statement.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Closes the tree at the end of a with statement.
+        """
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return "Durable " + str(self._tree)
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to the tree and logs it. Duplicate values are not allowed.
+        The log record is built before the tree changes, so a value that cannot be pickled raises
+        and leaves the tree as it was.
+        """
+        self._check_open()
+        if not self._tree.contains(value):
+            record = self._record(_ADD, value)
+            self._tree.add(value)
+            self._append(record)
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from the tree and logs it. The method returns True if the value is
+        removed. Otherwise, it returns False.
+        """
+        self._check_open()
+        if not self._tree.contains(value):
+            return False
+        record = self._record(_REMOVE, value)
+        self._tree.remove(value)
+        self._append(record)
+        return True
+
+    def add_many(self, values) -> None:
+        """
+        This method adds every value in an iterable to the tree.
+        """
+        for value in values:
+            self.add(value)
+
+    def remove_many(self, values) -> int:
+        """
+        This method removes every value in an iterable from the tree and returns how many were removed.
+        """
+        removed = 0
+        for value in values:
+            if self.remove(value):
+                removed += 1
+        return removed
+
+    def sync(self) -> None:
+        """
+        This method writes the records that are still pending to the log and fsyncs it, so every change
+        made so far survives a crash.
+        """
+        if self._pending:
+            os.write(self._log, self._pending)
+            os.fsync(self._log)
+            self._pending = bytearray()
+            self._pending_count = 0
+
+    def checkpoint(self) -> None:
+        """
+        This method saves the whole tree as the new checkpoint and empties the log. The checkpoint is
+        written to a temporary file, fsynced, and renamed over the old one, so a crash leaves either
+        the old checkpoint or the new one.
+        """
+        temporary = self._checkpoint_path + '.tmp'
+        self._tree.dump(temporary)
+        self._fsync_path(temporary)
+        os.replace(temporary, self._checkpoint_path)
+        self._fsync_path(self._directory)
+        # The pending records are in the checkpoint now
+        os.ftruncate(self._log, 0)
+        os.fsync(self._log)
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._logged = 0
+
+    def close(self) -> None:
+        """
+        This method syncs the log and closes it. The tree cannot be changed afterwards.
+        """
+        if self._log is not None:
+            self.sync()
+            os.close(self._log)
+            self._log = None
+
+    def recovery_stats(self) -> dict:
+        """
+        This method returns how the tree was recovered when it was opened: the number of values loaded
+        from the checkpoint, the number of log records replayed, and the seconds each step took.
+        """
+        return dict(self._recovery)
+
+    # ------------------------------------------------------------------ #
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the tree. Otherwise, it returns False.
+        """
+        return self._tree.contains(value)
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Returns True if the value is in the tree.
+        """
+        return self._tree.contains(value)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree.
+        """
+        return len(self._tree)
+
+    def __iter__(self):
+        """
+        Iterates over the values of the tree in ascending order.
+        """
+        return iter(self._tree)
+
+    def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method yields the values between lo and hi in ascending order, like BST.iter_range().
+        """
+        return self._tree.iter_range(lo, hi, inclusive)
+
+    def find_min(self) -> object:
+        """
+        This method returns the lowest value in the tree. If the tree is empty, the method should return None.
+        """
+        return self._tree.find_min()
+
+    def find_max(self) -> object:
+        """
+        This method returns the highest value in the tree. If the tree is empty, the method should return None.
+        """
+        return self._tree.find_max()
+
+    def is_valid_avl(self) -> bool:
+        """
+        This method returns True if the tree in memory is a valid AVL tree.
+        """
+        return self._tree.is_valid_avl()
+
+    # ------------------------------------------------------------------ #
+
+    def _check_open(self) -> None:
+        """
+        Raises ValueError if the tree has been closed, before a change is made that could not be logged.
+        """
+        if self._log is None:
+            raise ValueError('the durable tree is closed')
+
+    def _record(self, operation: bytes, value: object) -> bytes:
+        """
+        Returns the log record for a change. Raises whatever pickle raises if the value cannot be pickled.
+        """
+        payload = operation + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def _append(self, record: bytes) -> None:
+        """
+        Adds a log record for a change that was just made, writing the batch once it holds sync_every
+        records and taking a checkpoint once checkpoint_every records have been logged.
+        """
+        self._pending += record
+        self._pending_count += 1
+        self._logged += 1
+        if self.checkpoint_every is not None and self._logged >= self.checkpoint_every:
+            self.checkpoint()
+        elif self._pending_count >= self.sync_every:
+            self.sync()
+
+    def _recover(self) -> AVL:
+        """
+        Loads the checkpoint (if there is one), replays the log on top of it and returns the tree. A
+        torn record at the end of the log is cut off so new records follow the last good one.
+        """
+        start = time.perf_counter()
+        tree = AVL.load(self._checkpoint_path) if os.path.exists(self._checkpoint_path) else AVL()
+        checkpoint_values = len(tree)
+        loaded = time.perf_counter()
+        records = self._read_log()
+        # A run of records with the same operation holds distinct values, so it is applied as one batch
+        # and a long tail is merged into the tree in O(n + k) rather than replayed one value at a time
+        i = 0
+        while i < len(records):
+            j = i
+            while j < len(records) and records[j][0] == records[i][0]:
+                j += 1
+            values = [value for _, value in records[i:j]]
+            if records[i][0] == _ADD:
+                tree.add_many(values)
+            else:
+                tree.remove_many(values)
+            i = j
+        self._logged = len(records)
+        self._recovery = {'checkpoint_values': checkpoint_values, 'replayed_records': len(records),
+                          'load_seconds': loaded - start, 'replay_seconds': time.perf_counter() - loaded}
+        return tree
+
+    def _read_log(self) -> list:
+        """
+        Returns the (operation, value) records of the log, up to the first one that is cut off or fails
+        its CRC check. The log file is truncated after the last good record.
+        """
+        if not os.path.exists(self._log_path):
+            return []
+        with open(self._log_path, 'rb') as file:
+            log = file.read()
+        records = []
+        offset = 0
+        while offset + _RECORD.size <= len(log):
+            length, crc = _RECORD.unpack_from(log, offset)
+            payload = log[offset + _RECORD.size:offset + _RECORD.size + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            records.append((payload[:1], pickle.loads(payload[1:])))
+            offset += _RECORD.size + length
+        if offset < len(log):
+            with open(self._log_path, 'r+b') as file:
+                file.truncate(offset)
+        return records
+
+    def _fsync_path(self, path: str) -> None:
+        """
+        Fsyncs a file or directory by path.
+        """
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import random
+    import shutil
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+
+    print("\nmethod add() / checkpoint() / recovery example 1")
+    print("------------------------------------------------")
+    with DurableAVL(directory) as tree:
+        for value in [10, 20, 5, 15, 17, 7, 12]:
+            tree.add(value)
+        tree.checkpoint()
+        tree.remove(20)
+        tree.add(30)
+    with DurableAVL(directory) as tree:
+        print(tree, list(tree), tree.recovery_stats()['replayed_records'], 'records replayed')
+
+    print("\nmethod add() / remove() / recovery example 2")
+    print("--------------------------------------------")
+    for _ in range(100):
+        shutil.rmtree(directory)
+        reference, synced = set(), set()
+        tree = DurableAVL(directory, sync_every=10 ** 6, checkpoint_every=random.choice((None, 50, 200)))
+        for _ in range(random.randrange(1, 5)):
+            for _ in range(random.randrange(0, 300)):
+                value = random.randrange(200)
+                if random.random() < 0.6:
+                    tree.add(value)
+                    reference.add(value)
+                elif tree.remove(value) != (value in reference):
+                    raise Exception("PROBLEM WITH REMOVE OPERATION")
+                else:
+                    reference.discard(value)
+                if tree._pending_count == 0:
+                    synced = set(reference)     # a checkpoint just saved everything
+            if random.random() < 0.5:
+                tree.sync()
+                synced = set(reference)
+            if random.random() < 0.2:
+                tree.checkpoint()
+                synced = set(reference)
+            if random.random() < 0.3:
+                # Crash: drop the unsynced records and leave half a record at the end of the log
+                os.close(tree._log)
+                with open(os.path.join(directory, 'wal'), 'ab') as log:
+                    log.write(_RECORD.pack(9, 0) + b'a\x80')
+                tree = DurableAVL(directory, sync_every=10 ** 6, checkpoint_every=tree.checkpoint_every)
+                reference = set(synced)
+            if list(tree) != sorted(reference) or not tree.is_valid_avl():
+                raise Exception("PROBLEM WITH RECOVERY")
+        tree.close()
+        if list(DurableAVL(directory)) != sorted(reference):
+            raise Exception("PROBLEM WITH CLOSE")
+    print('durable AVL stress test finished')
+
+    print("\nmethod add() / remove() example 3")
+    print("---------------------------------")
+
+    class Unpicklable(int):
+        """
+        An int that cannot be written to the log.
+        """
+        def __reduce__(self):
+            raise pickle.PicklingError('cannot pickle ' + str(int(self)))
+
+    shutil.rmtree(directory)
+    tree = DurableAVL(directory)
+    tree.add(1)
+    for change in (tree.add, tree.remove):
+        try:
+            change(Unpicklable(2 if change == tree.add else 1))
+        except pickle.PicklingError as error:
+            print(error, list(tree))
+    tree.close()
+    for change in (tree.add, tree.remove):
+        try:
+            change(1)
+        except ValueError as error:
+            print(error, list(tree))
+    if list(DurableAVL(directory)) != [1]:
+        raise Exception("PROBLEM WITH FAILED CHANGES")
+    shutil.rmtree(directory)
@@ -0,0 +1,188 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Read-only snapshot of a tree, made by freeze(). The values are kept in one sorted tuple and
+#              every query is a binary search with bisect, which runs in C instead of walking node objects
+
+
+import random
+from bisect import bisect_left, bisect_right
+
+
+class FrozenTree:
+    """
+    Frozen Tree class, an immutable snapshot of the values of a tree in ascending order
+
+    Queries take the same arguments as the matching tree methods. A snapshot does not follow later
+    changes to the tree it was made from, call freeze() again to rebuild it in O(n).
+    """
+
+    def __init__(self, values, items=None) -> None:
+        """
+        Initialize a snapshot from values in ascending order. If items is given, the i-th item is
+        returned in place of the i-th value, which lets keyed trees search keys but return records
+        """
+        self._keys = tuple(values)
+        self._items = self._keys if items is None else tuple(items)
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return "FrozenTree { " + ", ".join(str(item) for item in self._items) + " }"
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the snapshot.
+        """
+        return len(self._keys)
+
+    def __iter__(self):
+        """
+        Iterates over the values of the snapshot in ascending order.
+        """
+        return iter(self._items)
+
+    def __reversed__(self):
+        """
+        Iterates over the values of the snapshot in descending order.
+        """
+        return reversed(self._items)
+
+    def __contains__(self, value: object) -> bool:
+        """
+        Returns True if the value is in the snapshot.
+        """
+        return self.contains(value)
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the snapshot. Otherwise, it returns False.
+        """
+        i = bisect_left(self._keys, value)
+        return i < len(self._keys) and self._keys[i] == value
+
+    def is_empty(self) -> bool:
+        """
+        This method returns True if the snapshot is empty. Otherwise, it returns False.
+        """
+        return not self._keys
+
+    def find_min(self) -> object:
+        """
+        This method returns the lowest value, or None if the snapshot is empty.
+        """
+        return self._items[0] if self._items else None
+
+    def find_max(self) -> object:
+        """
+        This method returns the highest value, or None if the snapshot is empty.
+        """
+        return self._items[-1] if self._items else None
+
+    def floor(self, x: object) -> object:
+        """
+        This method returns the largest value less than or equal to x, or None if there is none.
+        """
+        return self._item(bisect_right(self._keys, x) - 1)
+
+    def ceiling(self, x: object) -> object:
+        """
+        This method returns the smallest value greater than or equal to x, or None if there is none.
+        """
+        return self._item(bisect_left(self._keys, x))
+
+    def lower(self, x: object) -> object:
+        """
+        This method returns the largest value strictly less than x, or None if there is none.
+        """
+        return self._item(bisect_left(self._keys, x) - 1)
+
+    def higher(self, x: object) -> object:
+        """
+        This method returns the smallest value strictly greater than x, or None if there is none.
+        """
+        return self._item(bisect_right(self._keys, x))
+
+    def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method yields, in ascending order, every value between lo and hi. The bounds work like
+        they do in BST.iter_range().
+        """
+        start, stop = self._range_indexes(lo, hi, inclusive)
+        for i in range(start, stop):
+            yield self._items[i]
+
+    def count_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)) -> int:
+        """
+        This method returns the number of values between lo and hi in O(log n).
+        """
+        start, stop = self._range_indexes(lo, hi, inclusive)
+        return max(stop - start, 0)
+
+    def _range_indexes(self, lo: object, hi: object, inclusive: (bool, bool)) -> (int, int):
+        """
+        Returns the slice [start, stop) of the values between lo and hi.
+        """
+        keys = self._keys
+        start = 0
+        if lo is not None:
+            start = bisect_left(keys, lo) if inclusive[0] else bisect_right(keys, lo)
+        stop = len(keys)
+        if hi is not None:
+            stop = bisect_right(keys, hi) if inclusive[1] else bisect_left(keys, hi)
+        return start, stop
+
+    def _item(self, i: int) -> object:
+        """
+        Returns the i-th value, or None if i is out of range.
+        """
+        if 0 <= i < len(self._items):
+            return self._items[i]
+        return None
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod freeze() example 1")
+    print("-------------------------")
+    from avl import AVL
+    tree = AVL([10, 20, 5, 15, 17, 7, 12])
+    frozen = tree.freeze()
+    tree.add(16)
+    print(frozen, len(frozen), frozen.contains(16), tree.contains(16))
+    for x in (4, 5, 13, 21):
+        print(x, ':', frozen.floor(x), frozen.ceiling(x), frozen.lower(x), frozen.higher(x))
+    print(list(frozen.iter_range(7, 15, (False, True))), frozen.count_range(7, 15, (False, True)))
+
+    print("\nmethod freeze() example 2")
+    print("-------------------------")
+    from bst import BST
+    from keyed import KeyedAVL
+    from btree import BTree
+    for _ in range(100):
+        case = [random.randrange(1, 200) for _ in range(100)]
+        btree = BTree(case, capacity=4)
+        if list(btree.freeze()) != list(btree) or not all(x in btree.freeze() for x in case):
+            raise Exception("PROBLEM WITH FROZEN BTREE")
+        for tree in (BST(case), AVL(case)):
+            frozen = tree.freeze()
+            for x in range(0, 202):
+                if frozen.contains(x) != tree.contains(x) or frozen.floor(x) != tree.floor(x) or \
+                        frozen.ceiling(x) != tree.ceiling(x) or frozen.lower(x) != tree.lower(x) or \
+                        frozen.higher(x) != tree.higher(x):
+                    raise Exception("PROBLEM WITH FROZEN QUERY")
+            lo, hi = sorted(random.randrange(0, 201) for _ in range(2))
+            for inclusive in ((True, True), (True, False), (False, True), (False, False)):
+                if list(frozen.iter_range(lo, hi, inclusive)) != list(tree.iter_range(lo, hi, inclusive)) or \
+                        frozen.count_range(lo, hi, inclusive) != tree.count_range(lo, hi, inclusive):
+                    raise Exception("PROBLEM WITH FROZEN RANGE QUERY")
+        records = KeyedAVL([(value, str(value)) for value in case], key=lambda record: record[0])
+        frozen = records.freeze()
+        if list(frozen) != list(records) or frozen.floor(100) != records.floor(100):
+            raise Exception("PROBLEM WITH FROZEN KEYED TREE")
+    print('freeze() stress test finished')
@@ -0,0 +1,441 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: BST and AVL trees ordered by a key function, like sorted(key=...). The key of each record
+#              is computed once when it is added and stored as the node's value, so the trees only ever
+#              compare the cached keys and never call the records' own comparison methods
+
+
+import random
+from operator import itemgetter
+from bst import BSTNode, BST
+from avl import AVLNode, AVL
+
+
+def _identity(record: object) -> object:
+    """
+    Default key function, orders records by themselves.
+    """
+    return record
+
+
+class KeyedBSTNode(BSTNode):
+    """
+    Keyed BST Node class. Inherits from BSTNode
+    """
+    def __init__(self, key: object) -> None:
+        """
+        Initialize a new keyed node. The key is stored as the node's value
+        """
+        super().__init__(key)
+        self.payload = None     # record the key was computed from
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'Keyed BST Node: {}'.format(self.payload)
+
+
+class KeyedAVLNode(AVLNode):
+    """
+    Keyed AVL Node class. Inherits from AVLNode
+    """
+    def __init__(self, key: object) -> None:
+        """
+        Initialize a new keyed node. The key is stored as the node's value
+        """
+        super().__init__(key)
+        self.payload = None     # record the key was computed from
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'Keyed AVL Node: {}'.format(self.payload)
+
+
+class _KeyedTree:
+    """
+    Methods shared by KeyedBST and KeyedAVL, listed before the tree class in their bases.
+
+    add(), remove() and contains() take records and apply the key function to them, and so do the
+    batch lookups contains_many() and rank_many(). Like the key argument of the bisect functions,
+    range bounds are keys. Traversals yield the records.
+    """
+
+    def __init__(self, start_tree=None, key=None) -> None:
+        """
+        Initialize a new keyed tree. Records are ordered by key(record), or by themselves if no key is given
+        """
+        self._key = key if key is not None else _identity
+        super().__init__(start_tree)
+
+    @classmethod
+    def from_sorted(cls, iterable, key=None) -> 'BST':
+        """
+        This method builds a perfectly balanced tree in O(n) from records already sorted by key.
+        """
+        tree = cls(key=key)
+        tree._set_root(tree._build_balanced(list(iterable)))
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable, key=None) -> 'BST':
+        """
+        This method builds a perfectly balanced tree from records in any order in O(n log n).
+        """
+        return cls.from_sorted(sorted(iterable, key=key), key=key)
+
+    @classmethod
+    def load(cls, path: str, key=None) -> 'BST':
+        """
+        This method builds a perfectly balanced tree in O(n) from records written by dump(). The key
+        function is not stored in the file, so it is passed in again.
+        """
+        from tree_io import load_values
+        values, _ = load_values(path)
+        return cls.from_sorted(values, key=key)
+
+    def _node_heights(self) -> list:
+        """
+        The shape is not stored for keyed trees, load() always builds them balanced.
+        """
+        raise ValueError('the shape of a keyed tree cannot be stored')
+
+    def remove(self, record: object) -> bool:
+        """
+        This method removes a record with the same key as record. The method returns True if a record
+        is removed. Otherwise, it returns False.
+        """
+        return super().remove(self._key(record))
+
+    def contains(self, record: object) -> bool:
+        """
+        This method returns True if a record with the same key as record is in the tree.
+        """
+        return super().contains(self._key(record))
+
+    def iter_inorder(self, reverse: bool = False):
+        """
+        This method is a generator that yields the records in key order (or reverse key order).
+        """
+        for n in self._iter_nodes(reverse):
+            yield n.payload
+
+    def freeze(self) -> 'FrozenTree':
+        """
+        This method returns a read-only snapshot that searches the cached keys and returns the records.
+        """
+        from frozen import FrozenTree
+        nodes = list(self._iter_nodes())
+        return FrozenTree([n.value for n in nodes], [n.payload for n in nodes])
+
+    def contains_many(self, records):
+        """
+        This method checks a batch of records by key, like BST.contains_many().
+        """
+        return super().contains_many([self._key(record) for record in records])
+
+    def rank_many(self, records):
+        """
+        This method returns, for each record in a batch, the number of records in the tree with a
+        smaller key, like BST.rank_many(). It takes records, the same as contains_many().
+        """
+        return super().rank_many([self._key(record) for record in records])
+
+    def _cached_values(self):
+        """
+        Yields the keys, which are what the batch lookups compare.
+        """
+        for n in self._iter_nodes():
+            yield n.value
+
+    def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method is a generator that yields, in key order, every record whose key is between the
+        keys lo and hi. The bounds work like they do in BST.iter_range().
+        """
+        for n in self._iter_range_nodes(lo, hi, inclusive):
+            yield n.payload
+
+    def floor(self, x: object) -> object:
+        """
+        This method returns the record with the largest key less than or equal to the key x, or None.
+        """
+        return self._payload(self._floor_node(x, True))
+
+    def ceiling(self, x: object) -> object:
+        """
+        This method returns the record with the smallest key greater than or equal to the key x, or None.
+        """
+        return self._payload(self._ceiling_node(x, True))
+
+    def lower(self, x: object) -> object:
+        """
+        This method returns the record with the largest key strictly less than the key x, or None.
+        """
+        return self._payload(self._floor_node(x, False))
+
+    def higher(self, x: object) -> object:
+        """
+        This method returns the record with the smallest key strictly greater than the key x, or None.
+        """
+        return self._payload(self._ceiling_node(x, False))
+
+    def nearest(self, x: object) -> object:
+        """
+        This method returns the record whose key is closest to the key x, or None if the tree is empty.
+        """
+        return self._payload(self._nearest_node(x))
+
+    def find_min(self) -> object:
+        """
+        This method returns the record with the lowest key. If the tree is empty, the method returns None.
+        """
+        return self._payload(self._min_node)
+
+    def find_max(self) -> object:
+        """
+        This method returns the record with the highest key. If the tree is empty, the method returns None.
+        """
+        return self._payload(self._max_node)
+
+    def pop_min(self) -> object:
+        """
+        This method removes the record with the lowest key and returns it, or None if the tree is empty.
+        """
+        node = self._min_node
+        super().pop_min()
+        return self._payload(node)
+
+    def pop_max(self) -> object:
+        """
+        This method removes the record with the highest key and returns it, or None if the tree is empty.
+        """
+        node = self._max_node
+        super().pop_max()
+        return self._payload(node)
+
+    def _payload(self, node: BSTNode) -> object:
+        """
+        Returns the record stored in node, or None if node is None.
+        """
+        return node.payload if node else None
+
+    def _new_keyed_node(self, key: object, record: object) -> BSTNode:
+        """
+        Creates the node that stores a record under its key.
+        """
+        node = self._new_node(key)
+        node.payload = record
+        return node
+
+
+class KeyedBST(_KeyedTree, BST):
+    """
+    Keyed Binary Search Tree class. Records with equal keys are all kept, like duplicates in BST.
+    """
+
+    def add(self, record: object) -> None:
+        """
+        This method adds a record to the tree under key(record). If a record with the same key is
+        already in the tree, the new one is added to the right subtree of that node.
+        """
+        key = self._key(record)
+        node = self._new_keyed_node(key, record)
+        if self._root is None:
+            self._root = node
+            self._note_added(node)
+            return
+        # Find the location of the node we are adding and store its parent
+        parent = None
+        n = self._root
+        while n is not None:
+            parent = n
+            if key < n.value:
+                n = n.left
+            else:
+                n = n.right
+        if key < parent.value:
+            parent.left = node
+        else:
+            parent.right = node
+        self._note_added(node)
+
+    def _build_balanced(self, records: list) -> KeyedBSTNode:
+        """
+        Builds a balanced subtree from records sorted by key and returns its root.
+        """
+        keys = [self._key(record) for record in records]
+        nodes = [self._new_keyed_node(key, record) for key, record in zip(keys, records)]
+        return self._link_balanced(nodes, self._first_copies(keys))
+
+    def _new_node(self, key: object) -> KeyedBSTNode:
+        """
+        Creates the node that stores a new key.
+        """
+        return KeyedBSTNode(key)
+
+
+class KeyedAVL(_KeyedTree, AVL):
+    """
+    Keyed AVL Tree class. Like AVL, a record whose key is already in the tree is not added.
+    """
+
+    def add(self, record: object) -> None:
+        """
+        This method adds a record to the tree under key(record) while maintaining its AVL property.
+        If a record with the same key is already in the tree, the method does not change the tree.
+        """
+        node, added = self._add_node(self._key(record))
+        if added:
+            node.payload = record
+
+    def add_many(self, records) -> None:
+        """
+        This method adds every record in an iterable, like AVL.add_many(). Each key is computed once.
+        """
+        batch = [(self._key(record), record) for record in records]
+        # The sort is stable, so the first record with a given key is the one that is kept
+        batch.sort(key=itemgetter(0))
+        if not self._prefers_rebuild(len(batch)):
+            for key, record in batch:
+                node, added = self._add_node(key)
+                if added:
+                    node.payload = record
+            return
+        self._merge_nodes([self._new_keyed_node(key, record) for key, record in batch])
+
+    def remove_many(self, records) -> int:
+        """
+        This method removes every record in an iterable by key and returns how many were removed.
+        Each key is computed once: a small batch removes each key with AVL.remove(), since remove()
+        would apply the key function again, and a large one is relinked by AVL.remove_many().
+        """
+        keys = sorted(self._key(record) for record in records)
+        if self._prefers_rebuild(len(keys)):
+            return super().remove_many(keys)
+        removed = 0
+        for key in keys:
+            if AVL.remove(self, key):
+                removed += 1
+        return removed
+
+    def copy(self) -> 'KeyedAVL':
+        """
+        This method returns a new tree with the same records and key function, built in O(n).
+        """
+        tree = type(self)(key=self._key)
+        nodes = [tree._new_keyed_node(n.value, n.payload) for n in self._iter_nodes()]
+        tree._set_root(tree._link_balanced(nodes))
+        return tree
+
+    @classmethod
+    def join(cls, left: 'KeyedAVL', pivot: object, right: 'KeyedAVL') -> 'KeyedAVL':
+        """
+        This method joins two keyed trees and a pivot record like AVL.join(), comparing keys.
+        """
+        tree = cls(key=left._key)
+        key = tree._key(pivot)
+        largest, smallest = left._max_node, right._min_node
+        if (largest and not largest.value < key) or (smallest and not key < smallest.value):
+            raise ValueError('join() needs max(left) < pivot < min(right)')
+        tree._set_root(tree._join_nodes(left._root, tree._new_keyed_node(key, pivot), right._root))
+        left._set_root(None)
+        right._set_root(None)
+        return tree
+
+    def _copy_node(self, node: KeyedAVLNode) -> KeyedAVLNode:
+        """
+        Creates a new node holding the key and record of node.
+        """
+        return self._new_keyed_node(node.value, node.payload)
+
+    def _wrap(self, root: KeyedAVLNode) -> 'KeyedAVL':
+        """
+        Returns a new tree with the same key function that takes ownership of the subtree at root.
+        """
+        tree = type(self)(key=self._key)
+        tree._set_root(root)
+        return tree
+
+    def _build_balanced(self, records: list) -> KeyedAVLNode:
+        """
+        Builds a balanced subtree from records sorted by key and returns its root. Only the first
+        record with each key is kept.
+        """
+        nodes = []
+        for record in records:
+            key = self._key(record)
+            if not nodes or nodes[-1].value != key:
+                nodes.append(self._new_keyed_node(key, record))
+        return self._link_balanced(nodes)
+
+    def _new_node(self, key: object) -> KeyedAVLNode:
+        """
+        Creates the node that stores a new key.
+        """
+        return KeyedAVLNode(key)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() example 1")
+    print("----------------------")
+    records = [('carol', 31), ('alice', 25), ('bob', 40), ('dave', 25), ('erin', 35)]
+    for cls in (KeyedBST, KeyedAVL):
+        tree = cls(records, key=itemgetter(1))
+        print(cls.__name__, 'by age :', list(tree))
+        print(cls.__name__, 'ages 30-40 :', list(tree.iter_range(30, 40)))
+        print(cls.__name__, 'contains', ('zed', 40), ':', tree.contains(('zed', 40)))
+        print(cls.__name__, 'youngest / oldest :', tree.find_min(), tree.find_max())
+
+    print("\nmethod add() / remove() example 2")
+    print("---------------------------------")
+    for _ in range(100):
+        case = [(random.randrange(1, 300), random.random()) for _ in range(200)]
+        bst, avl = KeyedBST(case, key=itemgetter(0)), KeyedAVL(case, key=itemgetter(0))
+        for record in case[::3]:
+            bst.remove(record)
+            avl.remove(record)
+        if not bst.is_valid_bst() or [r[0] for r in bst] != sorted(r[0] for r in case[1::3] + case[2::3]):
+            raise Exception("PROBLEM WITH KEYED BST")
+        removed = set(r[0] for r in case[::3])
+        if not avl.is_valid_avl() or \
+                [r[0] for r in avl] != sorted(set(r[0] for r in case) - removed):
+            raise Exception("PROBLEM WITH KEYED AVL")
+        tree = KeyedAVL.from_iterable(case, key=itemgetter(0))
+        tree.add_many((random.randrange(1, 300), 0.0) for _ in range(400))
+        if not tree.is_valid_avl() or [r[0] for r in tree] != sorted(n.value for n in tree._iter_nodes()):
+            raise Exception("PROBLEM WITH KEYED ADD_MANY")
+        # Small batches remove node by node and large ones relink the tree, both keying each record once
+        for size in (1, 5, 400):
+            batch = [(random.randrange(1, 300), 'x') for _ in range(size)]
+            keys = set(r[0] for r in batch)
+            before, expected = list(tree), [r for r in tree if r[0] not in keys]
+            if tree.remove_many(batch) != len(before) - len(expected) or list(tree) != expected or \
+                    not tree.is_valid_avl():
+                raise Exception("PROBLEM WITH KEYED REMOVE_MANY")
+        for size in (2, 250):
+            negated, batch = KeyedAVL(range(300), key=lambda x: -x), random.sample(range(300), size)
+            expected = [x for x in negated if x not in batch]
+            if negated.remove_many(batch) != size or list(negated) != expected or not negated.is_valid_avl():
+                raise Exception("PROBLEM WITH KEYED REMOVE_MANY")
+    print('keyed tree stress test finished')
+
+    print("\nmethod pop_min() / pop_max() example 1")
+    print("--------------------------------------")
+    for cls in (KeyedBST, KeyedAVL):
+        tree = cls(records, key=itemgetter(1))
+        print(cls.__name__, 'pop youngest / oldest :', tree.pop_min(), tree.pop_max(), list(tree))
+
+    print("\nmethod contains_many() / rank_many() example 1")
+    print("----------------------------------------------")
+    tree = KeyedAVL(records, key=itemgetter(1))
+    probes = [('anyone', 25), ('anyone', 31), ('anyone', 32), ('anyone', 99)]
+    print([bool(found) for found in tree.contains_many(probes)], [int(rank) for rank in tree.rank_many(probes)])
@@ -0,0 +1,438 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: BST and AVL trees that hold a multiset. Each distinct value is stored once, in a node that
+#              counts its copies, so duplicates never make chains and the depth only depends on the number
+#              of distinct values
+
+
+import random
+from itertools import repeat
+from bst import BSTNode, BST
+from avl import AVLNode, AVL
+
+
+class MultisetBSTNode(BSTNode):
+    """
+    Multiset BST Node class. Inherits from BSTNode
+    """
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new multiset node holding one copy of value
+        """
+        super().__init__(value)
+        self.count = 1          # number of copies of value in the tree
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'Multiset BST Node: {} x{}'.format(self.value, self.count)
+
+
+class MultisetAVLNode(AVLNode):
+    """
+    Multiset AVL Node class. Inherits from AVLNode
+    """
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new multiset node holding one copy of value
+        """
+        super().__init__(value)
+        self.count = 1          # number of copies of value in the tree
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'Multiset AVL Node: {} x{}'.format(self.value, self.count)
+
+
+class _MultisetTree:
+    """
+    Methods shared by MultisetBST and MultisetAVL, listed before the tree class in their bases.
+
+    add() and remove() change the count of a value's node and only add or remove the node itself when
+    the first copy arrives or the last one leaves. len() and the traversals include every copy.
+    """
+
+    def add(self, value: object, n: int = 1) -> None:
+        """
+        This method adds n copies of value to the tree.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        node, added = self._add_node(value)
+        if added:
+            node.count = n
+        else:
+            node.count += n
+            self._version += 1
+
+    def remove(self, value: object, n: int = 1) -> bool:
+        """
+        This method removes n copies of value from the tree, or every copy if there are fewer than n.
+        The method returns True if any copies are removed. Otherwise, it returns False.
+        """
+        if n < 1:
+            raise ValueError('n must be at least 1')
+        result = self.find_node_and_parent(value)
+        if not result:
+            return False
+        node, parent = result[0], result[1]
+        if node.count > n:
+            node.count -= n
+            self._version += 1
+        else:
+            self._remove_node(node, parent)
+        return True
+
+    def count(self, value: object) -> int:
+        """
+        This method returns the number of copies of value in the tree.
+        """
+        result = self.find_node_and_parent(value)
+        return result[0].count if result else 0
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree, counting every copy, in O(distinct values).
+        """
+        total = 0
+        for n in self._iter_nodes():
+            total += n.count
+        return total
+
+    def iter_inorder(self, reverse: bool = False):
+        """
+        This method is a generator that yields every copy of the values of the tree in ascending order,
+        or descending order if reverse is True.
+        """
+        for n in self._iter_nodes(reverse):
+            yield from repeat(n.value, n.count)
+
+    def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method is a generator that yields every copy of the values between lo and hi, using the
+        same bounds as BST.iter_range().
+        """
+        for n in self._iter_range_nodes(lo, hi, inclusive):
+            yield from repeat(n.value, n.count)
+
+    def count_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)) -> int:
+        """
+        This method returns the number of values between lo and hi, counting every copy.
+        """
+        total = 0
+        for n in self._iter_range_nodes(lo, hi, inclusive):
+            total += n.count
+        return total
+
+    def pop_min(self) -> object:
+        """
+        This method removes one copy of the lowest value and returns it, or None if the tree is empty.
+        """
+        node = self._min_node
+        if node is not None and node.count > 1:
+            node.count -= 1
+            self._version += 1
+            return node.value
+        return super().pop_min()
+
+    def pop_max(self) -> object:
+        """
+        This method removes one copy of the highest value and returns it, or None if the tree is empty.
+        """
+        node = self._max_node
+        if node is not None and node.count > 1:
+            node.count -= 1
+            self._version += 1
+            return node.value
+        return super().pop_max()
+
+    def _build_balanced(self, values: list) -> BSTNode:
+        """
+        Builds a balanced subtree from a sorted list, with one node per run of equal values, and returns its root.
+        """
+        return self._link_balanced(self._counted_nodes(values))
+
+    def _node_heights(self) -> list:
+        """
+        The shape is not stored for multisets, whose dumps repeat each value once per copy.
+        """
+        raise ValueError('the shape of a multiset cannot be stored')
+
+    def _counted_nodes(self, values: list) -> list:
+        """
+        Turns a sorted list into a list of new nodes, one per distinct value, counting the copies.
+        """
+        nodes = []
+        for value in values:
+            if nodes and nodes[-1].value == value:
+                nodes[-1].count += 1
+            else:
+                nodes.append(self._new_node(value))
+        return nodes
+
+
+class MultisetBST(_MultisetTree, BST):
+    """
+    Multiset Binary Search Tree class
+    """
+
+    def _add_node(self, value: object) -> (MultisetBSTNode, bool):
+        """
+        Finds the node holding value, creating it if needed. Returns the node and whether it was created.
+        """
+        parent = None
+        n = self._root
+        while n is not None:
+            if n.value == value:
+                return n, False
+            parent = n
+            n = n.left if value < n.value else n.right
+        node = self._new_node(value)
+        if parent is None:
+            self._root = node
+        elif value < parent.value:
+            parent.left = node
+        else:
+            parent.right = node
+        self._note_added(node)
+        return node, True
+
+    def _new_node(self, value: object) -> MultisetBSTNode:
+        """
+        Creates the node that stores a new value.
+        """
+        return MultisetBSTNode(value)
+
+
+class MultisetAVL(_MultisetTree, AVL):
+    """
+    Multiset AVL Tree class
+
+    The set operations follow collections.Counter: a union keeps the larger count of each value, an
+    intersection the smaller one, and a difference subtracts the counts of the other tree.
+    """
+
+    def add_many(self, values) -> None:
+        """
+        This method adds every value in an iterable to the tree, copies included, like AVL.add_many().
+        """
+        batch = sorted(values)
+        if not self._prefers_rebuild(len(batch)):
+            for value in batch:
+                self.add(value)
+            return
+        self._merge_nodes(self._counted_nodes(batch))
+
+    def _merge_nodes(self, batch: list) -> None:
+        """
+        Merges a list of new counted nodes, sorted by value, with the nodes of the tree and relinks
+        them. A batch node whose value is already in the tree adds its count to that node instead.
+        """
+        nodes = []
+        i = 0
+        for node in self._iter_nodes():
+            while i < len(batch) and batch[i].value < node.value:
+                nodes.append(batch[i])
+                i += 1
+            if i < len(batch) and batch[i].value == node.value:
+                node.count += batch[i].count
+                i += 1
+            nodes.append(node)
+        nodes.extend(batch[i:])
+        self._set_root(self._link_balanced(nodes))
+
+    def remove_many(self, values) -> int:
+        """
+        This method removes one copy for each value in an iterable and returns how many copies were
+        removed. Like add_many(), large batches relink the tree from the nodes that are kept.
+        """
+        batch = sorted(values)
+        if not self._prefers_rebuild(len(batch)):
+            removed = 0
+            for value in batch:
+                if self.remove(value):
+                    removed += 1
+            return removed
+        kept = []
+        removed = 0
+        i = 0
+        for node in self._iter_nodes():
+            while i < len(batch) and batch[i] < node.value:
+                i += 1
+            # Take one copy for each time the value appears in the batch
+            while i < len(batch) and batch[i] == node.value and node.count > 0:
+                node.count -= 1
+                removed += 1
+                i += 1
+            if node.count > 0:
+                kept.append(node)
+        self._set_root(self._link_balanced(kept))
+        return removed
+
+    def copy(self) -> 'MultisetAVL':
+        """
+        This method returns a new tree with the same values and counts, built in O(distinct values).
+        """
+        tree = type(self)()
+        nodes = []
+        for n in self._iter_nodes():
+            node = tree._new_node(n.value)
+            node.count = n.count
+            nodes.append(node)
+        tree._set_root(tree._link_balanced(nodes))
+        return tree
+
+    def union(self, other: 'MultisetAVL') -> 'MultisetAVL':
+        """
+        This method returns a new tree where each value has the larger of its two counts.
+        """
+        result = self.copy()
+        result.update(other)
+        return result
+
+    def intersection(self, other: 'MultisetAVL') -> 'MultisetAVL':
+        """
+        This method returns a new tree where each value has the smaller of its two counts.
+        """
+        result = self.copy()
+        result.intersection_update(other)
+        return result
+
+    def difference(self, other: 'MultisetAVL') -> 'MultisetAVL':
+        """
+        This method returns a new tree where each value has its count here less its count in other.
+        """
+        result = self.copy()
+        result.difference_update(other)
+        return result
+
+    def update(self, other: 'MultisetAVL') -> None:
+        """
+        This method raises the count of each value to its count in other, if that is larger.
+        """
+        self._merge_counts(other, max)
+
+    def intersection_update(self, other: 'MultisetAVL') -> None:
+        """
+        This method lowers the count of each value to its count in other, if that is smaller.
+        """
+        self._merge_counts(other, min)
+
+    def difference_update(self, other: 'MultisetAVL') -> None:
+        """
+        This method removes as many copies of each value as there are in other.
+        """
+        self._merge_counts(other, lambda mine, theirs: mine - theirs)
+
+    def _merge_counts(self, other: 'AVL', combine) -> None:
+        """
+        Walks both trees in order side by side and relinks the tree from nodes with the counts that
+        combine(count here, count in other) gives, dropping values whose count is not positive.
+        Unlike the set operations of AVL this is O(n + m), since nodes may change count rather than
+        just being kept or dropped. other is unchanged and can be a plain AVL, whose values count once.
+        """
+        nodes = []
+        theirs = other._iter_nodes()
+        their_node = next(theirs, None)
+        for node in self._iter_nodes():
+            while their_node is not None and their_node.value < node.value:
+                self._append_count(nodes, their_node.value, combine(0, getattr(their_node, 'count', 1)))
+                their_node = next(theirs, None)
+            their_count = 0
+            if their_node is not None and their_node.value == node.value:
+                their_count = getattr(their_node, 'count', 1)
+                their_node = next(theirs, None)
+            node.count = combine(node.count, their_count)
+            if node.count > 0:
+                nodes.append(node)
+        while their_node is not None:
+            self._append_count(nodes, their_node.value, combine(0, getattr(their_node, 'count', 1)))
+            their_node = next(theirs, None)
+        self._set_root(self._link_balanced(nodes))
+
+    def _append_count(self, nodes: list, value: object, count: int) -> None:
+        """
+        Appends a new node holding count copies of value to nodes, if count is positive.
+        """
+        if count > 0:
+            node = self._new_node(value)
+            node.count = count
+            nodes.append(node)
+
+    def _new_node(self, value: object) -> MultisetAVLNode:
+        """
+        Creates the node that stores a new value.
+        """
+        return MultisetAVLNode(value)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() / count() example 1")
+    print("--------------------------------")
+    for cls in (MultisetBST, MultisetAVL):
+        tree = cls((1, 1, 1, 1))
+        tree.add(3, 2)
+        print(cls.__name__, tree, 'len:', len(tree), 'count(1):', tree.count(1), list(tree))
+
+    print("\nmethod remove() example 1")
+    print("-------------------------")
+    for cls in (MultisetBST, MultisetAVL):
+        tree = cls((5, 3, 5, 8, 5, 3))
+        print(cls.__name__, tree.remove(5), tree.remove(5, 10), tree.remove(7), tree.remove(3), list(tree))
+
+    print("\nmethod add() / remove() example 2")
+    print("---------------------------------")
+    from collections import Counter
+    for _ in range(100):
+        reference = Counter()
+        bst, avl = MultisetBST(), MultisetAVL()
+        for _ in range(600):
+            value, n = random.randrange(1, 50), random.randrange(1, 4)
+            if random.random() < 0.4:
+                bst.remove(value, n)
+                avl.remove(value, n)
+                reference[value] = max(reference[value] - n, 0)
+            else:
+                bst.add(value, n)
+                avl.add(value, n)
+                reference[value] += n
+        expected = sorted(reference.elements())
+        if not bst.is_valid_bst() or list(bst) != expected or len(bst) != len(expected):
+            raise Exception("PROBLEM WITH MULTISET BST")
+        if not avl.is_valid_avl() or list(avl) != expected or len(avl) != len(expected) or \
+                list(reversed(avl)) != expected[::-1] or avl.count_range(10, 20) != len(
+                    [value for value in expected if 10 <= value <= 20]):
+            raise Exception("PROBLEM WITH MULTISET AVL")
+        if expected and (avl.pop_min(), avl.pop_max()) != (expected[0], expected[-1]):
+            raise Exception("PROBLEM WITH MULTISET POP_MIN OR POP_MAX")
+    print('multiset stress test finished')
+
+    print("\nmethod add_many() / remove_many() / set operations example 1")
+    print("------------------------------------------------------------")
+    for _ in range(100):
+        case_a = [random.randrange(1, 100) for _ in range(random.choice((5, 300)))]
+        case_b = [random.randrange(1, 100) for _ in range(random.choice((5, 300)))]
+        a, b = MultisetAVL.from_iterable(case_a), MultisetAVL.from_iterable(case_b)
+        for operator, expected in ((MultisetAVL.__or__, Counter(case_a) | Counter(case_b)),
+                                   (MultisetAVL.__and__, Counter(case_a) & Counter(case_b)),
+                                   (MultisetAVL.__sub__, Counter(case_a) - Counter(case_b))):
+            result = operator(a, b)
+            if not result.is_valid_avl() or list(result) != sorted(expected.elements()):
+                raise Exception("PROBLEM WITH MULTISET SET OPERATION")
+        a.add_many(case_b)
+        if not a.is_valid_avl() or list(a) != sorted(case_a + case_b):
+            raise Exception("PROBLEM WITH MULTISET ADD_MANY")
+        removed = a.remove_many(case_b + case_b)
+        if not a.is_valid_avl() or list(a) != sorted((Counter(case_a) - Counter(case_b)).elements()) or \
+                removed != len(case_a) + len(case_b) - len(a):
+            raise Exception("PROBLEM WITH MULTISET REMOVE_MANY")
+    print('multiset batch stress test finished')
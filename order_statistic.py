@@ -0,0 +1,213 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Order-statistic AVL tree, an AVL subclass whose nodes also track the size of their subtree
+
+
+import random
+from avl import AVLNode, AVL
+
+
+class OSAVLNode(AVLNode):
+    """
+    Order-statistic AVL Tree Node class. Inherits from AVLNode
+    """
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new order-statistic AVL node
+        """
+        super().__init__(value)
+        self.size = 1       # number of nodes in the subtree rooted here
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'OS AVL Node: {}'.format(self.value)
+
+
+class OrderStatisticAVL(AVL):
+    """
+    Order-statistic AVL Tree class. Inherits from AVL
+
+    Every node stores the size of its subtree. Sizes are kept up to date in _update_height(), which add(),
+    remove(), _rotate_left() and _rotate_right() already call on each node whose subtree changes, and in
+    _retrace() for the ancestors above the point where the AVL retrace stops.
+    """
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        super()._str_helper(self._root, values)
+        return "OS AVL pre-order { " + ", ".join(values) + " }"
+
+    def is_valid_os_avl(self) -> bool:
+        """
+        Returns True if the tree is a valid AVL tree and every node's size matches its subtree.
+        Like is_valid_avl(), this is a troubleshooting helper.
+        """
+        if not self.is_valid_avl():
+            return False
+        for node in self._iter_nodes():
+            if node.size != 1 + self._get_size(node.left) + self._get_size(node.right):
+                return False
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in the tree in O(1).
+        """
+        return self._get_size(self._root)
+
+    def rank(self, value: object) -> int:
+        """
+        This method returns the number of values in the tree that are smaller than value, which is the
+        index value has (or would have) in the sorted order.
+        """
+        return self._count_less(value, False)
+
+    def select(self, k: int) -> object:
+        """
+        This method returns the k-th smallest value, counting from 0. Negative k counts from the end
+        like a list index. Raises IndexError if k is out of range.
+        """
+        size = self._get_size(self._root)
+        if k < 0:
+            k += size
+        if k < 0 or k >= size:
+            raise IndexError('select index out of range')
+        n = self._root
+        while True:
+            left = self._get_size(n.left)
+            if k < left:
+                n = n.left
+            elif k == left:
+                return n.value
+            else:
+                # Skip the left subtree and n itself
+                k -= left + 1
+                n = n.right
+
+    def median(self) -> object:
+        """
+        This method returns the median value, the lower of the two middle values when the size is even.
+        If the tree is empty, the method returns None.
+        """
+        if self._root is None:
+            return None
+        return self.select((self._root.size - 1) // 2)
+
+    def count_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)) -> int:
+        """
+        This method returns the number of values between lo and hi in O(log n), using the same bounds
+        as iter_range().
+        """
+        lo_inclusive, hi_inclusive = inclusive
+        count = self._get_size(self._root)
+        if hi is not None:
+            count = self._count_less(hi, hi_inclusive)
+        if lo is not None:
+            count -= self._count_less(lo, not lo_inclusive)
+        return max(count, 0)
+
+    def _count_less(self, value: object, or_equal: bool) -> int:
+        """
+        Returns the number of values smaller than value (or smaller than or equal to it) in one descent.
+        """
+        count = 0
+        n = self._root
+        while n is not None:
+            if value < n.value or (value == n.value and not or_equal):
+                n = n.left
+            else:
+                # n and its whole left subtree are counted
+                count += self._get_size(n.left) + 1
+                n = n.right
+        return count
+
+    def _get_size(self, node: OSAVLNode) -> int:
+        """
+        Returns the size of a node's subtree, or 0 for an empty subtree.
+        """
+        if not node:
+            return 0
+        return node.size
+
+    def _update_height(self, node: OSAVLNode) -> None:
+        """
+        Updates the height and the subtree size of a node after a change in the node's subtree.
+        """
+        super()._update_height(node)
+        node.size = 1 + self._get_size(node.left) + self._get_size(node.right)
+
+    def _retrace(self, node: OSAVLNode) -> OSAVLNode:
+        """
+        Retraces like AVL does, then keeps walking to the root to update subtree sizes, which change
+        on every ancestor even when the heights have stopped changing.
+        """
+        stop = super()._retrace(node)
+        if stop is not None:
+            node = stop.parent
+            while node:
+                node.size = 1 + self._get_size(node.left) + self._get_size(node.right)
+                node = node.parent
+        return stop
+
+    def _new_node(self, value: object) -> OSAVLNode:
+        """
+        Creates the node that stores a new value.
+        """
+        return OSAVLNode(value)
+
+    def _link_built_node(self, node: OSAVLNode, parent: OSAVLNode, size: int) -> None:
+        """
+        Sets the parent, height and subtree size of a node placed by _link_balanced().
+        """
+        super()._link_built_node(node, parent, size)
+        node.size = size
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod rank() / select() example 1")
+    print("----------------------------------")
+    tree = OrderStatisticAVL([10, 20, 5, 15, 17, 7, 12])
+    print(tree)
+    print("Size:", len(tree))
+    print("Rank of 15:", tree.rank(15))
+    print("Rank of 16:", tree.rank(16))
+    print("Values by rank:", [tree.select(k) for k in range(len(tree))])
+    print("Median:", tree.median())
+    print("Values in [7, 15]:", tree.count_range(7, 15))
+
+    print("\nmethod rank() / select() example 2")
+    print("----------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = OrderStatisticAVL(case)
+        for value in case[::2]:
+            tree.remove(value)
+        expected = sorted(case[1::2])
+        if not tree.is_valid_os_avl() or len(tree) != len(expected):
+            raise Exception("PROBLEM WITH SUBTREE SIZES")
+        k = random.randrange(len(expected))
+        if tree.select(k) != expected[k] or tree.rank(expected[k]) != k:
+            raise Exception("PROBLEM WITH RANK OR SELECT OPERATION")
+        lo, hi = sorted(random.randrange(0, 20001) for _ in range(2))
+        if tree.count_range(lo, hi, (False, True)) != len([v for v in expected if lo < v <= hi]):
+            raise Exception("PROBLEM WITH COUNT_RANGE OPERATION")
+    print('rank() / select() stress test finished')
+
+    print("\nmethod from_sorted() example 1")
+    print("------------------------------")
+    tree = OrderStatisticAVL.from_sorted(range(0, 34, 3))
+    print(tree)
+    print("Valid:", tree.is_valid_os_avl(), "Median:", tree.median())
@@ -0,0 +1,303 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Implementation of a persistent AVL tree. Nodes are never changed once they are in a tree, so
+#              add() and remove() copy the path from the root to the change and every older version of the
+#              tree stays valid, sharing all the other nodes with the newer ones
+
+
+import random
+from queue_and_stack import Stack
+from bst import BSTNode, BST
+
+
+class PersistentAVLNode(BSTNode):
+    """
+    Persistent AVL Tree Node class. Inherits from BSTNode
+    """
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new node, it only adds a height to BSTNode. There is no parent pointer because a
+        node can be shared by several versions of the tree
+        """
+        super().__init__(value)
+        self.height = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'Persistent AVL Node: {}'.format(self.value)
+
+
+class PersistentAVL(BST):
+    """
+    Persistent AVL Tree class. Inherits from BST
+
+    An update builds new copies of the O(log n) nodes on its search path and then publishes the new root
+    with a single assignment. snapshot() returns a tree holding the current root in O(1), and that tree
+    does not change however the original is updated afterwards. A reader can therefore iterate a snapshot
+    while another thread keeps writing, without a lock and without copying the tree.
+    Because the root is the only state, find_min() and find_max() walk a spine in O(log n).
+    Like AVL, duplicate values are not stored.
+    """
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        super()._str_helper(self._root, values)
+        return "Persistent AVL pre-order { " + ", ".join(values) + " }"
+
+    def is_valid_avl(self) -> bool:
+        """
+        Perform pre-order traversal of the tree. Return False if a node breaks the ordering property
+        or has the wrong height, or if any node is out of balance.
+        This is intended to be a troubleshooting 'helper' method, like AVL.is_valid_avl().
+        """
+        if not self.is_valid_bst():
+            return False
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node:
+                left = self._get_height(node.left)
+                right = self._get_height(node.right)
+                if node.height != 1 + max(left, right) or abs(right - left) > 1:
+                    return False
+                stack.push(node.right)
+                stack.push(node.left)
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def snapshot(self) -> 'PersistentAVL':
+        """
+        This method returns a copy of the current version of the tree in O(1). The copy shares all its
+        nodes with this tree, and later updates to either one do not show in the other.
+        """
+        tree = type(self)()
+        tree._root = self._root
+        return tree
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to a new version of the tree. Duplicate values are not allowed.
+        If the value is already in the tree, the method does not change the tree.
+        """
+        root = self._insert(self._root, value)
+        if root is not self._root:
+            self._set_root(root)
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value, making a new version of the tree. The method returns True if the
+        value is removed. Otherwise, it returns False.
+        """
+        root = self._delete(self._root, value)
+        if root is self._root:
+            return False
+        self._set_root(root)
+        return True
+
+    def find_min(self) -> object:
+        """
+        This method returns the lowest value in the tree. If the tree is empty, the method should return None.
+        """
+        node = self._leftmost(self._root)
+        return node.value if node else None
+
+    def find_max(self) -> object:
+        """
+        This method returns the highest value in the tree. If the tree is empty, the method should return None.
+        """
+        node = self._rightmost(self._root)
+        return node.value if node else None
+
+    def pop_min(self) -> object:
+        """
+        This method removes the lowest value from the tree and returns it. If the tree is empty, the method
+        returns None.
+        """
+        value = self.find_min()
+        if value is not None:
+            self.remove(value)
+        return value
+
+    def pop_max(self) -> object:
+        """
+        This method removes the highest value from the tree and returns it. If the tree is empty, the method
+        returns None.
+        """
+        value = self.find_max()
+        if value is not None:
+            self.remove(value)
+        return value
+
+    def _set_root(self, root: PersistentAVLNode) -> None:
+        """
+        Publishes root as the current version of the tree. Unlike BST._set_root() no min and max nodes
+        are kept, so the root reference is the whole state and one assignment switches versions.
+        """
+        self._version += 1
+        self._root = root
+
+    def _insert(self, node: PersistentAVLNode, value: object) -> PersistentAVLNode:
+        """
+        Returns a copy of the subtree at node with value added, or node itself if value is already there.
+        Only the nodes on the search path are copied.
+        """
+        if node is None:
+            return self._make(value, None, None)
+        if value < node.value:
+            left = self._insert(node.left, value)
+            if left is node.left:
+                return node
+            return self._balanced(node.value, left, node.right)
+        if node.value < value:
+            right = self._insert(node.right, value)
+            if right is node.right:
+                return node
+            return self._balanced(node.value, node.left, right)
+        return node
+
+    def _delete(self, node: PersistentAVLNode, value: object) -> PersistentAVLNode:
+        """
+        Returns a copy of the subtree at node without value, or node itself if value is not there.
+        A node with two subtrees is replaced by a copy of its successor.
+        """
+        if node is None:
+            return None
+        if value < node.value:
+            left = self._delete(node.left, value)
+            if left is node.left:
+                return node
+            return self._balanced(node.value, left, node.right)
+        if node.value < value:
+            right = self._delete(node.right, value)
+            if right is node.right:
+                return node
+            return self._balanced(node.value, node.left, right)
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        right, successor = self._delete_min(node.right)
+        return self._balanced(successor, node.left, right)
+
+    def _delete_min(self, node: PersistentAVLNode) -> (PersistentAVLNode, object):
+        """
+        Returns a copy of the subtree at node without its smallest value, and that value.
+        """
+        if node.left is None:
+            return node.right, node.value
+        left, smallest = self._delete_min(node.left)
+        return self._balanced(node.value, left, node.right), smallest
+
+    def _balanced(self, value: object, left: PersistentAVLNode, right: PersistentAVLNode) -> PersistentAVLNode:
+        """
+        Returns a new node holding value over left and right, rotated if the two heights differ by two.
+        A rotation builds new nodes instead of relinking the old ones, which may be shared.
+        """
+        left_height = self._get_height(left)
+        right_height = self._get_height(right)
+        # Left-heavy, rotate rightward (after rotating a right-heavy left child leftward)
+        if left_height > right_height + 1:
+            if self._get_height(left.left) >= self._get_height(left.right):
+                return self._make(left.value, left.left, self._make(value, left.right, right))
+            inner = left.right
+            return self._make(inner.value, self._make(left.value, left.left, inner.left),
+                              self._make(value, inner.right, right))
+        # Right-heavy, rotate leftward (after rotating a left-heavy right child rightward)
+        if right_height > left_height + 1:
+            if self._get_height(right.right) >= self._get_height(right.left):
+                return self._make(right.value, self._make(value, left, right.left), right.right)
+            inner = right.left
+            return self._make(inner.value, self._make(value, left, inner.left),
+                              self._make(right.value, inner.right, right.right))
+        return self._make(value, left, right)
+
+    def _make(self, value: object, left: PersistentAVLNode, right: PersistentAVLNode) -> PersistentAVLNode:
+        """
+        Creates a node with the given value and children and sets its height.
+        """
+        node = self._new_node(value)
+        node.left = left
+        node.right = right
+        node.height = max(self._get_height(left), self._get_height(right)) + 1
+        return node
+
+    def _get_height(self, node: PersistentAVLNode) -> int:
+        """
+        Returns the height of a node, or -1 for an empty subtree.
+        """
+        if node is None:
+            return -1
+        return node.height
+
+    def _build_balanced(self, values: list) -> PersistentAVLNode:
+        """
+        Builds a balanced subtree from a sorted list and returns its root. Duplicates are dropped.
+        """
+        nodes = []
+        for value in values:
+            if not nodes or nodes[-1].value != value:
+                nodes.append(self._new_node(value))
+        return self._link_balanced(nodes)
+
+    def _new_node(self, value: object) -> PersistentAVLNode:
+        """
+        Creates the node that stores a new value.
+        """
+        return PersistentAVLNode(value)
+
+    def _link_built_node(self, node: PersistentAVLNode, parent: PersistentAVLNode, size: int) -> None:
+        """
+        Sets the height of a node placed by _link_balanced() from the size of its range.
+        """
+        node.height = size.bit_length() - 1
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod snapshot() example 1")
+    print("---------------------------")
+    tree = PersistentAVL([10, 20, 5, 15, 17, 7, 12])
+    before = tree.snapshot()
+    tree.add(30)
+    tree.remove(10)
+    print('BEFORE :', before, list(before))
+    print('AFTER  :', tree, list(tree))
+    print('shared :', before.get_root().left is tree.get_root().left)
+
+    print("\nmethod add() / remove() / snapshot() example 2")
+    print("----------------------------------------------")
+    for _ in range(20):
+        tree, reference = PersistentAVL(), set()
+        versions = []
+        for _ in range(600):
+            value = random.randrange(1, 400)
+            if random.random() < 0.4:
+                if tree.remove(value) != (value in reference):
+                    raise Exception("PROBLEM WITH REMOVE OPERATION")
+                reference.discard(value)
+            else:
+                tree.add(value)
+                reference.add(value)
+            versions.append((tree.snapshot(), sorted(reference)))
+        # Every old version still holds exactly the values it had when it was taken
+        for snapshot, expected in versions:
+            if not snapshot.is_valid_avl() or list(snapshot) != expected or \
+                    snapshot.find_min() != (expected[0] if expected else None):
+                raise Exception("PROBLEM WITH SNAPSHOT")
+        while tree.find_max() is not None:
+            if tree.pop_max() != max(reference):
+                raise Exception("PROBLEM WITH POP_MAX OPERATION")
+            reference.discard(max(reference))
+    print('persistent AVL stress test finished')
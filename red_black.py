@@ -0,0 +1,396 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Implementation of a red-black tree, a subclass of BST that stays balanced with looser rules
+#              than the AVL tree and needs at most two rotations per add and three per remove
+
+
+import random
+from queue_and_stack import Stack
+from bst import BSTNode, BST
+
+
+class RBNode(BSTNode):
+    """
+    Red-Black Tree Node class. Inherits from BSTNode
+    """
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new red node
+        """
+        super().__init__(value)
+        self.parent = None
+        self.red = True
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'RB Node: {} ({})'.format(self.value, 'red' if self.red else 'black')
+
+
+class RedBlackTree(BST):
+    """
+    Red-Black Tree class. Inherits from BST
+
+    Every node is red or black, a red node never has a red child, and every path from a node down to
+    a missing child passes the same number of black nodes. That keeps the height below 2 log2(n + 1).
+    Most updates only recolor nodes, and every add or remove ends with at most three rotations.
+    Like AVL, duplicate values are not stored.
+    """
+    # Running totals reported by retrace_stats()
+    _rotation_count = 0
+    _retrace_visits = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        super()._str_helper(self._root, values)
+        return "RB pre-order { " + ", ".join(values) + " }"
+
+    def is_valid_rb(self) -> bool:
+        """
+        Perform pre-order traversal of the tree. Return False if the tree breaks the ordering property,
+        the root is red, a red node has a red child, two paths have different numbers of black nodes,
+        or parent and child pointers are out of sync.
+        This is intended to be a troubleshooting 'helper' method, like AVL.is_valid_avl().
+        """
+        if not self.is_valid_bst() or self._is_red(self._root):
+            return False
+        if self._root is not None and self._root.parent is not None:
+            return False
+        black_height = None
+        stack = Stack()
+        stack.push((self._root, 0))
+        while not stack.is_empty():
+            node, blacks = stack.pop()
+            if node is None:
+                # Every path must reach a missing child through the same number of black nodes
+                if black_height is None:
+                    black_height = blacks
+                elif blacks != black_height:
+                    return False
+                continue
+            if node.red and (self._is_red(node.left) or self._is_red(node.right)):
+                return False
+            for child in (node.left, node.right):
+                if child is not None and child.parent is not node:
+                    return False
+            blacks += 0 if node.red else 1
+            stack.push((node.right, blacks))
+            stack.push((node.left, blacks))
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to the tree while maintaining its red-black properties. Duplicate
+        values are not allowed. If the value is already in the tree, the method does not change the tree.
+        """
+        parent = None
+        n = self._root
+        while n is not None:
+            # If we find the same value in the tree, return None (no duplicates)
+            if n.value == value:
+                return None
+            parent = n
+            n = n.left if value < n.value else n.right
+        node = self._new_node(value)
+        node.parent = parent
+        if parent is None:
+            self._root = node
+        elif value < parent.value:
+            parent.left = node
+        else:
+            parent.right = node
+        self._note_added(node)
+        self._fix_insert(node)
+
+    def _remove_node(self, n: RBNode, pn: RBNode) -> None:
+        """
+        Removes node n from the tree, given its parent pn (None if n is the root). remove() is inherited
+        from BST and finds the node with find_node_and_parent().
+        """
+        self._note_removed(n, pn)
+        if n.left is None or n.right is None:
+            # The child (if any) takes n's place, and the black count can only change along n's path
+            child = n.left if n.left is not None else n.right
+            removed_red = n.red
+            parent = pn
+            self._replace_child(pn, n, child)
+        else:
+            # The successor moves into n's place and takes its color, so the color that leaves the tree
+            # is the successor's, from the successor's old position
+            s, ps = self.find_successor_and_parent(n)
+            removed_red = s.red
+            child = s.right
+            if ps is n:
+                parent = s
+            else:
+                parent = ps
+                self._replace_child(ps, s, s.right)
+                s.right = n.right
+                s.right.parent = s
+            self._replace_child(pn, n, s)
+            s.left = n.left
+            s.left.parent = s
+            s.red = n.red
+        n.left = n.right = n.parent = None      # free n
+        # Removing a black node leaves the paths through child one black node short
+        if not removed_red:
+            self._fix_remove(child, parent)
+
+    def _spine_parent(self, node: RBNode, rightmost: bool) -> RBNode:
+        """
+        Returns the parent of the min (or max) node straight from its parent pointer.
+        """
+        return node.parent
+
+    def retrace_stats(self) -> dict:
+        """
+        This method returns the number of rotations and the number of nodes visited while fixing up the
+        tree since it was created or the counts were last reset, in the same form as AVL.retrace_stats().
+        """
+        return {'rotations': self._rotation_count, 'nodes_visited': self._retrace_visits}
+
+    def reset_retrace_stats(self) -> None:
+        """
+        This method sets the rotation and fix-up counts back to 0.
+        """
+        self._rotation_count = 0
+        self._retrace_visits = 0
+
+    def _fix_insert(self, node: RBNode) -> None:
+        """
+        Restores the red-black properties after node was added as a red leaf. While node's parent is
+        also red, a red uncle lets the colors move up two levels with no rotation. Otherwise one or
+        two rotations finish the fix.
+        """
+        while self._is_red(node.parent):
+            self._retrace_visits += 1
+            parent = node.parent
+            # A red parent is never the root, so the grandparent exists
+            grand = parent.parent
+            if parent is grand.left:
+                uncle = grand.right
+                if self._is_red(uncle):
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = grand
+                    continue
+                # An inner child is first rotated to the outside
+                if node is parent.right:
+                    self._rotate_left(parent)
+                    node, parent = parent, node
+                parent.red = False
+                grand.red = True
+                self._rotate_right(grand)
+            else:
+                uncle = grand.left
+                if self._is_red(uncle):
+                    parent.red = uncle.red = False
+                    grand.red = True
+                    node = grand
+                    continue
+                if node is parent.left:
+                    self._rotate_right(parent)
+                    node, parent = parent, node
+                parent.red = False
+                grand.red = True
+                self._rotate_left(grand)
+        self._root.red = False
+
+    def _fix_remove(self, node: RBNode, parent: RBNode) -> None:
+        """
+        Restores the red-black properties when the paths through node (which may be None) are one black
+        node short. parent is passed in because node may be missing. A black sibling with black children
+        is recolored and the shortage moves up, every other case ends after at most three rotations.
+        """
+        while node is not self._root and not self._is_red(node):
+            self._retrace_visits += 1
+            if node is parent.left:
+                sibling = parent.right
+                # A red sibling is rotated above parent, which gives node a black sibling
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_left(parent)
+                    sibling = parent.right
+                if not self._is_red(sibling.left) and not self._is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not self._is_red(sibling.right):
+                    sibling.left.red = False
+                    sibling.red = True
+                    self._rotate_right(sibling)
+                    sibling = parent.right
+                sibling.red = parent.red
+                parent.red = False
+                sibling.right.red = False
+                self._rotate_left(parent)
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_right(parent)
+                    sibling = parent.left
+                if not self._is_red(sibling.left) and not self._is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not self._is_red(sibling.left):
+                    sibling.right.red = False
+                    sibling.red = True
+                    self._rotate_left(sibling)
+                    sibling = parent.left
+                sibling.red = parent.red
+                parent.red = False
+                sibling.left.red = False
+                self._rotate_right(parent)
+            node = self._root
+        if node is not None:
+            node.red = False
+
+    def _is_red(self, node: RBNode) -> bool:
+        """
+        Returns True if node is red. Missing children count as black.
+        """
+        return node is not None and node.red
+
+    def _replace_child(self, parent: RBNode, old: RBNode, new: RBNode) -> None:
+        """
+        Points parent (or the root, if parent is None) at new instead of old and sets new's parent.
+        """
+        if parent is None:
+            self._root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+        if new is not None:
+            new.parent = parent
+
+    def _rotate_left(self, node: RBNode) -> None:
+        """
+        Performs a leftward rotation on node and links its right child into node's place.
+        """
+        self._rotation_count += 1
+        c = node.right
+        node.right = c.left
+        if c.left is not None:
+            c.left.parent = node
+        self._replace_child(node.parent, node, c)
+        c.left = node
+        node.parent = c
+
+    def _rotate_right(self, node: RBNode) -> None:
+        """
+        Performs a rightward rotation on node and links its left child into node's place.
+        """
+        self._rotation_count += 1
+        c = node.left
+        node.left = c.right
+        if c.right is not None:
+            c.right.parent = node
+        self._replace_child(node.parent, node, c)
+        c.right = node
+        node.parent = c
+
+    def _build_balanced(self, values: list) -> RBNode:
+        """
+        Builds a balanced red-black subtree from a sorted list and returns its root. Duplicates are
+        dropped. Splitting at the middle fills every level but the deepest, so coloring the nodes on
+        the deepest level red (unless it is full) gives every path the same number of black nodes.
+        """
+        nodes = []
+        for value in values:
+            if not nodes or nodes[-1].value != value:
+                nodes.append(self._new_node(value))
+        root = self._link_balanced(nodes)
+        deepest = len(nodes).bit_length() - 1
+        if len(nodes) + 1 != 1 << (deepest + 1):
+            stack = [(root, 0)]
+            while stack:
+                node, depth = stack.pop()
+                if node is not None:
+                    if depth == deepest:
+                        node.red = True
+                    stack.append((node.left, depth + 1))
+                    stack.append((node.right, depth + 1))
+        return root
+
+    def _new_node(self, value: object) -> RBNode:
+        """
+        Creates the node that stores a new value.
+        """
+        return RBNode(value)
+
+    def _link_built_node(self, node: RBNode, parent: RBNode, size: int) -> None:
+        """
+        Sets the parent of a node placed by _link_balanced() and colors it black.
+        """
+        node.parent = parent
+        node.red = False
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() example 1")
+    print("----------------------")
+    test_cases = (
+        (1, 2, 3),
+        (3, 2, 1),
+        (1, 3, 2),
+        (10, 20, 30, 40, 50, 25),
+        (1, 1, 1, 1),
+    )
+    for case in test_cases:
+        tree = RedBlackTree(case)
+        print(tree, [('red' if node.red else 'black') for node in tree._iter_nodes()])
+
+    print("\nmethod remove() example 1")
+    print("-------------------------")
+    tree = RedBlackTree(range(1, 11))
+    for value in (4, 1, 10, 7, 11):
+        print('DEL:', value, tree.remove(value), tree, tree.is_valid_rb())
+
+    print("\nmethod add() / remove() example 2")
+    print("---------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = RedBlackTree(case)
+        if not tree.is_valid_rb():
+            raise Exception("PROBLEM WITH ADD OPERATION")
+        for value in case[::2]:
+            tree.remove(value)
+        for value in case[::4]:
+            tree.add(value)
+        expected = sorted(set(case[1::2]) | set(case[::4]))
+        if not tree.is_valid_rb() or list(tree) != expected or \
+                (tree.find_min(), tree.find_max()) != (expected[0], expected[-1]):
+            raise Exception("PROBLEM WITH ADD OR REMOVE OPERATION")
+        while tree.find_min() is not None:
+            if tree.pop_min() != expected.pop(0) or not tree.is_valid_rb():
+                raise Exception("PROBLEM WITH POP_MIN OPERATION")
+    print('add() / remove() stress test finished')
+
+    print("\nmethod from_sorted() example 1")
+    print("------------------------------")
+    for size in range(0, 70):
+        tree = RedBlackTree.from_sorted(range(size))
+        if not tree.is_valid_rb() or list(tree) != list(range(size)):
+            raise Exception("PROBLEM WITH FROM_SORTED OPERATION")
+        tree.add(size)
+        tree.remove(0)
+        if not tree.is_valid_rb():
+            raise Exception("PROBLEM WITH FROM_SORTED OPERATION")
+    print(RedBlackTree.from_sorted(range(6)))
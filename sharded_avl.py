@@ -0,0 +1,310 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: AVL tree split by key range into shards, each kept in its own worker process, so bulk
+#              adds, lookups and range queries run on several cores at once
+
+
+import os
+import random
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from avl import AVL
+
+
+# The shard owned by this process, when it is a worker
+_shard = None
+
+
+def _start_shard() -> None:
+    """
+    Creates the empty shard of a new worker process.
+    """
+    global _shard
+    _shard = AVL()
+
+
+def _shard_build(values: list) -> int:
+    """
+    Replaces the worker's shard with a balanced tree of values and returns its size.
+    """
+    global _shard
+    _shard = AVL.from_iterable(values)
+    return len(_shard)
+
+
+def _shard_add_many(values: list) -> None:
+    """
+    Adds values to the worker's shard.
+    """
+    _shard.add_many(values)
+
+
+def _shard_remove_many(values: list) -> int:
+    """
+    Removes values from the worker's shard and returns how many were removed.
+    """
+    return _shard.remove_many(values)
+
+
+def _shard_contains_many(keys: list) -> list:
+    """
+    Returns, for each key, whether it is in the worker's shard.
+    """
+    return [bool(found) for found in _shard.contains_many(keys)]
+
+
+def _shard_range(lo: object, hi: object, inclusive: (bool, bool)) -> list:
+    """
+    Returns the values of the worker's shard between lo and hi, in ascending order.
+    """
+    return list(_shard.iter_range(lo, hi, inclusive))
+
+
+def _shard_count_range(lo: object, hi: object, inclusive: (bool, bool)) -> int:
+    """
+    Returns the number of values of the worker's shard between lo and hi.
+    """
+    return _shard.count_range(lo, hi, inclusive)
+
+
+def _shard_is_valid() -> bool:
+    """
+    Returns True if the worker's shard is a valid AVL tree.
+    """
+    return _shard.is_valid_avl()
+
+
+class ShardedAVL:
+    """
+    Sharded AVL class, a set of values split by key range into AVL shards held by worker processes
+
+    Split points s_1 < ... < s_(N-1) make N shards: shard i holds the values v with
+    s_i <= v < s_(i+1). Each shard lives in a process pool of one worker, so it stays in the same
+    process between calls. Batch operations split their values by shard, send every part at once
+    and wait for all of them, and results come back in the order of the input. Iteration
+    concatenates the shards in order, which keeps the values sorted.
+    Values cross process boundaries by pickling, so batches should be large. A single add(),
+    remove() or contains() costs a round trip to a worker. Call close(), or use a with statement,
+    to stop the workers.
+    """
+
+    def __init__(self, split_points, start_tree=None) -> None:
+        """
+        Initialize a new Sharded AVL with one shard more than there are split points, and add the
+        values of start_tree (if provided)
+        """
+        self._splits = sorted(split_points)
+        self._workers = [ProcessPoolExecutor(max_workers=1, initializer=_start_shard)
+                         for _ in range(len(self._splits) + 1)]
+        if start_tree is not None:
+            self.add_many(start_tree)
+
+    @classmethod
+    def from_iterable(cls, iterable, shards: int = None) -> 'ShardedAVL':
+        """
+        This method builds a Sharded AVL with split points at the quantiles of the values, so the shards
+        get about the same number of values, and builds every shard in parallel. shards defaults to the
+        number of CPUs.
+        """
+        values = sorted(set(iterable))
+        shards = shards or os.cpu_count() or 1
+        splits = [values[len(values) * i // shards] for i in range(1, shards)] if values else []
+        tree = cls(sorted(set(splits)))
+        tree._map_parts(_shard_build, tree._partition(values))
+        return tree
+
+    def close(self) -> None:
+        """
+        This method stops the worker processes. The tree cannot be used afterwards.
+        """
+        for worker in self._workers:
+            worker.shutdown()
+
+    def __enter__(self) -> 'ShardedAVL':
+        """
+        Returns the tree for a with statement.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Stops the workers at the end of a with statement.
+        """
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return "Sharded AVL { " + ", ".join(str(value) for value in self) + " }"
+
+    # ------------------------------------------------------------------ #
+
+    def shard_of(self, value: object) -> int:
+        """
+        This method returns the index of the shard that holds (or would hold) value.
+        """
+        return bisect_right(self._splits, value)
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to its shard. Duplicate values are not allowed.
+        """
+        self._workers[self.shard_of(value)].submit(_shard_add_many, [value]).result()
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from its shard. The method returns True if the value is removed.
+        Otherwise, it returns False.
+        """
+        return self._workers[self.shard_of(value)].submit(_shard_remove_many, [value]).result() == 1
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the tree. Otherwise, it returns False.
+        """
+        return self._workers[self.shard_of(value)].submit(_shard_contains_many, [value]).result()[0]
+
+    def add_many(self, values) -> None:
+        """
+        This method adds every value in an iterable, with all the shards adding in parallel.
+        """
+        self._map_parts(_shard_add_many, self._partition(values))
+
+    def remove_many(self, values) -> int:
+        """
+        This method removes every value in an iterable, with all the shards removing in parallel, and
+        returns how many values were removed.
+        """
+        return sum(self._map_parts(_shard_remove_many, self._partition(values)))
+
+    def contains_many(self, keys) -> list:
+        """
+        This method returns a list with, for each key, True if it is in the tree and False if not.
+        All the shards search their keys in parallel.
+        """
+        keys = list(keys)
+        positions = [[] for _ in self._workers]
+        parts = [[] for _ in self._workers]
+        for i, key in enumerate(keys):
+            shard = self.shard_of(key)
+            positions[shard].append(i)
+            parts[shard].append(key)
+        found = [False] * len(keys)
+        for shard_positions, results in zip(positions, self._map_parts(_shard_contains_many, parts)):
+            for i, result in zip(shard_positions, results):
+                found[i] = result
+        return found
+
+    def iter_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)):
+        """
+        This method returns an iterator over the values between lo and hi, in ascending order. Only the
+        shards that overlap the range are queried, all of them in parallel. The bounds work like they do
+        in BST.iter_range().
+        """
+        results = self._map_range(_shard_range, lo, hi, inclusive)
+        return (value for values in results for value in values)
+
+    def count_range(self, lo: object = None, hi: object = None, inclusive: (bool, bool) = (True, True)) -> int:
+        """
+        This method returns the number of values between lo and hi.
+        """
+        return sum(self._map_range(_shard_count_range, lo, hi, inclusive))
+
+    def __iter__(self):
+        """
+        Iterates over the values of all the shards in ascending order.
+        """
+        return self.iter_range()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of values in all the shards.
+        """
+        return self.count_range()
+
+    def shard_sizes(self) -> list:
+        """
+        This method returns the number of values in each shard, which shows how even the split points are.
+        """
+        return self._map_parts(_shard_count_range, [(None, None, (True, True))] * len(self._workers), True)
+
+    def is_valid(self) -> bool:
+        """
+        This method returns True if every shard is a valid AVL tree holding only values in its key range.
+        """
+        if not all(self._map_parts(_shard_is_valid, [()] * len(self._workers), True)):
+            return False
+        for i, values in enumerate(self._map_range(_shard_range, None, None, (True, True))):
+            if values and (self.shard_of(values[0]) != i or self.shard_of(values[-1]) != i):
+                return False
+        return True
+
+    def _partition(self, values) -> list:
+        """
+        Returns one list per shard with the values that belong to it.
+        """
+        parts = [[] for _ in self._workers]
+        for value in values:
+            parts[self.shard_of(value)].append(value)
+        return parts
+
+    def _map_parts(self, function, parts: list, unpack: bool = False) -> list:
+        """
+        Calls function in every worker with its part, all at once, and returns the results in shard
+        order. If unpack is True, each part is a tuple of arguments rather than a single argument.
+        """
+        futures = [worker.submit(function, *part) if unpack else worker.submit(function, part)
+                   for worker, part in zip(self._workers, parts)]
+        return [future.result() for future in futures]
+
+    def _map_range(self, function, lo: object, hi: object, inclusive: (bool, bool)) -> list:
+        """
+        Calls function(lo, hi, inclusive) in the workers whose shards overlap the range, all at once,
+        and returns the results in shard order.
+        """
+        first = 0 if lo is None else self.shard_of(lo)
+        last = len(self._workers) - 1 if hi is None else self.shard_of(hi)
+        futures = [self._workers[i].submit(function, lo, hi, inclusive) for i in range(first, last + 1)]
+        return [future.result() for future in futures]
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add_many() / iter_range() example 1")
+    print("------------------------------------------")
+    with ShardedAVL([10, 20], [10, 20, 5, 15, 17, 7, 12, 25]) as tree:
+        print(tree, tree.shard_sizes())
+        print(list(tree.iter_range(7, 15, (False, True))), tree.count_range(7, 15), len(tree))
+        print(tree.contains_many([5, 6, 20, 21]), tree.remove(20), tree.contains(20))
+
+    print("\nmethod from_iterable() / contains_many() / remove_many() example 2")
+    print("------------------------------------------------------------------")
+    with ShardedAVL.from_iterable(random.sample(range(100000), 20000), shards=4) as tree:
+        reference = set(tree)
+        for _ in range(20):
+            batch = [random.randrange(100000) for _ in range(2000)]
+            if random.random() < 0.5:
+                tree.add_many(batch)
+                reference.update(batch)
+            elif tree.remove_many(batch) != len(reference.intersection(batch)):
+                raise Exception("PROBLEM WITH REMOVE_MANY OPERATION")
+            else:
+                reference.difference_update(batch)
+            probes = [random.randrange(-10, 100010) for _ in range(2000)]
+            if tree.contains_many(probes) != [probe in reference for probe in probes]:
+                raise Exception("PROBLEM WITH CONTAINS_MANY OPERATION")
+            lo, hi = sorted(random.randrange(100000) for _ in range(2))
+            expected = sorted(value for value in reference if lo < value <= hi)
+            if list(tree.iter_range(lo, hi, (False, True))) != expected or \
+                    tree.count_range(lo, hi, (False, True)) != len(expected):
+                raise Exception("PROBLEM WITH RANGE QUERY")
+        if not tree.is_valid() or list(tree) != sorted(reference):
+            raise Exception("PROBLEM WITH SHARDED TREE")
+        print('shard sizes:', tree.shard_sizes())
+    print('sharded AVL stress test finished')
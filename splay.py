@@ -0,0 +1,198 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Implementation of a splay tree, a subclass of BST that moves every node it looks up to the
+#              root, so values that are looked up often stay near the top of the tree
+
+
+import random
+from bst import BSTNode, BST
+
+
+class SplayTree(BST):
+    """
+    Splay Tree class. Inherits from BST and uses plain BSTNodes
+
+    contains(), add() and remove() splay the node they reach to the root with top-down splaying, which
+    needs no parent pointers. A single operation can cost O(n), but any sequence of m operations costs
+    O(m log n), and a small set of values that is looked up again and again stays within a few levels of
+    the root. Because lookups change the tree, contains() must not be called during a traversal.
+    Like AVL, duplicate values are not stored.
+    """
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        super()._str_helper(self._root, values)
+        return "Splay pre-order { " + ", ".join(values) + " }"
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value at the root of the tree. Duplicate values are not allowed. If the
+        value is already in the tree, it is splayed to the root and the tree is otherwise unchanged.
+        """
+        root = self._splay(self._root, value)
+        if root is not None and root.value == value:
+            self._root = root
+            return
+        # The splayed root is the closest value, so it and one of its subtrees go on one side of the new node
+        node = self._new_node(value)
+        if root is not None:
+            if value < root.value:
+                node.left, node.right = root.left, root
+                root.left = None
+            else:
+                node.left, node.right = root, root.right
+                root.right = None
+        self._root = node
+        self._note_added(node)
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from the tree. The method returns True if the value is removed.
+        Otherwise, it returns False.
+        """
+        root = self._splay(self._root, value)
+        self._root = root
+        if root is None or root.value != value:
+            return False
+        self._note_removed(root, None)
+        if root.left is None:
+            self._root = root.right
+        else:
+            # Splaying the left subtree for value brings its largest node up, which has no right child
+            self._root = self._splay(root.left, value)
+            self._root.right = root.right
+        root.left = root.right = None     # free the removed node
+        return True
+
+    def _remove_node(self, n: BSTNode, pn: BSTNode) -> None:
+        """
+        Removes node n, used by pop_min() and pop_max(). The node is removed by value, which splays
+        it to the root first.
+        """
+        self.remove(n.value)
+
+    def contains(self, value: object) -> bool:
+        """
+        This method returns True if the value is in the tree. Otherwise, it returns False. The last
+        node reached is splayed to the root either way.
+        """
+        self._root = self._splay(self._root, value)
+        return self._root is not None and self._root.value == value
+
+    def _splay(self, root: BSTNode, value: object) -> BSTNode:
+        """
+        Top-down splay: walks from root towards value, and moves the node holding value (or the last node
+        on the path if value is missing) to the root of the subtree. Returns the new subtree root.
+        Nodes passed on the way down hang off two side trees, one of nodes smaller than value and one of
+        larger nodes, and two steps in the same direction rotate first, which roughly halves the depth of
+        every node on the path.
+        """
+        if root is None or root.value == value:
+            return root
+        # header.right collects the smaller side tree and header.left the larger one
+        header = BSTNode(None)
+        smaller = larger = header
+        n = root
+        while True:
+            if value < n.value:
+                c = n.left
+                if c is None:
+                    break
+                if value < c.value:
+                    # Zig-zig, rotate right before linking
+                    n.left = c.right
+                    c.right = n
+                    n = c
+                    if n.left is None:
+                        break
+                # Link n and its right subtree into the larger side tree
+                larger.left = n
+                larger = n
+                n = n.left
+            elif n.value < value:
+                c = n.right
+                if c is None:
+                    break
+                if c.value < value:
+                    # Zag-zag, rotate left before linking
+                    n.right = c.left
+                    c.left = n
+                    n = c
+                    if n.right is None:
+                        break
+                smaller.right = n
+                smaller = n
+                n = n.right
+            else:
+                break
+        # Reassemble: n's subtrees finish the side trees, which become its new subtrees
+        smaller.right = n.left
+        larger.left = n.right
+        n.left = header.right
+        n.right = header.left
+        return n
+
+    def _build_balanced(self, values: list) -> BSTNode:
+        """
+        Builds a balanced subtree from a sorted list and returns its root. Duplicates are dropped.
+        """
+        nodes = []
+        for value in values:
+            if not nodes or nodes[-1].value != value:
+                nodes.append(self._new_node(value))
+        return self._link_balanced(nodes)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() / contains() example 1")
+    print("-----------------------------------")
+    tree = SplayTree([10, 20, 5, 15, 17, 7, 12])
+    print(tree)
+    print(tree.contains(5), tree)
+    print(tree.contains(16), tree)
+    tree.add(5)
+    print(tree, list(tree))
+
+    print("\nmethod remove() example 1")
+    print("-------------------------")
+    for value in (15, 5, 99, 20):
+        print('DEL:', value, tree.remove(value), tree)
+
+    print("\nmethod add() / remove() / contains() example 2")
+    print("----------------------------------------------")
+    for _ in range(100):
+        case = [random.randrange(1, 2000) for _ in range(600)]
+        tree, reference = SplayTree(case), set(case)
+        for value in case[::3]:
+            if tree.remove(value) != (value in reference):
+                raise Exception("PROBLEM WITH REMOVE OPERATION")
+            reference.discard(value)
+        for value in random.sample(range(1, 2000), 200):
+            if tree.contains(value) != (value in reference):
+                raise Exception("PROBLEM WITH CONTAINS OPERATION")
+        if not tree.is_valid_bst() or list(tree) != sorted(reference) or \
+                (tree.find_min(), tree.find_max()) != (min(reference), max(reference)):
+            raise Exception("PROBLEM WITH ADD OR REMOVE OPERATION")
+        if (tree.pop_min(), tree.pop_max()) != (min(reference), max(reference)) or not tree.is_valid_bst():
+            raise Exception("PROBLEM WITH POP_MIN OR POP_MAX OPERATION")
+    print('splay stress test finished')
+
+    print("\nmethod contains() example 3")
+    print("---------------------------")
+    # Sequential adds make a path, the first lookups at the bottom roughly halve its depth
+    tree = SplayTree(range(2000))
+    tree.contains(0)
+    tree.contains(1)
+    tree.contains(0)
+    print('root after repeated lookups:', tree.get_root().value)
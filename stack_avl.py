@@ -0,0 +1,328 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Implementation of an AVL tree without parent pointers. add() and remove() keep the path
+#              they walked down on a stack and retrace it instead, so the nodes never form reference cycles
+
+
+import random
+from queue_and_stack import Stack
+from bst import BSTNode, BST
+
+
+class StackAVLNode(BSTNode):
+    """
+    Parent-pointer-free AVL Tree Node class. Inherits from BSTNode
+    """
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a new node, it only adds a height to BSTNode
+        """
+        super().__init__(value)
+        self.height = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        return 'Stack AVL Node: {}'.format(self.value)
+
+
+class StackAVL(BST):
+    """
+    Parent-pointer-free AVL Tree class. Inherits from BST
+
+    Builds the same tree shapes as AVL. Without parent pointers every node is only referenced by its
+    parent, so a dropped tree is freed by reference counting straight away instead of waiting for
+    the cyclic garbage collector.
+    """
+
+    def __str__(self) -> str:
+        """
+        Override string method
+        """
+        values = []
+        super()._str_helper(self._root, values)
+        return "Stack AVL pre-order { " + ", ".join(values) + " }"
+
+    def is_valid_avl(self) -> bool:
+        """
+        Perform pre-order traversal of the tree. Return False if a node breaks the ordering property
+        or has the wrong height, or if any node is out of balance.
+        This is intended to be a troubleshooting 'helper' method, like AVL.is_valid_avl().
+        """
+        if not self.is_valid_bst():
+            return False
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node:
+                left = self._get_height(node.left)
+                right = self._get_height(node.right)
+                if node.height != 1 + max(left, right) or abs(right - left) > 1:
+                    return False
+                stack.push(node.right)
+                stack.push(node.left)
+        return True
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, value: object) -> None:
+        """
+        This method adds a new value to the tree while maintaining its AVL property. Duplicate
+        values are not allowed. If the value is already in the tree, the method does not change
+        the tree.
+        """
+        if self._root is None:
+            self._root = self._new_node(value)
+            self._note_added(self._root)
+            return
+        # Record the path down to the new node's parent
+        path = []
+        n = self._root
+        while n is not None:
+            path.append(n)
+            if value < n.value:
+                n = n.left
+            # If we find the same value in the tree, return None (no duplicates)
+            elif value == n.value:
+                return None
+            else:
+                n = n.right
+        parent = path[-1]
+        node = self._new_node(value)
+        if value < parent.value:
+            parent.left = node
+        else:
+            parent.right = node
+        self._note_added(node)
+        self._retrace(path)
+
+    def remove(self, value: object) -> bool:
+        """
+        This method removes a value from the tree. The method returns True if the value is
+        removed. Otherwise, it returns False.
+        """
+        # Record the path down to the node we are removing, the node itself is the last entry
+        path = []
+        n = self._root
+        while n is not None:
+            path.append(n)
+            if n.value == value:
+                break
+            n = n.left if value < n.value else n.right
+        if n is None:
+            return False
+        path.pop()
+        parent = path[-1] if path else None
+        self._note_removed(n, parent)
+        if n.left is None or n.right is None:
+            # A missing subtree lets the other one take n's place
+            self._replace_child(parent, n, n.left if n.left is not None else n.right)
+        else:
+            # Otherwise the successor moves into n's place, taking n's height so the retrace compares
+            # against the height this position had before removal
+            successor_path = [n.right]
+            while successor_path[-1].left is not None:
+                successor_path.append(successor_path[-1].left)
+            s = successor_path.pop()
+            if successor_path:
+                successor_path[-1].left = s.right
+                s.right = n.right
+            s.left = n.left
+            s.height = n.height
+            self._replace_child(parent, n, s)
+            # The nodes between s and its old parent are now below s
+            path.append(s)
+            path.extend(successor_path)
+        n.left = n.right = None     # free n
+        self._retrace(path)
+        return True
+
+    def _remove_node(self, n: StackAVLNode, pn: StackAVLNode) -> None:
+        """
+        Removes node n, used by pop_min() and pop_max(). Rebalancing needs the whole path to n rather
+        than just its parent, so the node is removed by value, which finds that path again.
+        """
+        self.remove(n.value)
+
+    def _replace_child(self, parent: StackAVLNode, old: StackAVLNode, new: StackAVLNode) -> None:
+        """
+        Points parent (or the root, if parent is None) at new instead of old.
+        """
+        if parent is None:
+            self._root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _retrace(self, path: list) -> None:
+        """
+        Rebalances the nodes on a root-to-node path from the bottom up. Each rotated subtree is linked
+        back into the node above it on the path. Like AVL._retrace(), the walk stops once a subtree
+        keeps the height it had before the change.
+        """
+        while path:
+            node = path.pop()
+            old_height = node.height
+            subtree = self._rebalance(node)
+            if subtree is not node:
+                self._replace_child(path[-1] if path else None, node, subtree)
+            if subtree.height == old_height:
+                return
+
+    def _rebalance(self, node: StackAVLNode) -> StackAVLNode:
+        """
+        Performs balancing on a node with the same rotations as AVL._rebalance(). Returns the new root
+        of the subtree, which the caller links into the tree.
+        """
+        # We have a left-heavy node and need to rotate rightward
+        if self._balance_factor(node) < -1:
+            # If it has a right-heavy left child then we must first rotate the left child leftward
+            if self._balance_factor(node.left) > 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        # We have a right-heavy node and need to rotate leftward
+        if self._balance_factor(node) > 1:
+            # If it has a left-heavy right child then we must first rotate the right child rightward
+            if self._balance_factor(node.right) < 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        # If there is no imbalance then we just update height
+        self._update_height(node)
+        return node
+
+    def _rotate_left(self, node: StackAVLNode) -> StackAVLNode:
+        """
+        Performs a leftward rotation on the root of a subtree. Returns the new root of the subtree.
+        """
+        c = node.right
+        node.right = c.left
+        c.left = node
+        self._update_height(node)
+        self._update_height(c)
+        return c
+
+    def _rotate_right(self, node: StackAVLNode) -> StackAVLNode:
+        """
+        Performs a rightward rotation on the root of a subtree. Returns the new root of the subtree.
+        """
+        c = node.left
+        node.left = c.right
+        c.right = node
+        self._update_height(node)
+        self._update_height(c)
+        return c
+
+    def _balance_factor(self, node: StackAVLNode) -> int:
+        """
+        Returns the balance factor of a node by examining the height of its children.
+        """
+        return self._get_height(node.right) - self._get_height(node.left)
+
+    def _get_height(self, node: StackAVLNode) -> int:
+        """
+        Returns the height of a node, or -1 for an empty subtree.
+        """
+        if not node:
+            return -1
+        return node.height
+
+    def _update_height(self, node: StackAVLNode) -> None:
+        """
+        Updates the height of a node from the heights of its children.
+        """
+        left = self._get_height(node.left)
+        right = self._get_height(node.right)
+        if left > right:
+            node.height = left + 1
+        else:
+            node.height = right + 1
+
+    def _build_balanced(self, values: list) -> StackAVLNode:
+        """
+        Builds a balanced subtree from a sorted list and returns its root. Duplicates are dropped.
+        """
+        nodes = []
+        for value in values:
+            if not nodes or nodes[-1].value != value:
+                nodes.append(self._new_node(value))
+        return self._link_balanced(nodes)
+
+    def _new_node(self, value: object) -> StackAVLNode:
+        """
+        Creates the node that stores a new value.
+        """
+        return StackAVLNode(value)
+
+    def _link_built_node(self, node: StackAVLNode, parent: StackAVLNode, size: int) -> None:
+        """
+        Sets the height of a node placed by _link_balanced() from the size of its range.
+        """
+        node.height = size.bit_length() - 1
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    print("\nmethod add() example 1")
+    print("----------------------")
+    test_cases = (
+        (1, 2, 3),  # RR
+        (3, 2, 1),  # LL
+        (1, 3, 2),  # RL
+        (3, 1, 2),  # LR
+        (10, 20, 30, 50, 40),
+        (1, 1, 1, 1),
+    )
+    for case in test_cases:
+        tree = StackAVL(case)
+        print(tree)
+
+    print("\nmethod remove() example 1")
+    print("-------------------------")
+    test_cases = (
+        ((50, 40, 60, 30, 70, 20, 80, 45), 20),  # RR
+        ((50, 40, 60, 30, 70, 20, 80, 15), 40),  # LL
+        ((50, 40, 60, 30, 70, 20, 80, 35), 20),  # RL
+        ((50, 40, 60, 30, 70, 20, 80, 25), 40),  # LR
+    )
+    for case, del_value in test_cases:
+        tree = StackAVL(case)
+        print('INPUT  :', tree, "DEL:", del_value)
+        tree.remove(del_value)
+        print('RESULT :', tree)
+
+    print("\nmethod add() / remove() example 2")
+    print("---------------------------------")
+    from avl import AVL
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree, reference = StackAVL(case), AVL(case)
+        for value in case[::2]:
+            tree.remove(value)
+            reference.remove(value)
+        for value in case[::4]:
+            tree.add(value)
+            reference.add(value)
+        # Same shape as AVL, compared through the pre-order listing
+        if not tree.is_valid_avl() or str(tree)[6:] != str(reference):
+            raise Exception("PROBLEM WITH ADD OR REMOVE OPERATION")
+    print('add() / remove() stress test finished')
+
+    print("\nmethod pop_min() / pop_max() example 1")
+    print("--------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 2000) for _ in range(300)))
+        tree, reference = StackAVL(case), AVL(case)
+        while reference.find_min() is not None:
+            pop = 'pop_min' if random.random() < 0.5 else 'pop_max'
+            if getattr(tree, pop)() != getattr(reference, pop)() or not tree.is_valid_avl() or \
+                    str(tree)[6:] != str(reference) or tree.find_max() != reference.find_max():
+                raise Exception("PROBLEM WITH POP_MIN OR POP_MAX OPERATION")
+    print('pop_min() / pop_max() stress test finished')
@@ -0,0 +1,185 @@
+# Name: Dominic Fantauzzo
+# OSU Email: fantauzd@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 4 - BST/AVL Tree Implementation
+# Description: Compact binary file format for the values of a tree, used by dump() and load(). Numbers are
+#              stored as fixed-width arrays and read back through a memory map without parsing each value
+
+
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+
+
+# magic, format version, value kind, flags, value count
+_HEADER = struct.Struct('<4sBBBxQ')
+_MAGIC = b'TREE'
+_VERSION = 1
+_HAS_HEIGHTS = 1
+# Value kinds: 64-bit ints, doubles, UTF-8 strings, and a pickled list for anything else
+_INT, _FLOAT, _STR, _PICKLE = b'q', b'd', b's', b'p'
+
+
+def dump_values(path: str, values: list, heights: list = None) -> None:
+    """
+    Writes values to a file at path, in the order given, which is the order load_values() returns
+    them in. If heights is given it must hold one node height per value, in the same order, and is
+    stored with them.
+
+    Layout (little-endian): the header, then one signed byte per height if there are heights, then
+    the values. Ints that fit in 64 bits and floats are stored as 8-byte arrays. Strings are stored as
+    an array of 4-byte UTF-8 lengths followed by the bytes. Other values are pickled as one list.
+    """
+    kind = _value_kind(values)
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, kind[0], _HAS_HEIGHTS if heights is not None else 0,
+                                len(values)))
+        if heights is not None:
+            file.write(_to_bytes(array('b', heights)))
+        if kind in (_INT, _FLOAT):
+            file.write(_to_bytes(array(kind.decode(), values)))
+        elif kind == _STR:
+            encoded = [value.encode('utf-8') for value in values]
+            file.write(_to_bytes(array('I', [len(data) for data in encoded])))
+            file.write(b''.join(encoded))
+        else:
+            pickle.dump(values, file, pickle.HIGHEST_PROTOCOL)
+
+
+def load_values(path: str) -> (list, list):
+    """
+    Reads a file written by dump_values() and returns its values and heights (None if it has none).
+    The file is memory-mapped and the fixed-width arrays are converted straight from the mapped bytes.
+    """
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            magic, version, kind, flags, count = _HEADER.unpack_from(view)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError('not a tree dump: {}'.format(path))
+            offset = _HEADER.size
+            heights = None
+            if flags & _HAS_HEIGHTS:
+                heights = _read_array(view, offset, 'b', count)
+                offset += count
+            kind = bytes([kind])
+            if kind in (_INT, _FLOAT):
+                values = _read_array(view, offset, kind.decode(), count)
+            elif kind == _STR:
+                lengths = _read_array(view, offset, 'I', count)
+                offset += 4 * count
+                values = []
+                for length in lengths:
+                    values.append(str(view[offset:offset + length], 'utf-8'))
+                    offset += length
+            else:
+                values = pickle.loads(view[offset:])
+            return values, heights
+        finally:
+            view.release()
+
+
+def _value_kind(values: list) -> bytes:
+    """
+    Returns the most compact kind that stores every value exactly. Subclasses of int, float and str
+    (such as bool) are pickled so they load back with their own type.
+    """
+    types = set(map(type, values))
+    # Keyed trees write their records in key order, so the ends of the list need not be the extremes
+    if types == {int} and -2 ** 63 <= min(values) and max(values) < 2 ** 63:
+        return _INT
+    if types == {float}:
+        return _FLOAT
+    if types == {str}:
+        return _STR
+    return _PICKLE
+
+
+def _to_bytes(data: array) -> bytes:
+    """
+    Returns the bytes of an array in little-endian order.
+    """
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_array(view: memoryview, offset: int, code: str, count: int) -> list:
+    """
+    Returns count little-endian items of type code starting at offset in view, as a list.
+    """
+    size = array(code).itemsize * count
+    if sys.byteorder == 'little':
+        return view[offset:offset + size].cast(code).tolist()
+    data = array(code, bytes(view[offset:offset + size]))
+    data.byteswap()
+    return data.tolist()
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == '__main__':
+
+    import os
+    import random
+    import tempfile
+    from bst import BST
+    from avl import AVL
+    from avl_map import AVLMap
+    from keyed import KeyedAVL
+    from multiset import MultisetAVL
+    from order_statistic import OrderStatisticAVL
+    from red_black import RedBlackTree
+
+    path = os.path.join(tempfile.mkdtemp(), 'tree.bin')
+
+    print("\nmethod dump() / load() example 1")
+    print("--------------------------------")
+    tree = AVL([10, 20, 5, 15, 17, 7, 12])
+    tree.remove(20)
+    tree.dump(path, shape=True)
+    print(tree, os.path.getsize(path), 'bytes')
+    print(AVL.load(path))
+    tree.dump(path)
+    print(AVL.load(path))
+
+    print("\nmethod dump() / load() example 2")
+    print("--------------------------------")
+    samples = (lambda: random.randrange(-2 ** 70, 2 ** 70), lambda: random.randrange(-1000, 1000),
+               lambda: random.random() * 100, lambda: str(random.randrange(10 ** 6)) + 'é',
+               lambda: (random.randrange(100), 'x'))
+    for _ in range(200):
+        sample = random.choice(samples)
+        case = [sample() for _ in range(random.randrange(0, 300))]
+        for cls in (BST, AVL, OrderStatisticAVL, RedBlackTree, MultisetAVL):
+            tree = cls(case)
+            tree.dump(path)
+            loaded = cls.load(path)
+            if type(loaded) is not cls or list(loaded) != list(tree):
+                raise Exception("PROBLEM WITH DUMP OR LOAD", cls.__name__)
+        for cls in (AVL, OrderStatisticAVL):
+            tree = cls(case)
+            tree.dump(path, shape=True)
+            loaded = cls.load(path)
+            if str(loaded) != str(tree) or not loaded.is_valid_avl() or \
+                    (loaded.find_min(), loaded.find_max()) != (tree.find_min(), tree.find_max()):
+                raise Exception("PROBLEM WITH SHAPED LOAD", cls.__name__)
+        records = KeyedAVL([(value, str(value)) for value in range(50)], key=lambda record: record[0])
+        records.dump(path)
+        if list(KeyedAVL.load(path, key=lambda record: record[0])) != list(records):
+            raise Exception("PROBLEM WITH KEYED LOAD")
+        # Records in key order that is not their natural order, with and without ints beyond 64 bits
+        if case and type(case[0]) is int:
+            for values in (case, case + [2 ** 70, -2 ** 70]):
+                negated = KeyedAVL(values, key=lambda value: -value)
+                negated.dump(path)
+                if list(KeyedAVL.load(path, key=lambda value: -value)) != list(negated):
+                    raise Exception("PROBLEM WITH KEYED LOAD")
+        mapping = AVLMap((value, str(value)) for value in case if type(value) is int)
+        mapping.dump(path, shape=True)
+        if list(AVLMap.load(path).items()) != list(mapping.items()) or str(AVLMap.load(path)) != str(mapping):
+            raise Exception("PROBLEM WITH MAP LOAD")
+    print('dump/load stress test finished')